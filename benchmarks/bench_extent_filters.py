@@ -0,0 +1,75 @@
+"""Compare applying the extent_daily filter chain one filter at a time with
+apply_filters, which applies it in one pass (gridset_filters.ExtentFilters).
+
+The chains are built by seaice.data.api._filters as extent_daily builds them,
+with and without drop_land, on synthetic north grids holding concentrations,
+land, coast, pole hole and missing values, as the masked arrays without masked
+values that seaice.data.getter returns. A 30 layer stack is timed as well.
+Each chain is timed REPEATS times and the fastest run reported. Run with the
+seaice package importable, e.g. from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_extent_filters.py
+
+"""
+import timeit
+
+import numpy as np
+
+from seaice.data.gridset import Gridset
+import seaice.data.api as api
+import seaice.data.gridset_filters as gf
+import seaice.nasateam as nt
+
+REPEATS = 7
+
+NUMBER = 20
+
+
+def _gridset(layers):
+    rows, cols = nt.NORTH['shape']
+    rng = np.random.RandomState(0)
+    values = np.concatenate([np.arange(0, 101),
+                             [nt.FLAGS['land'], nt.FLAGS['coast'], nt.FLAGS['pole'],
+                              nt.FLAGS['missing']]])
+    shape = (rows, cols) if layers is None else (rows, cols, layers)
+    data = np.ma.array(rng.choice(values, size=shape).astype(np.float64))
+    flags = {k: nt.FLAGS[k] for k in ('pole', 'land', 'coast')}
+
+    return Gridset(data=data, metadata={'missing_value': nt.FLAGS['missing'],
+                                        'valid_data_range': (0, 100),
+                                        'flags': flags,
+                                        'temporality': 'D'})
+
+
+def _sequential(gridset, filters):
+    for filter_ in filters:
+        gridset = filter_(gridset)
+    return gridset
+
+
+def _time(function):
+    return min(timeit.repeat(function, number=NUMBER, repeat=REPEATS)) / NUMBER
+
+
+def main():
+    cases = [
+        ('extent_daily', None, False),
+        ('extent_daily, drop_land', None, True),
+        ('extent_daily x30 layers', 30, True),
+    ]
+
+    print('{:<28}{:>14}{:>14}{:>10}'.format('chain', 'sequential ms', 'fused ms', 'speedup'))
+    for name, layers, drop_land in cases:
+        gridset = _gridset(layers)
+        filters = api._filters(hemisphere=nt.NORTH, month=1, drop_land=drop_land,
+                               drop_invalid_ice=True, allow_empty_gridset=False,
+                               extent_threshold=nt.EXTENT_THRESHOLD)
+
+        sequential = _time(lambda: _sequential(gridset, filters))
+        fused = _time(lambda: gf.apply_filters(gridset, filters))
+        print('{:<28}{:>14.2f}{:>14.2f}{:>9.1f}x'.format(name, sequential * 1e3, fused * 1e3,
+                                                         sequential / fused))
+
+
+if __name__ == '__main__':
+    main()
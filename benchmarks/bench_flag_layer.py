@@ -0,0 +1,74 @@
+"""Compare seaice.data.getter.flag_layer_from_cube with the layer by layer
+reduction it replaced, on 31 and 45 layer north cubes like those of a monthly
+average of daily grids and of a trend.
+
+The cubes hold concentrations masked as in getter, with flag values that are
+the same in every layer over land, coast and the pole hole, and one all
+missing layer. Run with the seaice package importable, e.g. from the
+repository root:
+
+    PYTHONPATH=. python benchmarks/bench_flag_layer.py
+
+"""
+import timeit
+
+import numpy as np
+
+import seaice.data.getter as getter
+import seaice.nasateam as nt
+
+REPEATS = 5
+
+
+def _by_layer(flag_cube, missing_value=np.nan):
+    flag_layer = flag_cube[:, :, 0]
+    for i in range(0, flag_cube.shape[2]):
+        if not np.all(flag_cube[:, :, i] == missing_value):
+            flag_layer = flag_cube[:, :, i].copy()
+            break
+
+    for i in range(0, flag_cube.shape[2]):
+        if np.all(flag_cube[:, :, i] == missing_value):
+            continue
+
+        match = flag_layer == flag_cube[:, :, i]
+        match = match.filled(False)
+
+        flag_layer = np.ma.array(flag_layer, mask=~match)
+
+    return flag_layer
+
+
+def _flag_cube(layers):
+    rows, cols = nt.NORTH['shape']
+    rng = np.random.RandomState(0)
+
+    surface = rng.choice([50., nt.FLAGS['land'], nt.FLAGS['coast'], nt.FLAGS['pole']],
+                         p=[.7, .2, .05, .05], size=(rows, cols))
+    data = np.repeat(surface[:, :, np.newaxis], layers, axis=2)
+    data[:, :, layers // 2] = nt.FLAGS['missing']
+
+    return np.ma.masked_inside(data, *nt.VALID_DATA_RANGE)
+
+
+def main():
+    print('{:<8}{:>16}{:>16}{:>10}'.format('layers', 'by layer ms', 'vectorized ms', 'speedup'))
+    for layers in (31, 45):
+        flag_cube = _flag_cube(layers)
+
+        expected = _by_layer(flag_cube, nt.FLAGS['missing'])
+        actual = getter.flag_layer_from_cube(flag_cube, nt.FLAGS['missing'])
+        assert np.array_equal(expected.mask, actual.mask)
+
+        times = []
+        for function in (_by_layer, getter.flag_layer_from_cube):
+            seconds = min(timeit.repeat(lambda: function(flag_cube, nt.FLAGS['missing']),
+                                        number=5, repeat=REPEATS))
+            times.append(seconds / 5)
+
+        print('{:<8}{:>16.1f}{:>16.1f}{:>9.1f}x'.format(
+            layers, times[0] * 1e3, times[1] * 1e3, times[0] / times[1]))
+
+
+if __name__ == '__main__':
+    main()
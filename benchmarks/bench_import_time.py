@@ -0,0 +1,119 @@
+"""Report how long importing seaice.nasateam, seaice.timeseries and
+seaice.datastore takes, as measured by `python -X importtime` in a fresh
+interpreter, along with the seaice.nasateam submodules that take the longest,
+then the import time of each console entry point module against its budget in
+ENTRY_POINT_BUDGETS.
+
+Each import is timed RUNS times and the fastest run reported, since the first
+runs also pay for reading the modules from disk. Budgets are about twice the
+time measured when they were set; lower them when an import gets faster. The
+script exits with status 1 if any entry point module is over its budget, and
+reports modules that cannot be imported here without failing. Run with the
+seaice package importable, e.g. from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_import_time.py
+
+"""
+import re
+import subprocess
+import sys
+
+MODULES = ('seaice.nasateam', 'seaice.timeseries', 'seaice.datastore')
+
+RUNS = 5
+
+# milliseconds
+ENTRY_POINT_BUDGETS = {
+    'seaice.data.cli.monthly_files_from_dailies': 800,
+    'seaice.data.cli.nasateam_file_manifest': 800,
+    'seaice.data.cli.nasateam_cube_archive': 800,
+    'seaice.data.cli.nasateam_valid_ice_mask_bundle': 800,
+    'seaice.filemapper.remap': 800,
+
+    'seaice.images.cli.sii_image': 800,
+    'seaice.images.cli.sii_image_latest': 800,
+    'seaice.images.cli.sii_image_sos': 800,
+    'seaice.images.cli.sii_image_google_earth': 800,
+    'seaice.images.cli.sii_image_geotiff': 800,
+
+    'seaice.shapefiles.cli.sii_shp': 800,
+
+    'seaice.sedna.cli.update_sea_ice_statistics_daily': 800,
+    'seaice.sedna.cli.initialize_sea_ice_statistics_daily': 800,
+    'seaice.sedna.cli.sea_ice_statistics_monthly': 800,
+    'seaice.sedna.cli.validate_daily_data': 800,
+
+    'seaice.tools.xlsify.monthly_with_statistics': 1500,
+    'seaice.tools.xlsify.rates_of_change': 800,
+    'seaice.tools.xlsify.min_max_rankings': 1500,
+    'seaice.tools.xlsify.daily_extent': 1500,
+    'seaice.tools.xlsify.daily_extent_global': 1500,
+    'seaice.tools.xlsify.regional_daily': 800,
+    'seaice.tools.xlsify.regional_monthly': 800,
+    'seaice.tools.xlsify.monthly_by_year': 800,
+    'seaice.tools.xlsify.monthly_by_year_global': 1500,
+    'seaice.tools.csvify.sea_ice_climatology': 800,
+    'seaice.tools.csvify.sea_ice_extent_daily': 1500,
+    'seaice.tools.csvify.sea_ice_extent_monthly': 1500,
+    'seaice.tools.process_latest_daily': 800,
+    'seaice.tools.process_latest_monthly': 800,
+
+    'seaice.tools.plotter.monthly_extent': 2000,
+    'seaice.tools.plotter.monthly_anomaly': 2000,
+    'seaice.tools.plotter.daily_extent': 2000,
+}
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)$')
+
+
+def import_times(module):
+    """Return a dict mapping each module imported by `import module` in a fresh
+    interpreter to its (self, cumulative) import time in microseconds.
+
+    Raise subprocess.CalledProcessError if the module cannot be imported.
+
+    """
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                            stderr=subprocess.PIPE, check=True, universal_newlines=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            times[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return times
+
+
+def fastest(module):
+    return min((import_times(module) for _ in range(RUNS)), key=lambda times: times[module][1])
+
+
+def main():
+    print('{:<20}{:>12}'.format('module', 'import ms'))
+    for module in MODULES:
+        print('{:<20}{:>12.1f}'.format(module, fastest(module)[module][1] / 1e3))
+
+    times = fastest('seaice.nasateam')
+    submodules = sorted((name for name in times if name.startswith('seaice.nasateam.')),
+                        key=lambda name: times[name][1], reverse=True)
+    print('\n{:<36}{:>12}'.format('seaice.nasateam submodule', 'cumulative ms'))
+    for name in submodules[:5]:
+        print('{:<44}{:>14.1f}'.format(name, times[name][1] / 1e3))
+
+    over_budget = False
+    print('\n{:<56}{:>12}{:>12}'.format('entry point module', 'import ms', 'budget ms'))
+    for module, budget in sorted(ENTRY_POINT_BUDGETS.items()):
+        try:
+            ms = fastest(module)[module][1] / 1e3
+        except subprocess.CalledProcessError:
+            print('{:<56}{:>12}{:>12}'.format(module, 'unimportable', budget))
+            continue
+
+        over_budget = over_budget or ms > budget
+        print('{:<56}{:>12.1f}{:>12}{}'.format(module, ms, budget,
+                                               '  over budget' if ms > budget else ''))
+
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Compare the goddard nasateam file readers in seaice.data.getter on a 30 year
+stack of monthly files.
+
+Each reader runs in its own process so that peak RSS is measured
+independently. Reading the files and building the full gridset are timed
+separately, since every gridset is a new float64 cube regardless of the
+reader. Synthetic files with the north grid's header
+and dimensions are written to a temporary directory unless a directory of
+real monthly files is given; run with the seaice package importable:
+
+    python benchmarks/bench_nasateam_readers.py [directory]
+
+"""
+import glob
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import seaice.nasateam as nt
+
+YEARS = range(1981, 2011)
+REPEATS = 5
+
+
+def _write_synthetic_stack(directory):
+    template = os.path.join(os.path.dirname(os.path.realpath(__file__)), os.path.pardir,
+                            'test_data', 'seaice.data', 'nt_20010107_f13_v01_n.bin')
+    with open(template, 'rb') as fp:
+        header = fp.read(nt.NASATEAM_HEADER_LENGTH)
+    rows, cols = nt.NORTH['shape']
+
+    rng = np.random.RandomState(0)
+    for year in YEARS:
+        for month in range(1, 13):
+            body = rng.randint(0, 256, size=rows * cols).astype(np.uint8)
+            path = os.path.join(directory, 'nt_{}{:02}_f13_v1.1_n.bin'.format(year, month))
+            with open(path, 'wb') as fp:
+                fp.write(header)
+                fp.write(body.tobytes())
+
+
+def _max_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run(reader, directory):
+    import seaice.data.getter as getter
+
+    files = sorted(glob.glob(os.path.join(directory, '*nt_*.bin')))
+    read = getter.GODDARD_NASATEAM_READERS[reader]
+    baseline = _max_rss_mb()
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        grids = [read(f) for f in files]
+        total = sum(int(grid.sum()) for grid in grids)
+    read_elapsed = (time.perf_counter() - start) / REPEATS
+    read_rss = _max_rss_mb() - baseline
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        gridset = getter._concentration_gridset_by_filelist(files, reader=reader)
+    stack_elapsed = (time.perf_counter() - start) / REPEATS
+
+    print('{:>8}: {} files (checksum {}); read {:.3f} s, peak RSS +{:.1f} MB; '
+          'gridset {} {:.3f} s, peak RSS +{:.1f} MB'.format(
+              reader, len(files), total, read_elapsed, read_rss, gridset['data'].shape,
+              stack_elapsed, _max_rss_mb() - baseline))
+
+
+def main(argv):
+    if len(argv) > 2 and argv[1] == '--reader':
+        _run(argv[2], argv[3])
+        return
+
+    directory = argv[1] if len(argv) > 1 else None
+    cleanup = directory is None
+    if cleanup:
+        directory = tempfile.mkdtemp()
+        _write_synthetic_stack(directory)
+
+    try:
+        for reader in ('fromfile', 'mmap'):
+            subprocess.check_call([sys.executable, __file__, '--reader', reader, directory])
+    finally:
+        if cleanup:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
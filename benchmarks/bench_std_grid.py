@@ -0,0 +1,66 @@
+"""Compare the standard deviation of a month of daily north grids computed by
+stacking them into a masked cube, as seaice.data.trend._std_gridset did, with
+seaice.data.trend.RunningStd, which folds in one grid at a time.
+
+Reports the time and the peak memory allocated (by tracemalloc) for 31 grids
+of concentrations with land, coast and pole hole flags. Run with the seaice
+package importable, e.g. from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_std_grid.py
+
+"""
+import timeit
+import tracemalloc
+
+import numpy as np
+
+import seaice.data.trend as trend
+import seaice.nasateam as nt
+
+REPEATS = 5
+DAYS = 31
+
+
+def _grids():
+    rows, cols = nt.NORTH['shape']
+    rng = np.random.RandomState(0)
+    surface = rng.choice([0., nt.FLAGS['land'], nt.FLAGS['coast'], nt.FLAGS['pole']],
+                         p=[.7, .2, .05, .05], size=(rows, cols))
+    return [np.where(surface == 0, rng.uniform(0, 100, size=(rows, cols)), surface)
+            for _ in range(DAYS)]
+
+
+def _stacked(grids):
+    cube = np.ma.masked_outside(np.ma.dstack(grids), 0, 100)
+    return cube.std(axis=2)
+
+
+def _running(grids):
+    running_std = trend.RunningStd()
+    for grid in grids:
+        running_std.add(grid, (0, 100))
+    return running_std.std()
+
+
+def _peak_bytes(function, grids):
+    tracemalloc.start()
+    function(grids)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    grids = _grids()
+    np.testing.assert_allclose(_running(grids).filled(0), _stacked(grids).filled(0),
+                               rtol=1e-12)
+
+    print('{:<10}{:>10}{:>12}'.format('method', 'ms', 'peak MiB'))
+    for name, function in (('stacked', _stacked), ('running', _running)):
+        seconds = min(timeit.repeat(lambda: function(grids), number=1, repeat=REPEATS))
+        peak = _peak_bytes(function, grids)
+        print('{:<10}{:>10.1f}{:>12.1f}'.format(name, seconds * 1e3, peak / 2**20))
+
+
+if __name__ == '__main__':
+    main()
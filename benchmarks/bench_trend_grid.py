@@ -0,0 +1,85 @@
+"""Compare the trend grid step of concentration_monthly_trend, the weighted
+least squares fit of every gridcell in seaice.data.trend._trend_grid, with the
+per gridcell statsmodels fits run in a ThreadPool that it replaced.
+
+The cube is a north grid of 45 years of synthetic concentrations, with weights
+like those _weight_from_std gives, a third of them 0. The statsmodels fits
+take minutes for a whole grid, so they are timed on SAMPLE_CELLS gridcells and
+the time scaled to the grid. Run with the seaice package importable, e.g.
+from the repository root:
+
+    PYTHONPATH=. python benchmarks/bench_trend_grid.py
+
+"""
+from functools import partial
+from multiprocessing.pool import ThreadPool
+import time
+
+import numpy as np
+import statsmodels.api as sm
+
+import seaice.data.trend as trend
+import seaice.nasateam as nt
+
+YEARS = 45
+
+SAMPLE_CELLS = 3000
+
+
+def _trend_gridcell(concentrations, weights, *, clipping_threshold):
+    nonzero_weights = (weights != 0)
+    if np.sum(nonzero_weights) < 3:
+        return 0
+
+    x = sm.add_constant(np.arange(concentrations.size)[nonzero_weights])
+    result = sm.WLS(concentrations[nonzero_weights], x, weights=weights[nonzero_weights]).fit()
+    if result.f_pvalue > trend.MAXIMUM_F_TEST_P_VALUE:
+        return 0
+
+    return np.clip(result.params[1] * 10, -clipping_threshold, clipping_threshold)
+
+
+def _statsmodels_trend_cells(concentrations, weights, clipping_threshold):
+    fn = partial(_trend_gridcell, clipping_threshold=clipping_threshold)
+    with ThreadPool() as p:
+        return np.array(p.starmap(fn, zip(concentrations, weights)))
+
+
+def _cubes():
+    rows, cols = nt.NORTH['shape']
+    rng = np.random.RandomState(0)
+    slopes = rng.uniform(-1, 1, size=(rows, cols, 1))
+    concentration_cube = np.clip(60 + slopes * np.arange(YEARS) +
+                                 rng.normal(scale=10, size=(rows, cols, YEARS)), 0, 100)
+    std_cube = rng.uniform(1, 20, size=(rows, cols, YEARS))
+    std_cube[rng.rand(rows, cols, YEARS) < 1 / 3] = 0
+    return concentration_cube, trend._weight_from_std(std_cube)
+
+
+def main():
+    concentration_cube, weight_cube = _cubes()
+    cells = concentration_cube.shape[0] * concentration_cube.shape[1]
+
+    start = time.perf_counter()
+    trend_grid = trend._trend_grid(concentration_cube, weight_cube, clipping_threshold=100)
+    vectorized = time.perf_counter() - start
+
+    sample = np.random.RandomState(1).choice(cells, SAMPLE_CELLS, replace=False)
+    concentrations = concentration_cube.reshape(cells, YEARS)[sample]
+    weights = weight_cube.reshape(cells, YEARS)[sample]
+
+    start = time.perf_counter()
+    expected = _statsmodels_trend_cells(concentrations, weights, 100)
+    per_cell = (time.perf_counter() - start) * cells / SAMPLE_CELLS
+
+    assert np.allclose(trend_grid.reshape(cells)[sample], expected)
+
+    print('{} gridcells, {} years'.format(cells, YEARS))
+    print('{:<28}{:>12.2f} s (scaled from {} gridcells)'.format(
+        'statsmodels in ThreadPool', per_cell, SAMPLE_CELLS))
+    print('{:<28}{:>12.2f} s'.format('vectorized', vectorized))
+    print('{:<28}{:>11.0f}x'.format('speedup', per_cell / vectorized))
+
+
+if __name__ == '__main__':
+    main()
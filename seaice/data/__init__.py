@@ -16,10 +16,12 @@ from .api import concentration_monthly_trend  # noqa
 from .api import concentration_seasonal_trend  # noqa
 from .api import extent_daily  # noqa
 from .api import extent_daily_median  # noqa
+from .api import extent_daily_median_climatology  # noqa
 from .api import extent_monthly  # noqa
 from .api import extent_monthly_median  # noqa
 from .errors import SeaIceDataException  # noqa
 from .errors import SeaIceDataNoData  # noqa
+from .getter import MonthlyGridsets  # noqa
 from . import gridset_filters as filters  # noqa
 from .version import VERSION as __version__  # noqa
 
@@ -28,8 +30,10 @@ __all__ = [
     'concentration_monthly',
     'extent_daily',
     'extent_daily_median',
+    'extent_daily_median_climatology',
     'extent_monthly',
     'extent_monthly_median',
+    'MonthlyGridsets',
     'SeaIceDataException',
     'SeaIceDataNoData',
     'filters'
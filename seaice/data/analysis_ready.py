@@ -1,14 +1,15 @@
 """Functions for making xarray.Dataset objects of sea ice data
 """
-import xarray as xr
 import pandas as pd
 import numpy as np
 
-from affine import Affine
-
 from .api import concentration_daily
+from seaice.lazy_import import lazy_import
 import seaice.nasateam as nt
 
+xr = lazy_import('xarray')
+Affine = lazy_import('affine', 'Affine')
+
 
 def affine_transform(hemisphere):
     """Returns affine transformation matrix"""
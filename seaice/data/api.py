@@ -5,14 +5,16 @@ import functools
 
 import numpy as np
 import pandas as pd
-import scipy.stats
 
 from . import gridset_filters as gf
 from . import getter
 from . import grid_filters
 from . import trend
+from seaice.lazy_import import lazy_import
 import seaice.nasateam as nt
 
+scipy_stats = lazy_import('scipy.stats')
+
 
 def concentration_daily(hemisphere=None, year=None, month=None, day=None,
                         search_paths=nt.DEFAULT_SEA_ICE_PATHS,
@@ -116,7 +118,7 @@ def concentration_daily_average_over_date_range(hemi,
                                                                  date_range,
                                                                  search_paths)
 
-    [month], _ = scipy.stats.mode(date_range.month)
+    [month], _ = scipy_stats.mode(date_range.month)
 
     filters = _filters(hemisphere=nt_hemi,
                        month=month,
@@ -291,6 +293,46 @@ def extent_daily_median(hemisphere=None, start_year=None, end_year=None, date=No
     return gridset
 
 
+def extent_daily_median_climatology(hemisphere=None, start_year=None, end_year=None,
+                                    dayofyears=None, search_paths=nt.DEFAULT_SEA_ICE_PATHS,
+                                    interpolation_radius=1,
+                                    extent_threshold=nt.EXTENT_THRESHOLD,
+                                    allow_empty_gridset=True, allow_bad_dates=False,
+                                    drop_land=False, drop_invalid_ice=False):
+    """Yield (dayofyear, gridset) pairs, in order of dayofyear, where each gridset is
+    the one extent_daily_median returns for that dayofyear with the same
+    arguments.
+
+    The daily files of the years from start_year to end_year are read once, in
+    date order, and each grid is added to the median of every dayofyear that
+    uses it, instead of reading the files around each dayofyear separately;
+    use this instead of calling extent_daily_median for many days of the year.
+
+    Keyword Arguments:
+    ----------------
+    dayofyears           -- Iterable of integer day of year numbers. Defaults to
+                            every day of the year, 1 through 366.
+
+    All other arguments are as for extent_daily_median.
+
+    """
+    medians = getter.extent_daily_median_climatology(hemisphere, start_year, end_year,
+                                                     dayofyears, search_paths,
+                                                     interpolation_radius, extent_threshold,
+                                                     allow_bad_dates)
+
+    for dayofyear, gridset in medians:
+        filters = _filters(hemisphere=hemisphere,
+                           start_year=start_year,
+                           end_year=end_year,
+                           dayofyear=dayofyear,
+                           drop_land=drop_land,
+                           drop_invalid_ice=drop_invalid_ice,
+                           allow_empty_gridset=allow_empty_gridset)
+
+        yield dayofyear, gf.apply_filters(gridset, filters)
+
+
 def concentration_monthly(hemisphere=None, year=None, month=None,
                           search_paths=nt.DEFAULT_SEA_ICE_PATHS,
                           allow_empty_gridset=True, drop_land=False,
@@ -424,16 +466,19 @@ def concentration_monthly_anomaly(hemisphere=None, year=None, month=None,
                                                  min_days_for_valid_month)
     month_gridset = gf.apply_filters(month_gridset, filters + [cutoff])
 
-    climatology_gridset = getter.concentration_monthly_over_years(hemisphere,
-                                                                  start_year,
-                                                                  end_year,
-                                                                  month,
-                                                                  search_paths,
-                                                                  min_days_for_valid_month)
-    climatology_gridset = gf.apply_filters(climatology_gridset,
-                                           filters + [gf.apply_largest_pole_hole])
+    if nt.CLIMATOLOGY_STORE_PATH is None or ensure_full_nrt_month:
+        climatology_gridset = _climatology_gridset(hemisphere, month, start_year, end_year,
+                                                   search_paths, min_days_for_valid_month,
+                                                   filters)
+        climatology = _climatology(climatology_gridset)
+    else:
+        # imported here to avoid a circular import
+        from . import climatology_store
+        climatology = climatology_store.climatology(hemisphere, month, start_year, end_year,
+                                                    search_paths, min_days_for_valid_month,
+                                                    allow_empty_gridset=allow_empty_gridset)
 
-    gridset = _anomaly_gridset(month_gridset, climatology_gridset)
+    gridset = _anomaly_gridset_from_climatology(month_gridset, climatology)
 
     return gridset
 
@@ -441,7 +486,7 @@ def concentration_monthly_anomaly(hemisphere=None, year=None, month=None,
 def concentration_monthly_trend(hemisphere=None, year=None, month=None,
                                 search_paths=nt.DEFAULT_SEA_ICE_PATHS,
                                 min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH,
-                                trend_start_year=None, *, clipping_threshold):
+                                trend_start_year=None, *, clipping_threshold, workers=1):
     """Return a gridset containing the trend of concentration for the given month in
     percentage of ice change per decade, calculated from data for the entire
     satellite period.
@@ -493,17 +538,21 @@ def concentration_monthly_trend(hemisphere=None, year=None, month=None,
                             outside of which values will be clipped to the
                             threshold.
 
+    workers              -- number of processes computing the standard deviation
+                            grids of the years; 1, the default, computes them
+                            in this process.
+
     """
     return trend.trend_gridset(hemisphere, year, month, search_paths,
                                min_days_for_valid_month, trend_start_year,
-                               clipping_threshold=clipping_threshold)
+                               clipping_threshold=clipping_threshold, workers=workers)
 
 
 def concentration_seasonal_trend(hemisphere=None, year=None, season=None,
                                  search_paths=nt.DEFAULT_SEA_ICE_PATHS,
                                  seasons=nt.SEASONS,
                                  min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH,
-                                 *, clipping_threshold):
+                                 *, clipping_threshold, workers=1, monthly_gridsets=None):
     """Return a gridset containing the trend of concentration for the given season
     in percentage of ice change per decade, calculated from data for the entire
     satellite period.
@@ -555,10 +604,21 @@ def concentration_seasonal_trend(hemisphere=None, year=None, season=None,
     clipping_threshold   -- integer representing absolute value of threshold
                             outside of which values will be clipped to the
                             threshold.
+
+    workers              -- number of processes computing the standard deviation
+                            grids of the years; 1, the default, computes them
+                            in this process.
+
+    monthly_gridsets     -- a seaice.data.MonthlyGridsets holding the monthly
+                            gridsets of other seasons of the same run, so that
+                            months shared with them are built once; by
+                            default every monthly gridset is built.
     """
     return trend.seasonal_trend_gridset(hemisphere, year, season, search_paths,
                                         seasons, min_days_for_valid_month,
-                                        clipping_threshold=clipping_threshold)
+                                        clipping_threshold=clipping_threshold,
+                                        workers=workers,
+                                        monthly_gridsets=monthly_gridsets)
 
 
 def extent_monthly(hemisphere=None, year=None, month=None,
@@ -759,51 +819,76 @@ def _filters(*,
 
 
 def _anomaly_gridset(month_gridset, climatology_gridset):
-    def masked_data(gridset):
-        """Return gridset's data with everything outside the valid range masked"""
-        return np.ma.masked_outside(gridset['data'], *gridset['metadata']['valid_data_range'])
+    return _anomaly_gridset_from_climatology(month_gridset, _climatology(climatology_gridset))
+
 
-    def flags_only(gridset):
-        """Return gridset's data with everything in the valid range masked"""
-        return np.ma.masked_inside(gridset['data'], *gridset['metadata']['valid_data_range'])
+def _climatology_gridset(hemisphere, month, start_year, end_year, search_paths,
+                         min_days_for_valid_month, filters):
+    """Return the cube of the month's concentrations from start_year to end_year,
+    with the given filters and the largest pole hole applied."""
+    climatology_gridset = getter.concentration_monthly_over_years(hemisphere,
+                                                                  start_year,
+                                                                  end_year,
+                                                                  month,
+                                                                  search_paths,
+                                                                  min_days_for_valid_month)
+    return gf.apply_filters(climatology_gridset, filters + [gf.apply_largest_pole_hole])
 
-    def largest_pole_hole(month_gridset, climatology_gridset, pole_hole_value):
-        """Returns a 2D boolean np array where True values represent the largest
-        pole hole found between the month_gridset and climatology_gridset.
-        """
-        climatology_pole_hole = np.any(climatology_gridset['data'] == pole_hole_value, axis=2)
-        month_pole_hole = month_gridset['data'] == pole_hole_value
 
-        return np.logical_or(climatology_pole_hole, month_pole_hole)
+def _climatology(climatology_gridset):
+    """Return a dict of what an anomaly needs from a climatology cube: its mean
+    'grid', cut off at nt.EXTENT_THRESHOLD, its 'flag_layer', the union of its
+    pole holes ('pole_hole') and the 'metadata' of its files."""
+    metadata = climatology_gridset['metadata']
+    data = climatology_gridset['data']
 
-    climatology_grid = masked_data(climatology_gridset).mean(axis=2)
+    climatology_grid = np.ma.masked_outside(data, *metadata['valid_data_range']).mean(axis=2)
     climatology_grid = grid_filters.concentration_cutoff(nt.EXTENT_THRESHOLD, climatology_grid)
 
+    flags_only = np.ma.masked_inside(data, *metadata['valid_data_range'])
+    flag_layer = getter.flag_layer_from_cube(flags_only, nt.FLAGS['missing'])
+
+    pole_hole = np.ma.filled(np.any(data == metadata['flags']['pole'], axis=2), False)
+
+    return {
+        'grid': climatology_grid,
+        'flag_layer': flag_layer,
+        'pole_hole': pole_hole,
+        'metadata': {key: metadata[key] for key in ('files', 'period_index', 'valid_data_range')}
+    }
+
+
+def _anomaly_gridset_from_climatology(month_gridset, climatology):
+    def masked_data(gridset):
+        """Return gridset's data with everything outside the valid range masked"""
+        return np.ma.masked_outside(gridset['data'], *gridset['metadata']['valid_data_range'])
+
     # take the difference of masked grids, so that land and pole hole aren't
     # included in the subtraction
-    anomaly_grid = masked_data(month_gridset) - climatology_grid
+    anomaly_grid = masked_data(month_gridset) - climatology['grid']
 
     # fill in the mask with land and pole hole
-    flag_layer = getter.flag_layer_from_cube(flags_only(climatology_gridset), nt.FLAGS['missing'])
-    anomaly_grid = anomaly_grid.filled(flag_layer)
+    anomaly_grid = anomaly_grid.filled(climatology['flag_layer'])
 
-    # Apply the largest pole hole to the anomaly_grid.
+    # Apply the largest pole hole, of the month and the climatology, to the
+    # anomaly_grid.
     pole_hole_value = month_gridset['metadata']['flags']['pole']
-    pole_hole = largest_pole_hole(month_gridset, climatology_gridset, pole_hole_value)
+    pole_hole = np.logical_or(climatology['pole_hole'],
+                              month_gridset['data'] == pole_hole_value)
     anomaly_grid[pole_hole] = pole_hole_value
 
     metadata = copy.deepcopy(month_gridset['metadata'])
     metadata['month_files'] = metadata.pop('files')
     metadata['month_period_index'] = metadata.pop('period_index')
-    metadata['climatology_files'] = climatology_gridset['metadata']['files']
-    metadata['climatology_period_index'] = climatology_gridset['metadata']['period_index']
+    metadata['climatology_files'] = climatology['metadata']['files']
+    metadata['climatology_period_index'] = climatology['metadata']['period_index']
     metadata['type'] = 'Monthly Anomaly'
 
     valid_data_min = (month_gridset['metadata']['valid_data_range'][0] -
-                      climatology_gridset['metadata']['valid_data_range'][1])
+                      climatology['metadata']['valid_data_range'][1])
 
     valid_data_max = (month_gridset['metadata']['valid_data_range'][1] -
-                      climatology_gridset['metadata']['valid_data_range'][0])
+                      climatology['metadata']['valid_data_range'][0])
 
     metadata['valid_data_range'] = (valid_data_min, valid_data_max)
 
@@ -0,0 +1,238 @@
+"""A chunked netCDF4 archive of the Goddard nasateam grids.
+
+Every daily file for a hemisphere and year is packed into one store, and every
+monthly file for a hemisphere into another:
+
+    nt_daily_<hemisphere>_<year>.nc
+    nt_monthly_<hemisphere>.nc
+
+Each store holds the raw uint8 grids, time-major and compressed one grid per
+chunk, in the variable 'concentration' with dimensions (time, rows, cols),
+along with the basename, size and mtime of the file each grid came from.
+Grids are looked up by the basename of the file they came from, so a list of
+files found by seaice.data.locator can be read from the archive instead,
+opening a handful of stores rather than one file per grid.
+
+A grid is only read from the archive if the size and mtime of the file it is
+requested for match those recorded; otherwise the files are read instead
+until the nasateam_cube_archive CLI is run to update the archive.
+
+"""
+import collections
+import logging
+import os
+import threading
+
+from netCDF4 import Dataset
+import numpy as np
+
+from . import errors as e
+from . import stores
+import seaice.nasateam as nt
+
+log = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = 1
+
+COMPRESSION_LEVEL = 4
+
+
+def store_name(filename):
+    """Return the name of the store holding the grid in filename, or None if
+    filename is not a nasateam data file."""
+    match = nt.DATA_FILENAME_MATCHER.search(os.path.basename(filename))
+    if match is None:
+        return None
+
+    hemisphere = match.group('hemisphere').lower()
+    if match.group('day') is None:
+        return 'nt_monthly_{}.nc'.format(hemisphere)
+    return 'nt_daily_{}_{}.nc'.format(hemisphere, match.group('year'))
+
+
+class CubeArchive(object):
+    """A directory of chunked nasateam stores.
+
+    Stores are opened on first use and kept open; a store replaced on disk by
+    update() is opened again the next time it is read.
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._stores = {}
+        self._lock = threading.Lock()
+
+    def read(self, file_list):
+        """Return a uint8 array of shape (rows, cols, len(file_list)) holding the
+        raw grid of each file in file_list, or None if any of them is not in
+        the archive, or has a different size or mtime than when it was
+        archived.
+
+        """
+        with self._lock:
+            layers_by_store = collections.OrderedDict()
+            for layer, filename in enumerate(file_list):
+                basename = os.path.basename(filename)
+                name = store_name(basename)
+                store = None if name is None else self._store(name)
+                if store is None or basename not in store['index']:
+                    return None
+
+                position, size, mtime_ns = store['index'][basename]
+                try:
+                    st = os.stat(filename)
+                except OSError:
+                    return None
+                if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+                    return None
+
+                layers_by_store.setdefault(name, []).append((layer, position))
+
+            cube = None
+            for name, layers in layers_by_store.items():
+                variable = self._stores[name]['dataset'].variables['concentration']
+                if cube is None:
+                    cube = np.empty(variable.shape[1:] + (len(file_list),), dtype=np.uint8)
+
+                positions = np.array([position for layer, position in layers])
+                unique_positions, inverse = np.unique(positions, return_inverse=True)
+                grids = _read_positions(variable, unique_positions)
+                cube[:, :, [layer for layer, position in layers]] = np.moveaxis(
+                    grids[inverse], 0, 2)
+
+            return cube
+
+    def update(self, files, rebuild=False):
+        """Write every store whose files have been added or changed since it was
+        last written. Returns a tuple (written, unchanged) of store names.
+
+        """
+        files_by_store = collections.defaultdict(dict)
+        for filename in sorted(files):
+            name = store_name(filename)
+            if name is not None:
+                # the first of several files with the same name wins, like a
+                # lookup by basename
+                files_by_store[name].setdefault(os.path.basename(filename), filename)
+
+        os.makedirs(self.path, exist_ok=True)
+
+        written, unchanged = [], []
+        for name in sorted(files_by_store):
+            sources = [(basename, filename, os.stat(filename))
+                       for basename, filename in sorted(files_by_store[name].items())]
+            if not rebuild and self._recorded_sources(name) == [
+                    (basename, st.st_size, st.st_mtime_ns) for basename, filename, st in sources]:
+                unchanged.append(name)
+                continue
+
+            self._write(name, sources)
+            written.append(name)
+
+        return written, unchanged
+
+    def close(self):
+        with self._lock:
+            for store in self._stores.values():
+                store['dataset'].close()
+            self._stores = {}
+
+    def _store(self, name):
+        path = os.path.join(self.path, name)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        store = self._stores.get(name)
+        if store is not None and store['mtime_ns'] == mtime_ns:
+            return store
+
+        if store is not None:
+            store['dataset'].close()
+
+        dataset = Dataset(path, 'r')
+        dataset.set_auto_mask(False)
+        variables = dataset.variables
+        sources = zip(variables['filename'][:], variables['source_size'][:],
+                      variables['source_mtime_ns'][:])
+        store = {'dataset': dataset,
+                 'mtime_ns': mtime_ns,
+                 'index': {basename: (position, int(size), int(source_mtime_ns))
+                           for position, (basename, size, source_mtime_ns) in enumerate(sources)}}
+        self._stores[name] = store
+        return store
+
+    def _recorded_sources(self, name):
+        path = os.path.join(self.path, name)
+        if not os.path.exists(path):
+            return None
+
+        with Dataset(path, 'r') as dataset:
+            variables = dataset.variables
+            return list(zip(variables['filename'][:],
+                            (int(size) for size in variables['source_size'][:]),
+                            (int(mtime) for mtime in variables['source_mtime_ns'][:])))
+
+    def _write(self, name, sources):
+        # imported here to avoid a circular import
+        from .getter import _read_goddard_nasateam_file
+
+        path = os.path.join(self.path, name)
+        with stores.atomic_path(path) as tmp_path:
+            with Dataset(tmp_path, 'w', format='NETCDF4') as dataset:
+                dataset.nasateam_archive_version = ARCHIVE_VERSION
+
+                variable = None
+                for position, (basename, filename, st) in enumerate(sources):
+                    grid = _read_goddard_nasateam_file(filename)
+                    if variable is None:
+                        variable = _create_variables(dataset, grid.shape, len(sources))
+                    elif grid.shape != variable.shape[1:]:
+                        raise e.SeaIceDataValueError(
+                            'Grid in {} has shape {}; expected {} for {}'.format(
+                                filename, grid.shape, variable.shape[1:], name))
+
+                    variable[position, :, :] = grid
+                    dataset.variables['filename'][position] = basename
+                    dataset.variables['source_size'][position] = st.st_size
+                    dataset.variables['source_mtime_ns'][position] = st.st_mtime_ns
+
+        log.info('wrote {} grids to {}'.format(len(sources), path))
+
+
+def _read_positions(variable, positions):
+    """Read the grids at the sorted, unique positions along the time dimension
+    of variable. Each run of consecutive positions is read as one contiguous
+    slice; netCDF4's strided and integer-sequence reads are far slower than
+    reading the chunks they cover one by one.
+
+    """
+    runs = np.split(positions, np.flatnonzero(np.diff(positions) != 1) + 1)
+    return np.concatenate([variable[run[0]:run[-1] + 1, :, :] for run in runs])
+
+
+def _create_variables(dataset, shape, length):
+    rows, cols = shape
+    dataset.createDimension('time', length)
+    dataset.createDimension('rows', rows)
+    dataset.createDimension('cols', cols)
+
+    dataset.createVariable('filename', str, ('time',))
+    dataset.createVariable('source_size', 'i8', ('time',))
+    dataset.createVariable('source_mtime_ns', 'i8', ('time',))
+
+    return dataset.createVariable('concentration', 'u1', ('time', 'rows', 'cols'),
+                                  zlib=True, complevel=COMPRESSION_LEVEL,
+                                  chunksizes=(1, rows, cols))
+
+
+_archives = {}
+
+
+def cube_archive(path):
+    """Return the CubeArchive for path, shared by every caller in the process."""
+    if path not in _archives:
+        _archives[path] = CubeArchive(path)
+    return _archives[path]
@@ -1,4 +1,7 @@
+from collections import namedtuple, OrderedDict
 from functools import lru_cache, update_wrapper
+import os
+import threading
 
 
 # Create a class that is a decorator used for caching the seaice filesystem
@@ -19,7 +22,8 @@ class SeaiceFsCache(object):
 
 def define_seaice_fs_cache(func):
     """Function used to set a decorator that wraps calls to
-    locator._find_all_nasateam_ice_files
+    locator._find_all_nasateam_ice_files and, when FILE_MANIFEST_PATH is set,
+    locator._find_all_nasateam_ice_files_in_manifest
 
     The wrapped function must take a function `func` as it's first argument, and
     pass all other *args and **kwargs down to `func`. The return value from
@@ -34,3 +38,76 @@ def define_seaice_fs_cache(func):
         del SeaiceFsCache.cache_clear
 
     setattr(SeaiceFsCache, '__call__', bound_func)
+
+
+DecodedGridCacheInfo = namedtuple('DecodedGridCacheInfo',
+                                  ['hits', 'misses', 'evictions', 'entries', 'nbytes', 'max_bytes'])
+
+
+class DecodedGridCache(object):
+    """Least recently used cache of the grids decoded from data files, holding
+    at most max_bytes of grids.
+
+    Grids are keyed by the path, size, and mtime of the file they were read
+    from, so a file that is replaced on disk is read again. Cached grids are
+    made read-only since every caller shares them.
+
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._grids = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, path, load):
+        """Return the grid for path, calling load(path) to read it if it is not in
+        the cache."""
+        st = os.stat(path)
+        key = (path, st.st_size, st.st_mtime_ns)
+
+        with self._lock:
+            grid = self._grids.get(key)
+            if grid is not None:
+                self._grids.move_to_end(key)
+                self._hits += 1
+                return grid
+            self._misses += 1
+
+        grid = load(path)
+        grid.flags.writeable = False
+
+        with self._lock:
+            if key not in self._grids and grid.nbytes <= self.max_bytes:
+                self._grids[key] = grid
+                self._nbytes += grid.nbytes
+                self._evict()
+
+        return grid
+
+    def resize(self, max_bytes):
+        """Change the byte budget, evicting grids if it shrank."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def info(self):
+        with self._lock:
+            return DecodedGridCacheInfo(self._hits, self._misses, self._evictions,
+                                        len(self._grids), self._nbytes, self.max_bytes)
+
+    def cache_clear(self):
+        """Remove every grid and reset the counters."""
+        with self._lock:
+            self._grids.clear()
+            self._nbytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def _evict(self):
+        while self._nbytes > self.max_bytes:
+            key, grid = self._grids.popitem(last=False)
+            self._nbytes -= grid.nbytes
+            self._evictions += 1
@@ -0,0 +1,44 @@
+import click
+
+from .. import archive
+from .. import locator
+from seaice import version_flag
+import seaice.nasateam as nt
+import seaice.logging as sil
+
+log = sil.init('seaice.data')
+
+
+@click.command()
+@click.option('-a', '--archive-path', default=nt.CUBE_ARCHIVE_PATH,
+              required=nt.CUBE_ARCHIVE_PATH is None,
+              type=click.Path(file_okay=False),
+              help=('Directory holding the archive. It is created if it does not exist. '
+                    'Default: {}').format(nt.CUBE_ARCHIVE_PATH))
+@click.option('-sp', '--search-paths', multiple=True,
+              default=nt.DEFAULT_SEA_ICE_PATHS,
+              help=('Paths to search for daily and monthly sea ice concentration files. '
+                    'Default: {}').format(nt.DEFAULT_SEA_ICE_PATHS))
+@click.option('--rebuild', is_flag=True, default=False,
+              help='Write every store again, even those whose files have not changed.')
+@version_flag
+@sil.log_command(log)
+def nasateam_cube_archive(archive_path, search_paths, rebuild):
+    """Pack the daily and monthly nasateam files found in the search paths into
+    the chunked archive read by seaice.data (see seaice.data.archive). Only the
+    stores whose files were added or changed since the last run are written.
+
+    Set CUBE_ARCHIVE_PATH in the file named by OVERRIDE_NASATEAM_CONSTANTS to
+    have seaice.data read grids from the archive.
+
+    """
+    files = locator._find_all_nasateam_ice_files_multiple_paths(list(search_paths))
+
+    written, unchanged = archive.CubeArchive(archive_path).update(files, rebuild=rebuild)
+
+    print('archive {}: wrote {} stores, {} unchanged'.format(archive_path, len(written),
+                                                             len(unchanged)))
+
+
+if __name__ == '__main__':
+    nasateam_cube_archive()
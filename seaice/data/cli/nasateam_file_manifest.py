@@ -0,0 +1,66 @@
+import sys
+
+import click
+
+from .. import manifest
+from seaice import version_flag
+import seaice.nasateam as nt
+import seaice.logging as sil
+
+log = sil.init('seaice.data')
+
+
+@click.command()
+@click.option('-m', '--manifest-path', default=nt.FILE_MANIFEST_PATH,
+              required=nt.FILE_MANIFEST_PATH is None,
+              type=click.Path(dir_okay=False),
+              help=('SQLite file holding the manifest. It is created if it does not '
+                    'exist. Default: {}').format(nt.FILE_MANIFEST_PATH))
+@click.option('-sp', '--search-paths', multiple=True,
+              default=nt.DEFAULT_SEA_ICE_PATHS,
+              help=('Paths to search for daily and monthly sea ice concentration files. '
+                    'Default: {}').format(nt.DEFAULT_SEA_ICE_PATHS))
+@click.option('--rebuild', is_flag=True, default=False,
+              help='Discard the existing manifest and list every directory again.')
+@click.option('--verify', is_flag=True, default=False,
+              help=('Compare the manifest with a full walk of the search paths instead '
+                    'of updating it. Exits with status 1 if they differ.'))
+@version_flag
+@sil.log_command(log)
+def nasateam_file_manifest(manifest_path, search_paths, rebuild, verify):
+    """Build, update, or verify the on-disk manifest of nasateam files used by
+    seaice.data to locate files without walking the search paths.
+
+    Set FILE_MANIFEST_PATH in the file named by OVERRIDE_NASATEAM_CONSTANTS to
+    have seaice.data use the manifest.
+
+    """
+    file_manifest = manifest.FileManifest(manifest_path)
+
+    if verify:
+        missing, extra = file_manifest.verify(search_paths)
+        for f in missing:
+            print('not in manifest: {}'.format(f))
+        for f in extra:
+            print('not on disk: {}'.format(f))
+        file_manifest.close()
+
+        if missing or extra:
+            log.warn('manifest {} is out of date; {} missing, {} extra '
+                     'files'.format(manifest_path, len(missing), len(extra)))
+            sys.exit(1)
+
+        log.info('manifest {} matches {}'.format(manifest_path, list(search_paths)))
+        return
+
+    if rebuild:
+        file_manifest.clear()
+
+    count = len(file_manifest.filenames(search_paths))
+    file_manifest.close()
+
+    print('manifest {} holds {} files'.format(manifest_path, count))
+
+
+if __name__ == '__main__':
+    nasateam_file_manifest()
@@ -0,0 +1,39 @@
+import click
+
+from seaice import version_flag
+from seaice.data.stores import save_npz
+from seaice.nasateam.loci_mask import loci_mask_bundle_arrays
+import seaice.nasateam as nt
+import seaice.logging as sil
+
+log = sil.init('seaice.data')
+
+
+@click.command()
+@click.option('-o', '--output', default=nt.VALID_ICE_MASK_BUNDLE_PATH,
+              type=click.Path(dir_okay=False),
+              help='Bundle file to write. Default: {}'.format(nt.VALID_ICE_MASK_BUNDLE_PATH))
+@click.option('-h', '--hemisphere', 'hemispheres', multiple=True,
+              type=click.Choice(nt.VALID_HEMISPHERES), default=nt.VALID_HEMISPHERES,
+              help='Hemisphere whose masks are bundled; may be given more than once. '
+              'Default: both')
+@version_flag
+@sil.log_command(log)
+def nasateam_valid_ice_mask_bundle(output, hemispheres):
+    """Pack the twelve monthly NSIDC-0622 valid ice masks of each hemisphere into
+    the single npz file served by nt.loci_mask, nt.invalid_ice_mask and
+    nt.shore_mask. The masks are read from the netCDF files in the
+    'valid_ice_mask_dir' of each hemisphere.
+
+    Set VALID_ICE_MASK_BUNDLE_PATH in the file named by
+    OVERRIDE_NASATEAM_CONSTANTS to serve the masks from a bundle written
+    elsewhere. The file is replaced atomically.
+
+    """
+    save_npz(output, loci_mask_bundle_arrays([nt.by_name(name) for name in hemispheres]))
+
+    print('wrote the valid ice masks of {} to {}'.format(', '.join(hemispheres), output))
+
+
+if __name__ == '__main__':
+    nasateam_valid_ice_mask_bundle()
@@ -0,0 +1,181 @@
+"""Monthly climatologies kept on disk for anomalies.
+
+A monthly anomaly (see seaice.data.api.concentration_monthly_anomaly) subtracts
+the mean concentration of its month over a range of years, the climatology,
+from the month's concentration. The climatology only changes when the files it
+is read from change, so when nt.CLIMATOLOGY_STORE_PATH is set each hemisphere,
+month and range of years has a store there:
+
+    climatology_<hemisphere>_<month>_<start year>-<end year>.npz
+
+holding what the anomaly needs from the climatology: its mean grid, its flag
+layer, the union of its pole holes and the metadata of its files.
+
+A store is saved with a fingerprint of the path, size and mtime of the monthly
+and daily files of every year of the climatology and of the settings it
+depends on (the invalid ice mask, nt.LAST_DAY_WITH_VALID_FINAL_DATA, ...); it
+is rebuilt when that fingerprint changes.
+
+"""
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import api
+from . import errors as e
+from . import locator
+from . import stores
+import seaice.nasateam as nt
+
+log = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+
+
+def store_name(nt_hemi, month, start_year, end_year):
+    """Return the name of the store of the climatology of the given hemisphere,
+    month and years."""
+    return 'climatology_{}_{:02}_{}-{}.npz'.format(nt_hemi['short_name'], month,
+                                                   start_year, end_year)
+
+
+def climatology(nt_hemi, month, start_year, end_year, search_paths,
+                min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH, *,
+                allow_empty_gridset=True):
+    """Return the climatology seaice.data.api._climatology computes for the month
+    from start_year to end_year, from the store in nt.CLIMATOLOGY_STORE_PATH.
+
+    If allow_empty_gridset is False, raise SeaIceDataNoData when every gridcell
+    of the climatology is missing.
+
+    """
+    fingerprint = _fingerprint(nt_hemi, month, start_year, end_year, search_paths,
+                               min_days_for_valid_month)
+
+    os.makedirs(nt.CLIMATOLOGY_STORE_PATH, exist_ok=True)
+    path = os.path.join(nt.CLIMATOLOGY_STORE_PATH,
+                        store_name(nt_hemi, month, start_year, end_year))
+
+    store = ClimatologyStore.load(path)
+    if store is None or store.fingerprint != fingerprint:
+        if store is not None:
+            log.info('files or settings changed since {} was saved; rebuilding it'.format(path))
+        store = ClimatologyStore.build(nt_hemi, month, start_year, end_year, search_paths,
+                                       min_days_for_valid_month, fingerprint)
+        store.save(path)
+
+    if store.all_missing and not allow_empty_gridset:
+        raise e.SeaIceDataNoData()
+
+    return store.climatology
+
+
+class ClimatologyStore(object):
+    """A climatology, as returned by seaice.data.api._climatology, with the
+    fingerprint of the files and settings it was computed from."""
+
+    def __init__(self, fingerprint, climatology, all_missing):
+        self.fingerprint = fingerprint
+        self.climatology = climatology
+        self.all_missing = all_missing
+
+    @classmethod
+    def build(cls, nt_hemi, month, start_year, end_year, search_paths,
+              min_days_for_valid_month, fingerprint):
+        """Return the store of the climatology computed from every year."""
+        filters = api._filters(hemisphere=nt_hemi, month=month, drop_invalid_ice=True)
+        gridset = api._climatology_gridset(nt_hemi, month, start_year, end_year, search_paths,
+                                           min_days_for_valid_month, filters)
+
+        # what gf.prevent_empty checks of the climatology cube
+        data = gridset['data']
+        all_missing = bool(np.all(data == gridset['metadata']['missing_value']) or
+                           0 in data.shape)
+
+        return cls(fingerprint, api._climatology(gridset), all_missing)
+
+    def save(self, path):
+        """Write the store to the npz file at path, replacing it atomically."""
+        climatology = self.climatology
+        metadata = climatology['metadata']
+
+        arrays = {
+            'version': np.array(STORE_VERSION),
+            'fingerprint': np.array(self.fingerprint),
+            'all_missing': np.array(self.all_missing),
+            'grid': np.ma.getdata(climatology['grid']),
+            'grid_mask': np.ma.getmaskarray(climatology['grid']),
+            'flag_layer': np.ma.getdata(climatology['flag_layer']),
+            'flag_layer_mask': np.ma.getmaskarray(climatology['flag_layer']),
+            'pole_hole': climatology['pole_hole'],
+            'metadata': np.array(json.dumps({
+                'files': metadata['files'],
+                'periods': [[str(period), period.freqstr] for period in metadata['period_index']],
+                'valid_data_range': list(metadata['valid_data_range'])
+            }, default=stores.json_default))
+        }
+
+        stores.save_npz(path, arrays)
+
+        log.info('wrote the climatology to {}'.format(path))
+
+    @classmethod
+    def load(cls, path):
+        """Return the store saved at path, or None if there is none or it cannot be
+        read."""
+        def read(npz):
+            metadata = json.loads(str(npz['metadata']))
+            climatology = {
+                'grid': np.ma.array(npz['grid'], mask=npz['grid_mask']),
+                'flag_layer': np.ma.array(npz['flag_layer'], mask=npz['flag_layer_mask']),
+                'pole_hole': npz['pole_hole'],
+                'metadata': {
+                    'files': metadata['files'],
+                    'period_index': _period_index(metadata['periods']),
+                    'valid_data_range': tuple(metadata['valid_data_range'])
+                }
+            }
+            return cls(str(npz['fingerprint']), climatology, bool(npz['all_missing']))
+
+        return stores.load_npz(path, STORE_VERSION, read, 'climatology store')
+
+
+def _period_index(periods):
+    """Return the period index of the climatology's files from the [period,
+    freqstr] pairs it was saved as. Like the index
+    getter.concentration_monthly_over_years builds, it is a PeriodIndex if every
+    period has the same frequency, monthly if there are none, and an Index of
+    Periods otherwise."""
+    freqs = {freq for _, freq in periods}
+
+    if len(freqs) > 1:
+        return pd.Index([pd.Period(period, freq=freq) for period, freq in periods])
+
+    return pd.PeriodIndex([period for period, _ in periods], freq=freqs.pop() if freqs else 'M')
+
+
+def _fingerprint(nt_hemi, month, start_year, end_year, search_paths, min_days_for_valid_month):
+    """Return a fingerprint of the files and settings a climatology is computed
+    from."""
+    invalid_ice_mask = np.ascontiguousarray(nt.invalid_ice_mask(nt_hemi, month), dtype=bool)
+
+    config = [STORE_VERSION, nt_hemi['short_name'], month, start_year, end_year,
+              min_days_for_valid_month, nt.MINIMUM_DAYS_FOR_VALID_MONTH,
+              str(nt.LAST_DAY_WITH_VALID_FINAL_DATA), list(nt.VALID_DATA_RANGE), nt.SCALE,
+              sorted(nt.FLAGS.items()), nt.EXTENT_THRESHOLD,
+              list(invalid_ice_mask.shape), hashlib.sha1(invalid_ice_mask.tobytes()).hexdigest()]
+
+    sources = []
+    for year in range(start_year, end_year + 1):
+        files = {locator.monthly_file_path(nt_hemi, year, month, search_paths)}
+        files.update(locator.all_daily_file_paths_for_month(nt_hemi, year, month, search_paths))
+        files.discard(None)
+
+        sources.extend(stores.file_stats(sorted(files)))
+
+    return hashlib.sha1(json.dumps([config, sources],
+                                   default=stores.json_default).encode('utf-8')).hexdigest()
@@ -12,3 +12,52 @@ def apply_patch(grid, patch):
         grid = np.ma.where(grid.mask, patch, grid)
 
     return grid
+
+
+class ExtentMedian(object):
+    """Median of a series of extent grids, added one at a time with add() so
+    that they never need to be stacked into a cube.
+
+    Extent is binary, so the median is a vote: a gridcell is ice if it is ice
+    in at least half of the grids. Gridcells that are land, coast or missing
+    in every grid are land in the median.
+
+    count_dtype is the integer dtype of the per-gridcell ice counts; it must
+    hold the number of grids added. Medians kept for every day of the year use
+    np.uint16 to hold 366 sets of counts in a quarter of the memory.
+
+    """
+
+    def __init__(self, ice, ocean, missing, land, coast, count_dtype=np.int64):
+        self.ice = ice
+        self.ocean = ocean
+        self.land = land
+        self.not_ice_or_ocean = (land, missing, coast)
+        self.count_dtype = count_dtype
+        self.layers = 0
+        self._ice_count = None
+        self._always_land = None
+
+    def add(self, grid):
+        """Add an extent grid, or every layer of a cube of extent grids."""
+        # like np.dstack, treat a 2D grid as a cube of one layer
+        grid = np.atleast_3d(np.ma.getdata(grid))
+
+        if self._ice_count is None:
+            self._ice_count = np.zeros(grid.shape[0:2], dtype=self.count_dtype)
+            self._always_land = np.ones(grid.shape[0:2], dtype=bool)
+
+        self._ice_count += np.count_nonzero(grid == self.ice, axis=2).astype(self.count_dtype)
+
+        land = np.zeros(grid.shape, dtype=bool)
+        for value in self.not_ice_or_ocean:
+            land |= grid == value
+        self._always_land &= np.all(land, axis=2)
+
+        self.layers += grid.shape[2]
+
+    def median(self):
+        """Return the median extent grid of the grids added so far."""
+        ice_extent = self._ice_count >= (self.layers + 1) // 2
+        ice_or_ocean = np.where(ice_extent, self.ice, self.ocean)
+        return np.where(self._always_land, self.land, ice_or_ocean)
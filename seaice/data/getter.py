@@ -6,19 +6,29 @@ import copy
 import datetime as dt
 import functools
 import logging
+from multiprocessing.pool import ThreadPool
 import re
 
 import numpy as np
 import pandas as pd
 
-from . import cube
+from . import archive
+from . import cache
 from . import errors as e
 from . import gridset_filters as gf
 from . import locator
+from .cube import ExtentMedian
+from .gridset import Gridset
+from .planes import ConcentrationPlanes
+from .planes import raw_value_lookups
+from . import product_cache
 import seaice.nasateam as nt
 
 log = logging.getLogger(__name__)
 
+# grids decoded from nasateam files, shared by every gridset built in the process
+decoded_grid_cache = cache.DecodedGridCache(nt.DECODED_GRID_CACHE_BYTES)
+
 
 def _validate_daily(func):
     @functools.wraps(func)
@@ -121,26 +131,36 @@ def concentration_monthly(hemisphere, year, month, search_paths,
     daily files.  If a monthly file is not found, but a month's worth of
     daily files exist, create an average from the daily files.
 
-    """
-    monthly_file_path = locator.monthly_file_path(hemisphere, year, month, search_paths)
+    If nt.PRODUCT_CACHE_PATH is set, the sums and counts behind averages of daily
+    files are kept there (see seaice.data.product_cache).
 
-    daily_filename_list = locator.all_daily_file_paths_for_month(
-        hemisphere, year, month, search_paths
-    )
-    daily_filename_list = double_weight_smmr_files(daily_filename_list)
+    """
+    kind, file_list = _monthly_sources(hemisphere, year, month, search_paths,
+                                       min_days_for_valid_month)
 
-    if len(daily_filename_list) < min_days_for_valid_month:
+    if kind == 'empty':
         log.warn('Insufficient daily files found for {yyyy:04}-{mm:02}; returning empty monthly '
                  'gridset.'.format(yyyy=year, mm=month))
         return empty_gridset(hemisphere['shape'], 'M')
 
-    last_day_of_month = dt.date(year, month, cal.monthrange(year, month)[1])
-    should_use_final_data_for_month = last_day_of_month <= nt.LAST_DAY_WITH_VALID_FINAL_DATA
-
-    if monthly_file_path and should_use_final_data_for_month:
-        gridset = _concentration_gridset_by_filelist([monthly_file_path])
+    if kind == 'monthly':
+        gridset = _concentration_gridset_by_filelist(file_list)
+    elif nt.PRODUCT_CACHE_PATH is None:
+        gridset = _concentration_average_gridset_from_daily_filelist(file_list)
     else:
-        gridset = _concentration_average_gridset_from_daily_filelist(daily_filename_list)
+        def build():
+            gridset = _concentration_gridset_by_filelist(file_list, planes=True)
+            sums = _daily_sums(gridset['data'], gridset['metadata']['missing_value'])
+            # a month has at most 62 daily grids (SMMR files count twice), so
+            # the sums fit in uint16 and the counts in uint8
+            return {'sums': sums['sums'].astype(np.uint16),
+                    'counts': sums['counts'].astype(np.uint8),
+                    'flags': sums['flags']}, gridset['metadata']['files']
+
+        sums, files = product_cache.cached('monthly', hemisphere,
+                                           '{:04}-{:02}'.format(year, month),
+                                           [(kind, file_list)], build)
+        gridset = Gridset(data=_average_from_sums(**sums), metadata=_filelist_metadata(files))
 
     metadata = {
         'hemi': hemisphere['short_name'],
@@ -154,8 +174,78 @@ def concentration_monthly(hemisphere, year, month, search_paths,
     return gridset
 
 
+def _monthly_sources(hemisphere, year, month, search_paths, min_days_for_valid_month):
+    """Return the kind of source concentration_monthly computes the month from,
+    and its files: ('monthly', [monthly file]) if it reads the final monthly
+    file, ('daily', daily files) if it averages the daily files, or ('empty',
+    []) if there are fewer than min_days_for_valid_month daily files."""
+    monthly_file_path = locator.monthly_file_path(hemisphere, year, month, search_paths)
+
+    daily_filename_list = locator.all_daily_file_paths_for_month(
+        hemisphere, year, month, search_paths
+    )
+    daily_filename_list = double_weight_smmr_files(daily_filename_list)
+
+    if len(daily_filename_list) < min_days_for_valid_month:
+        return 'empty', []
+
+    last_day_of_month = dt.date(year, month, cal.monthrange(year, month)[1])
+    should_use_final_data_for_month = last_day_of_month <= nt.LAST_DAY_WITH_VALID_FINAL_DATA
+
+    if monthly_file_path and should_use_final_data_for_month:
+        return 'monthly', [monthly_file_path]
+
+    return 'daily', daily_filename_list
+
+
+class MonthlyGridsets(object):
+    """Monthly gridsets from concentration_monthly, each built once and kept for
+    the life of this object, so that the seasons of a run that share months do
+    not average the same daily files again.
+
+    Gridsets are keyed by hemisphere, year, month, search paths and minimum
+    number of days. Their data is kept as ConcentrationPlanes, 2 bytes per
+    cell for grids read from monthly files, and every call to get returns a
+    new array.
+
+    months -- if given, only gridsets for these months are kept; gridsets for
+              other months are built on every call.
+
+    """
+
+    def __init__(self, months=None):
+        self.months = None if months is None else set(months)
+        self._gridsets = {}
+
+    def get(self, hemisphere, year, month, search_paths,
+            min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH):
+        """Return the gridset concentration_monthly returns for these arguments."""
+        if self.months is not None and month not in self.months:
+            return concentration_monthly(hemisphere, year, month, search_paths,
+                                         min_days_for_valid_month)
+
+        key = (hemisphere['short_name'], year, month, tuple(search_paths),
+               min_days_for_valid_month)
+
+        if key not in self._gridsets:
+            gridset = concentration_monthly(hemisphere, year, month, search_paths,
+                                            min_days_for_valid_month)
+            metadata = gridset['metadata']
+            self._gridsets[key] = (
+                ConcentrationPlanes.from_data(gridset['data'], metadata['valid_data_range']),
+                metadata
+            )
+
+        planes, metadata = self._gridsets[key]
+        return {'data': planes.to_data(), 'metadata': copy.deepcopy(metadata)}
+
+    def __len__(self):
+        return len(self._gridsets)
+
+
 def concentration_seasonal(hemisphere, year, months, search_paths,
-                           min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH):
+                           min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH,
+                           monthly_gridsets=None):
     """Return a dict containing the sea ice concentration data for the given year
     and season in the specified hemisphere as a numpy array. The dict also
     includes information about the source files from which the data was read.
@@ -163,6 +253,9 @@ def concentration_seasonal(hemisphere, year, months, search_paths,
     daily files. If a monthly file is not found, but a month's worth of daily
     files exist, create an average from the daily files.
 
+    If monthly_gridsets, a MonthlyGridsets, is given, the monthly gridsets are
+    taken from it instead of built by concentration_monthly.
+
     """
     def masked_data(np_arr):
         """Return gridset's data with everything outside the valid range masked"""
@@ -171,27 +264,34 @@ def concentration_seasonal(hemisphere, year, months, search_paths,
     def flags_only(np_arr):
         return np.ma.masked_inside(np_arr, *nt.VALID_DATA_RANGE)
 
-    monthly_gridsets = []
-    for month in months:
+    monthly = concentration_monthly if monthly_gridsets is None else monthly_gridsets.get
+
+    stacked_data = None
+    files = []
+    for i, month in enumerate(months):
         year_ = year - 1 if month == 12 else year
         log.info('getting monthly concentration {} {}-{:02}'.format(hemisphere['short_name'],
                                                                     year_,
                                                                     month))
-        monthly_gridset = concentration_monthly(
+        monthly_gridset = monthly(
             hemisphere,
             year_,
             month,
             search_paths,
             min_days_for_valid_month
         )
-        monthly_gridsets.append(monthly_gridset)
 
-    stacked_data = np.dstack([g['data'] for g in monthly_gridsets])
+        layer = np.atleast_3d(np.asanyarray(monthly_gridset['data']))
+        if stacked_data is None:
+            stacked_data = np.empty(layer.shape[:2] + (len(months),))
+        stacked_data[:, :, i] = layer[:, :, 0]
+        files.append(monthly_gridset['metadata']['files'])
+
     flag_layer = flag_layer_from_cube(flags_only(stacked_data), nt.FLAGS['missing'])
     data = masked_data(stacked_data).mean(axis=2).filled(flag_layer)
 
     metadata = {
-        'files': [g['metadata']['files'] for g in monthly_gridsets],
+        'files': files,
         'hemi': hemisphere['short_name'],
         'temporality': 'seasonal',
         'season': (year, months),
@@ -216,69 +316,103 @@ def flag_layer_from_cube(flag_cube, missing_value=np.nan):
     If a missing_value is provided, then any layers in the flag_cube that are
     all missing are ignored.
 
+    flag_cube may also be ConcentrationPlanes, whose flag plane is used.
+
     """
+    if isinstance(flag_cube, ConcentrationPlanes):
+        return flag_cube.flag_layer(None if np.isnan(missing_value) else missing_value)
+
     if len(flag_cube.shape) == 2:
         return flag_cube
 
-    # initalize flag_layer to the first layer that is not all missing (if there
-    # is one that is not all missing)
-    flag_layer = flag_cube[:, :, 0]
-    for i in range(0, flag_cube.shape[2]):
-        if not np.all(flag_cube[:, :, i] == missing_value):
-            flag_layer = flag_cube[:, :, i].copy()
-            break
+    data = np.ma.getdata(flag_cube)
+    unmasked = ~np.ma.getmaskarray(flag_cube)
 
-    for i in range(0, flag_cube.shape[2]):
-        if np.all(flag_cube[:, :, i] == missing_value):
-            continue
+    # a layer is all missing if it has unmasked cells and every one of them is
+    # missing_value
+    all_missing = np.any(unmasked, axis=(0, 1)) & ~np.any(
+        unmasked & (data != missing_value), axis=(0, 1))
+    layers = np.flatnonzero(~all_missing)
 
-        match = flag_layer == flag_cube[:, :, i]
-        match = match.filled(False)
+    if len(layers) == 0:
+        return flag_cube[:, :, 0]
 
-        flag_layer = np.ma.array(flag_layer, mask=~match)
+    first = layers[0]
+    differs = ~unmasked
+    differs |= data != data[:, :, first:first + 1]
+    differs[:, :, all_missing] = False
 
-    return flag_layer
+    return np.ma.array(flag_cube[:, :, first], mask=np.any(differs, axis=2), copy=True)
 
 
 def _concentration_average_gridset_from_daily_filelist(daily_filename_list):
     """ Read and average a list of daily files. """
-    gridset = _concentration_gridset_by_filelist(daily_filename_list)
+    gridset = _concentration_gridset_by_filelist(daily_filename_list, planes=True)
 
-    # mask everything but valid data
-    missing_value = gridset['metadata']['missing_value']
-    data_cube = np.ma.masked_outside(gridset['data'], *gridset['metadata']['valid_data_range'])
+    sums = _daily_sums(gridset['data'], gridset['metadata']['missing_value'])
+    gridset['data'] = _average_from_sums(**sums)
 
-    # get cube of nothing but flag values
-    flag_cube = np.ma.array(gridset['data'], mask=~data_cube.mask)
-    flag_cube = np.ma.masked_equal(flag_cube, missing_value)
+    return gridset
 
-    average = cube.average_cube(data_cube)
 
-    flag_layer = flag_layer_from_cube(flag_cube)
+def _daily_sums(planes, missing_value):
+    """Return a dict of the grids a daily average is computed from, given the
+    ConcentrationPlanes of the daily files:
 
-    # replace mask with flag values where possible
-    averaged_and_flagged = cube.apply_patch(average, flag_layer)
+    'sums': the sum of each gridcell's raw concentrations
 
-    # replace rest of mask with missing
-    new_data = averaged_and_flagged.filled(fill_value=missing_value)
+    'counts': the number of grids in which each gridcell has a concentration
 
-    gridset['data'] = new_data
+    'flags': for gridcells with no concentration, the flag value they have in
+        every grid in which they are not missing, or missing_value; 0 for
+        the others.
 
-    return gridset
+    """
+    concentration = np.atleast_3d(planes.concentration)
+    flags = np.atleast_3d(planes.flags)
+    valid = flags == 0
+
+    counts = np.count_nonzero(valid, axis=2)
+    sums = concentration.sum(axis=2, dtype=np.int64)
+
+    # flags are kept where every grid that is not missing has the same one
+    flag_cube = np.ma.array(flags, mask=valid | (flags == missing_value))
+    flag_layer = flag_layer_from_cube(flag_cube).filled(missing_value)
+
+    return {'sums': sums,
+            'counts': counts,
+            'flags': np.where(counts > 0, 0, flag_layer).astype(np.uint8)}
+
+
+def _average_from_sums(sums, counts, flags):
+    """Return the float64 grid of the average concentrations given by the sums
+    and counts of _daily_sums, with the flag values of the gridcells that have
+    none."""
+    return np.divide(sums, counts * nt.SCALE, out=flags.astype(np.float64), where=counts > 0)
 
 
 def concentration_monthly_over_years(hemisphere, start_year, end_year, month, search_paths,
-                                     min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH):
+                                     min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH,
+                                     planes=False):
     """Return a gridset containing a cube of data for a given month across a
     range of years. The data is ordered by year. The metadata includes the
     month, year range, and list of files from which the data was retrieved.
+
+    If planes is True, the data is ConcentrationPlanes (see seaice.data.planes)
+    instead of a masked array.
+
     """
     year_list = list(range(start_year, end_year + 1))
 
     gridsets = [concentration_monthly(hemisphere, year, month, search_paths,
                                       min_days_for_valid_month) for year in year_list]
 
-    data = np.ma.dstack([g['data'] for g in gridsets])
+    if planes:
+        data = ConcentrationPlanes.stack([
+            ConcentrationPlanes.from_data(g['data'], g['metadata']['valid_data_range'])
+            for g in gridsets])
+    else:
+        data = np.ma.dstack([g['data'] for g in gridsets])
 
     metadata = {}
     metadata['files'] = [g['metadata']['files'] for g in gridsets]
@@ -301,24 +435,48 @@ def concentration_monthly_over_years(hemisphere, start_year, end_year, month, se
 
 
 def concentration_seasonal_over_years(hemisphere, start_year, end_year, months, search_paths,
-                                      min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH):
+                                      min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH,
+                                      planes=False, monthly_gridsets=None):
     """Return a gridset containing a cube of data for a given month across a
     range of years. The data is ordered by year. The metadata includes the
     month, year range, and list of files from which the data was retrieved.
+
+    If planes is True, the data is ConcentrationPlanes (see seaice.data.planes)
+    instead of a masked array.
+
+    If monthly_gridsets, a MonthlyGridsets, is given, the monthly gridsets are
+    taken from it, so that a month shared with another season of the same run
+    is built once.
+
     """
     year_list = list(range(start_year, end_year + 1))
 
-    gridsets = [concentration_seasonal(hemisphere, year, months, search_paths,
-                                       min_days_for_valid_month) for year in year_list]
+    data = None
+    files = []
+    for i, year in enumerate(year_list):
+        gridset = concentration_seasonal(hemisphere, year, months, search_paths,
+                                         min_days_for_valid_month,
+                                         monthly_gridsets=monthly_gridsets)
 
-    data = np.ma.dstack([g['data'] for g in gridsets])
+        if planes:
+            layer = ConcentrationPlanes.from_data(gridset['data'],
+                                                  gridset['metadata']['valid_data_range'])
+        else:
+            layer = np.atleast_3d(np.asanyarray(gridset['data']))[:, :, 0]
+
+        if data is None:
+            first_metadata = gridset['metadata']
+            data = _empty_seasonal_cube(layer, len(year_list))
+        data = _set_seasonal_layer(data, i, layer)
+
+        files.append(gridset['metadata']['files'])
 
     metadata = {}
-    metadata['files'] = [g['metadata']['files'] for g in gridsets]
+    metadata['files'] = files
 
-    metadata['valid_data_range'] = gridsets[0]['metadata']['valid_data_range']
-    metadata['flags'] = gridsets[0]['metadata']['flags']
-    metadata['missing_value'] = gridsets[0]['metadata']['missing_value']
+    metadata['valid_data_range'] = first_metadata['valid_data_range']
+    metadata['flags'] = first_metadata['flags']
+    metadata['missing_value'] = first_metadata['missing_value']
 
     gridset = {
         'data': data,
@@ -328,6 +486,37 @@ def concentration_seasonal_over_years(hemisphere, start_year, end_year, months,
     return gridset
 
 
+def _empty_seasonal_cube(layer, depth):
+    """Return an uninitialized cube of depth layers like layer, a 2D array or
+    ConcentrationPlanes, for _set_seasonal_layer to fill."""
+    shape = np.shape(layer) + (depth,)
+
+    if isinstance(layer, ConcentrationPlanes):
+        return ConcentrationPlanes(np.empty(shape, dtype=layer.concentration.dtype),
+                                   np.empty(shape, dtype=layer.flags.dtype),
+                                   layer.scale)
+
+    return np.ma.empty(shape, dtype=layer.dtype)
+
+
+def _set_seasonal_layer(cube, i, layer):
+    """Set layer i of cube to layer and return the cube. A ConcentrationPlanes
+    cube whose concentrations cannot hold the layer's, because their dtype or
+    scale differ, is converted to floating point percentages first, as
+    ConcentrationPlanes.stack does."""
+    if not isinstance(cube, ConcentrationPlanes):
+        cube[:, :, i] = layer
+        return cube
+
+    if (layer.concentration.dtype, layer.scale) != (cube.concentration.dtype, cube.scale):
+        cube = ConcentrationPlanes(cube.percent(fill_value=0), cube.flags)
+        layer = ConcentrationPlanes(layer.percent(fill_value=0), layer.flags)
+
+    cube.concentration[:, :, i] = layer.concentration
+    cube.flags[:, :, i] = layer.flags
+    return cube
+
+
 def empty_gridset(shape, temporality, period=None):
 
     metadata = {'files': [],
@@ -344,10 +533,7 @@ def empty_gridset(shape, temporality, period=None):
 
     grid = np.full(shape, metadata['missing_value'], dtype=np.float)
 
-    return {
-        'data': grid,
-        'metadata': metadata
-    }
+    return Gridset(data=grid, metadata=metadata)
 
 
 def extent_daily_median(hemisphere, start_year, end_year, dayofyear=None,
@@ -358,47 +544,120 @@ def extent_daily_median(hemisphere, start_year, end_year, dayofyear=None,
 
     date_index = _dateindex_for_dayofyear(start_year, end_year, dayofyear)
 
-    gridsets = [concentration_daily(hemisphere,
-                                    date,
-                                    search_paths,
-                                    interpolation_radius) for date in date_index.date]
-    if not allow_bad_dates:
-        gridsets = [gf.drop_bad_dates(g) for g in gridsets]
-    gridsets = [gf.interpolate(g) for g in gridsets]
-    gridsets = [gf.concentration_to_extent(extent_threshold, g) for g in gridsets]
+    median = ExtentMedian(1, 0, nt.FLAGS['missing'], nt.FLAGS['land'], nt.FLAGS['coast'])
 
-    cube = np.ma.dstack([g['data'] for g in gridsets])
-    data = _extent_median(cube, 1, 0, nt.FLAGS['missing'], nt.FLAGS['land'], nt.FLAGS['coast'])
+    metadata = {'files': [], 'period_index': []}
+    for date in date_index.date:
+        gridset = _daily_extent_gridset(hemisphere, date, search_paths, interpolation_radius,
+                                        extent_threshold, allow_bad_dates)
+        _add_to_median(median, metadata, gridset)
+
+    data = median.median()
 
-    metadata = {}
-    metadata['files'] = [g['metadata']['files'] for g in gridsets]
     metadata['dayofyear'] = dayofyear
     metadata['years'] = sorted(np.unique(date_index.year))
-    metadata['period_index'] = [g['metadata']['period_index'] for g in gridsets]
-
-    metadata['valid_data_range'] = gridsets[0]['metadata']['valid_data_range']
-    metadata['missing_value'] = gridsets[0]['metadata']['missing_value']
-    metadata['flags'] = gridsets[0]['metadata']['flags']
 
     return {'data': data, 'metadata': metadata}
 
 
+def extent_daily_median_climatology(hemisphere, start_year, end_year, dayofyears=None,
+                                    search_paths=nt.DEFAULT_SEA_ICE_PATHS,
+                                    interpolation_radius=0,
+                                    extent_threshold=nt.EXTENT_THRESHOLD,
+                                    allow_bad_dates=False):
+    """Yield (dayofyear, gridset) for each of dayofyears, 1 through 366 by
+    default, in order. Each gridset is the one extent_daily_median returns for
+    that dayofyear.
+
+    Instead of reading the days of each dayofyear in turn, the daily grids from
+    start_year to end_year are read once, in date order, and each is added to
+    the median of every dayofyear that uses it; the first day of a year also
+    counts towards dayofyear 366 of the year before it when that year is not a
+    leap year (see _dateindex_for_dayofyear). The overlapping windows of an
+    interpolation_radius are read from decoded_grid_cache.
+
+    """
+    dayofyears = range(1, 367) if dayofyears is None else sorted(set(dayofyears))
+
+    medians = {}
+    metadata = {}
+    years = {}
+    for dayofyear in dayofyears:
+        medians[dayofyear] = ExtentMedian(1, 0, nt.FLAGS['missing'], nt.FLAGS['land'],
+                                          nt.FLAGS['coast'], count_dtype=np.uint16)
+        metadata[dayofyear] = {'files': [], 'period_index': []}
+        years[dayofyear] = set()
+
+    for date, dates_dayofyears in _dayofyears_by_date(start_year, end_year, dayofyears):
+        gridset = _daily_extent_gridset(hemisphere, date, search_paths, interpolation_radius,
+                                        extent_threshold, allow_bad_dates)
+        for dayofyear in dates_dayofyears:
+            _add_to_median(medians[dayofyear], metadata[dayofyear], gridset)
+            years[dayofyear].add(date.year)
+
+    for dayofyear in dayofyears:
+        median = medians.pop(dayofyear)
+        dayofyear_metadata = metadata.pop(dayofyear)
+
+        dayofyear_metadata['dayofyear'] = dayofyear
+        dayofyear_metadata['years'] = sorted(years.pop(dayofyear))
+
+        yield dayofyear, {'data': median.median(), 'metadata': dayofyear_metadata}
+
+
+def _daily_extent_gridset(hemisphere, date, search_paths, interpolation_radius,
+                          extent_threshold, allow_bad_dates):
+    """Return the extent gridset of date used by the daily median extents."""
+    gridset = concentration_daily(hemisphere, date, search_paths, interpolation_radius)
+    if not allow_bad_dates:
+        gridset = gf.drop_bad_dates(gridset)
+    gridset = gf.interpolate(gridset)
+    return gf.concentration_to_extent(extent_threshold, gridset)
+
+
+def _add_to_median(median, metadata, gridset):
+    """Add the extent gridset to median and its files and period index to
+    metadata."""
+    median.add(gridset['data'])
+    metadata['files'].append(gridset['metadata']['files'])
+    metadata['period_index'].append(gridset['metadata']['period_index'])
+
+    if median.layers == 1:
+        for key in ('valid_data_range', 'missing_value', 'flags'):
+            metadata[key] = gridset['metadata'][key]
+
+
+def _dayofyears_by_date(start_year, end_year, dayofyears):
+    """Return a date-ordered list of (date, dayofyears) pairs, giving the
+    dayofyears whose medians use each date between start_year and end_year."""
+    dayofyears_by_date = {}
+    for dayofyear in dayofyears:
+        for date in _dateindex_for_dayofyear(start_year, end_year, dayofyear).date:
+            dayofyears_by_date.setdefault(date, []).append(dayofyear)
+
+    return sorted(dayofyears_by_date.items())
+
+
 def extent_monthly_median(hemisphere, start_year, end_year, month,
                           search_paths=nt.DEFAULT_SEA_ICE_PATHS,
                           extent_threshold=nt.EXTENT_THRESHOLD,
                           min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH):
     """Call extent monthly for all months between start_year and end_year"""
 
-    metadata = {}
+    metadata = {'files': []}
     years = np.arange(start_year, end_year+1)
-    gridsets = [concentration_monthly(hemisphere, year, month, search_paths,
-                                      min_days_for_valid_month) for year in years]
-    gridsets = [gf.concentration_to_extent(extent_threshold, g) for g in gridsets]
 
-    cube = np.ma.dstack([g['data'] for g in gridsets])
-    data = _extent_median(cube, 1, 0, nt.FLAGS['missing'], nt.FLAGS['land'], nt.FLAGS['coast'])
+    median = ExtentMedian(1, 0, nt.FLAGS['missing'], nt.FLAGS['land'], nt.FLAGS['coast'])
+    for year in years:
+        gridset = concentration_monthly(hemisphere, year, month, search_paths,
+                                        min_days_for_valid_month)
+        gridset = gf.concentration_to_extent(extent_threshold, gridset)
+
+        median.add(gridset['data'])
+        metadata['files'].append(gridset['metadata']['files'])
+
+    data = median.median()
 
-    metadata['files'] = [g['metadata']['files'] for g in gridsets]
     metadata['years'] = list(years)
     metadata['month'] = month
     metadata['valid_data_range'] = (0, 1)
@@ -417,11 +676,9 @@ def _extent_median(cube, ice=1, ocean=0,
     grids. Coast and missing are replaced with land.
 
     """
-
-    ice_extent = np.median(np.where(cube > ice, 0, cube), axis=2) >= 0.5
-    ice_or_ocean = np.where(ice_extent, ice, ocean)
-    always_land = np.all(np.in1d(cube, [land, missing, coast]).reshape(cube.shape), axis=2)
-    return np.where(always_land, land, ice_or_ocean)
+    median = ExtentMedian(ice, ocean, missing, land, coast)
+    median.add(cube)
+    return median.median()
 
 
 def _dateindex_for_dayofyear(start_year, end_year, dayofyear):
@@ -450,6 +707,76 @@ def _scale_valid_data(nd_arr, valid_range, scale):
     return scaled.data
 
 
+def _scaled_value_lookup(valid_range, scale):
+    """Return an array mapping each possible uint8 file value to the value
+    _scale_valid_data gives it: values inside valid_range are divided by
+    scale, all others (the flag values) are kept as they are.
+
+    """
+    values = np.arange(256, dtype=np.float64)
+    in_range = (values >= valid_range[0]) & (values <= valid_range[1])
+    return np.where(in_range, values / scale, values)
+
+
+def _load_concentration_cube(file_list, reader=None, planes=False):
+    """Return a (rows, cols, len(file_list)) float64 cube of the scaled data in
+    file_list, equivalent to _scale_valid_data applied to the np.ma.dstack of
+    each file's data. If planes is True, return ConcentrationPlanes holding
+    the raw concentrations and flags of each file instead.
+
+    When nt.CUBE_ARCHIVE_PATH is set and every file is in that archive and
+    unchanged since it was archived (see seaice.data.archive), the grids are
+    read from the archive instead.
+    Otherwise the cube is allocated once and each layer is filled as soon as
+    its file is read; files are read by a pool of nt.FILE_READ_THREADS
+    threads.
+
+    """
+    read = _cached_reader(_goddard_nasateam_reader(reader))
+    lookup = _scaled_value_lookup(nt.VALID_DATA_RANGE, nt.SCALE)
+
+    if nt.CUBE_ARCHIVE_PATH:
+        raw_cube = archive.cube_archive(nt.CUBE_ARCHIVE_PATH).read(file_list)
+        if raw_cube is not None:
+            if planes:
+                return ConcentrationPlanes.from_raw(raw_cube)
+            return lookup[raw_cube]
+        log.debug('not every file is in the cube archive {} and unchanged; reading the '
+                  'files instead'.format(nt.CUBE_ARCHIVE_PATH))
+
+    first = read(file_list[0])
+    shape = first.shape + (len(file_list),)
+
+    if planes:
+        cube = ConcentrationPlanes(np.empty(shape, dtype=np.uint8),
+                                   np.empty(shape, dtype=np.uint8), nt.SCALE)
+        concentration_lookup, flag_lookup = raw_value_lookups(nt.VALID_DATA_RANGE)
+
+        def store(index, grid):
+            cube.concentration[:, :, index] = concentration_lookup[grid]
+            cube.flags[:, :, index] = flag_lookup[grid]
+    else:
+        cube = np.empty(shape, dtype=np.float64)
+
+        def store(index, grid):
+            cube[:, :, index] = lookup[grid]
+
+    def fill_layer(index, grid=None):
+        if grid is None:
+            grid = read(file_list[index])
+        if grid.shape != first.shape:
+            raise e.SeaIceDataValueError('Grid in {} has shape {}; expected {} like {}'.format(
+                file_list[index], grid.shape, first.shape, file_list[0]))
+        store(index, grid)
+
+    fill_layer(0, first)
+    if len(file_list) > 1:
+        with ThreadPool(min(nt.FILE_READ_THREADS, len(file_list) - 1)) as p:
+            p.map(fill_layer, range(1, len(file_list)))
+
+    return cube
+
+
 def _period_index_from_file_list(file_list):
     periods = []
     for file_ in file_list:
@@ -474,33 +801,40 @@ def _period_index_from_file_list(file_list):
     return period_index
 
 
-def _concentration_gridset_by_filelist(file_list):
+def _concentration_gridset_by_filelist(file_list, reader=None, planes=False):
     """Return a gridset object for a list of files.
 
     A gridset is a dictionary with two keys 'data' and 'metadata'.
 
-    'data' holds either a 2D or 3D masked numpy array.
+    'data' holds either a 2D or 3D masked numpy array, or, if planes is True,
+    2D or 3D ConcentrationPlanes (see seaice.data.planes).
 
     'metadata' holds a dictionary with a single key 'files' which holds the
     filelist that was used to get the data.
 
+    reader: name of the function used to read each file, one of the keys of
+        GODDARD_NASATEAM_READERS. Defaults to nt.NASATEAM_FILE_READER.
+
     """
-    data_list = [_read_goddard_nasateam_file(file_) for file_ in file_list]
+    metadata = _filelist_metadata(file_list)
+
+    scaled_data_cube = _load_concentration_cube(file_list, reader, planes)
+
+    if planes:
+        return Gridset(data=scaled_data_cube.squeeze(), metadata=metadata)
+    return Gridset(data=np.ma.squeeze(scaled_data_cube), metadata=metadata)
 
-    period_index = _period_index_from_file_list(file_list)
 
-    data_cube = np.ma.dstack(data_list)
-    scaled_data_cube = _scale_valid_data(data_cube, nt.VALID_DATA_RANGE, nt.SCALE)
+def _filelist_metadata(file_list):
+    """Return the metadata of the gridset _concentration_gridset_by_filelist reads
+    from file_list."""
     metadata = {'files': file_list,
-                'period_index': period_index,
+                'period_index': _period_index_from_file_list(file_list),
                 'valid_data_range': (nt.VALID_DATA_RANGE[0] / nt.SCALE,
                                      nt.VALID_DATA_RANGE[1] / nt.SCALE)}
     metadata.update(_flags_and_missing())
 
-    return {
-        'data': np.ma.squeeze(scaled_data_cube),
-        'metadata': metadata
-    }
+    return metadata
 
 
 def _read_goddard_nasateam_file(filename):
@@ -510,6 +844,47 @@ def _read_goddard_nasateam_file(filename):
     return data
 
 
+def _read_goddard_nasateam_file_mmap(filename):
+    """Return a read-only view of the data in a goddard nasateam file, memory-mapped
+    at the end of the header instead of copied into memory. Views of the same
+    file share the pages of the operating system's file cache.
+
+    """
+    with open(filename, 'rb') as fp:
+        rows, cols = _rows_columns_from_goddard_nasateam_header(fp.read(nt.NASATEAM_HEADER_LENGTH))
+    return np.memmap(filename, dtype=np.uint8, mode='r',
+                     offset=nt.NASATEAM_HEADER_LENGTH, shape=(rows, cols))
+
+
+GODDARD_NASATEAM_READERS = {
+    'fromfile': _read_goddard_nasateam_file,
+    'mmap': _read_goddard_nasateam_file_mmap
+}
+
+
+def _goddard_nasateam_reader(reader=None):
+    if reader is None:
+        reader = nt.NASATEAM_FILE_READER
+
+    try:
+        return GODDARD_NASATEAM_READERS[reader]
+    except KeyError:
+        raise e.SeaIceDataValueError('Unknown goddard nasateam file reader {}; expected one '
+                                     'of {}'.format(reader, sorted(GODDARD_NASATEAM_READERS)))
+
+
+def _cached_reader(read):
+    """Return read wrapped to go through decoded_grid_cache, or read itself if
+    nt.DECODED_GRID_CACHE_BYTES disables the cache."""
+    if not nt.DECODED_GRID_CACHE_BYTES:
+        return read
+
+    if decoded_grid_cache.max_bytes != nt.DECODED_GRID_CACHE_BYTES:
+        decoded_grid_cache.resize(nt.DECODED_GRID_CACHE_BYTES)
+
+    return functools.partial(decoded_grid_cache.get, load=read)
+
+
 def _parse_goddard_nasateam_header(header):
     parsed = np.fromstring(header, dtype=np.dtype(nt.NASATEAM_HEADER))
     return parsed
@@ -0,0 +1,71 @@
+"""The Gridset type.
+
+A gridset is a dictionary with two keys, 'data', holding a 2D or 3D numpy
+array, and 'metadata', holding a dictionary describing it. Gridset is a dict,
+so everything that works with plain dict gridsets works with it, and plain
+dict gridsets can be given anywhere a Gridset is expected.
+
+Copies of a gridset made with copy_on_write share its data array until one of
+them needs to change the array in place, so that a chain of filters only
+allocates the arrays it actually changes. Filters treat metadata values as
+immutable: they replace values in a gridset's metadata rather than changing
+them in place, so a copy only needs a shallow copy of the metadata.
+
+"""
+
+
+class Gridset(dict):
+    """A dict gridset that knows whether its data array is shared with another
+    gridset.
+
+    """
+    __slots__ = ('_shared_data',)
+
+    def __init__(self, *args, **kwargs):
+        super(Gridset, self).__init__(*args, **kwargs)
+        self._shared_data = None
+
+    @property
+    def shares_data(self):
+        """True if self['data'] is shared with another gridset."""
+        return self._shared_data is not None and self.get('data') is self._shared_data
+
+    def writable_data(self):
+        """Return self['data'] after making sure it is not shared with any other
+        gridset, copying it if necessary. Call this before changing the data in
+        place.
+
+        """
+        if self.shares_data:
+            self['data'] = self['data'].copy()
+            self._shared_data = None
+        return self['data']
+
+    def copy(self):
+        """Return a new Gridset sharing this gridset's data until either of them
+        changes it in place, with a shallow copy of its metadata."""
+        return copy_on_write(self)
+
+    def __copy__(self):
+        return self.copy()
+
+    def __reduce__(self):
+        return (Gridset, (dict(self),))
+
+
+def copy_on_write(gridset):
+    """Return a new Gridset with the same data array as gridset (which may be a
+    Gridset or a plain dict) and a shallow copy of its metadata. The data is
+    copied the first time either gridset calls writable_data().
+
+    """
+    new = Gridset(gridset)
+    if 'metadata' in gridset:
+        new['metadata'] = dict(gridset['metadata'])
+
+    if 'data' in gridset:
+        new._shared_data = gridset['data']
+        if isinstance(gridset, Gridset):
+            gridset._shared_data = gridset['data']
+
+    return new
@@ -1,5 +1,5 @@
 from calendar import monthrange
-import copy
+import functools
 import logging
 
 import numpy as np
@@ -9,6 +9,8 @@ from . import cube
 from . import errors as e
 from . import getter
 from . import grid_filters
+from .gridset import copy_on_write
+from .planes import ConcentrationPlanes
 import seaice.nasateam as nt
 import seaice.datastore as sds
 
@@ -17,38 +19,210 @@ log = logging.getLogger(__name__)
 
 
 def apply_filters(gridset_in, filters):
-    gridset = copy.deepcopy(gridset_in)
+    """Return a new gridset with each of the filters applied to gridset_in in
+    order.
+
+    The run of drop_land, drop_invalid_ice, concentration_to_extent and
+    prevent_empty that seaice.data.api._filters builds for extent gridsets is
+    applied in a single pass (see ExtentFilters).
+
+    """
+    gridset = copy_on_write(gridset_in)
 
     gridset_repr = '<gridset at {}>'.format(hex(id(gridset)))
-    log.debug('Copied gridset {0} to {1}'.format(gridset_in, gridset_repr))
+    # formatted only when logged; the reprs of gridsets and filters print arrays
+    log.debug('Copied gridset %s to %s', gridset_in, gridset_repr)
 
-    for filter_ in filters:
-        log.debug('Applying filter {0} to {1}'.format(filter_, gridset_repr))
+    for filter_ in _fuse_extent_filters(filters):
+        log.debug('Applying filter %s to %s', filter_, gridset_repr)
         gridset = filter_(gridset)
 
+    # the result never shares its data with gridset_in
+    if np.may_share_memory(gridset['data'], gridset_in['data']):
+        gridset = copy_on_write(gridset)
+        gridset.writable_data()
+
     return gridset
 
 
+def _fuse_extent_filters(filters):
+    """Return filters with concentration_to_extent, the drop_land and
+    drop_invalid_ice filters just before it and a prevent_empty just after it
+    replaced by a single ExtentFilters."""
+    plan = list(filters)
+    for i, filter_ in enumerate(plan):
+        if _filter_function(filter_) is not concentration_to_extent:
+            continue
+
+        start, end = i, i + 1
+        while start > 0 and _filter_function(plan[start - 1]) in (drop_land, drop_invalid_ice):
+            start -= 1
+        if end < len(plan) and plan[end] is prevent_empty:
+            end += 1
+
+        if end - start > 1:
+            plan[start:end] = [ExtentFilters(plan[start:end])]
+        break
+
+    return plan
+
+
+def _filter_function(filter_):
+    """Return the function filter_ calls, or None if it is a partial with keyword
+    arguments, which ExtentFilters does not read."""
+    if isinstance(filter_, functools.partial):
+        return None if filter_.keywords else filter_.func
+    return filter_
+
+
+class ExtentFilters(object):
+    """Applies drop_land and drop_invalid_ice followed by concentration_to_extent,
+    and optionally prevent_empty, in one pass: the gridcells the first two set
+    to 0 are collected in a single boolean array, and the extent grid is built
+    straight from the original concentrations with those gridcells counted as
+    0, instead of copying the concentrations once per filter.
+
+    The result is the same as applying the filters one after another, which is
+    done instead for gridsets whose data is not an ndarray without masked
+    values.
+
+    """
+
+    def __init__(self, filters):
+        self.filters = filters
+
+    def __call__(self, gridset_in):
+        data = gridset_in['data']
+        if type(data) not in (np.ndarray, np.ma.MaskedArray) or \
+                np.ma.getmask(data) is not np.ma.nomask:
+            gridset = gridset_in
+            for filter_ in self.filters:
+                gridset = filter_(gridset)
+            return gridset
+
+        gridset = copy_on_write(gridset_in)
+        metadata = gridset['metadata']
+
+        # drop_invalid_ice returns an ndarray; the other filters keep the type
+        masked_result = type(data) is np.ma.MaskedArray
+        values = np.ma.getdata(data)
+        zero = None
+
+        for filter_ in self.filters:
+            function = _filter_function(filter_)
+
+            if function is drop_land:
+                land, coast = filter_.args
+                cells = (values == land) | (values == coast)
+                zero = cells if zero is None else zero | cells
+                metadata['drop_land'] = True
+
+            elif function is drop_invalid_ice:
+                # land and coast are flagged, so they are not invalid ice before
+                # drop_land sets them to 0 and are 0 either way after it
+                cells = _invalid_ice_or_ocean(filter_.args[0], values, metadata)
+                if cells is not None:
+                    # the invalid ice masks are masked arrays; np.where, in
+                    # drop_invalid_ice, ignores their masks too
+                    cells = np.ma.getdata(cells)
+                    zero = cells if zero is None else zero | cells
+                    masked_result = False
+                    metadata['drop_invalid_ice'] = True
+
+            elif function is concentration_to_extent:
+                extent_threshold, = filter_.args
+                values = _extent_grid_from_conc_grid(
+                    values,
+                    flags=metadata['flags'],
+                    missing_value=metadata['missing_value'],
+                    valid_extent_range=(extent_threshold, metadata['valid_data_range'][1]),
+                    zero=zero
+                )
+                metadata['valid_data_range'] = (0, 1)
+
+            else:
+                gridset['data'] = values
+                filter_(gridset)
+
+        gridset['data'] = np.ma.MaskedArray(values) if masked_result else values
+        return gridset
+
+    def __repr__(self):
+        return '<ExtentFilters {}>'.format(self.filters)
+
+
+def _invalid_ice_or_ocean(invalid_ice_mask, data, metadata):
+    """Return the boolean array of gridcells drop_invalid_ice sets to 0, or None
+    if it leaves the data unchanged.
+
+    A 2D invalid_ice_mask is broadcast over the layers of 3D data, except for
+    layers that are all missing.
+
+    """
+    values = np.ma.getdata(data)
+    masked = np.ma.getmask(data)
+    missing = values == metadata['missing_value']
+
+    if _all_missing(missing, masked):
+        return None
+
+    if invalid_ice_mask.shape != values.shape:
+        layers_with_data = ~_all_missing(missing, masked, axis=(0, 1))
+        invalid_ice_mask = invalid_ice_mask[:, :, np.newaxis] & layers_with_data
+
+    low, high = metadata['valid_data_range']
+    not_flagged = ~((values < low) | (values > high)) | missing | masked
+
+    return invalid_ice_mask & not_flagged
+
+
+def _all_missing(missing, masked, axis=None):
+    """Return np.all(data == missing_value, axis), given missing, the unmasked
+    result of data == missing_value, and masked, the mask of data. Like
+    np.ma.all, masked values are ignored, but nothing is all missing if all of
+    its values are masked.
+
+    """
+    if masked is np.ma.nomask:
+        return np.all(missing, axis=axis)
+    return np.any(~masked, axis=axis) & np.all(missing | masked, axis=axis)
+
+
 def apply_largest_pole_hole(gridset_in):
-    gridset = copy.deepcopy(gridset_in)
+    gridset = copy_on_write(gridset_in)
 
     pole_hole = gridset['metadata']['flags']['pole']
 
-    try:
-        largest_pole_hole = np.any(gridset['data'] == pole_hole, axis=2)
-    except ValueError:  # 'axis' entry is out of bounds; we don't have 3D data
+    if isinstance(gridset['data'], ConcentrationPlanes):
+        return _apply_largest_pole_hole_to_planes(gridset, pole_hole)
+
+    data = gridset['data']
+    if data.ndim != 3:
         return gridset
 
-    for i in np.arange(gridset['data'].shape[2]):
-        if np.all(gridset['data'][:, :, i] == gridset['metadata']['missing_value']):
-            continue
-        gridset['data'][largest_pole_hole, i] = pole_hole
+    values = np.ma.getdata(data)
+    masked = np.ma.getmask(data)
+
+    # like np.ma.any, masked values are ignored
+    largest_pole_hole = np.any((values == pole_hole) & ~masked, axis=2)
+    layers_with_data = ~_all_missing(values == gridset['metadata']['missing_value'], masked,
+                                     axis=(0, 1))
+
+    data = gridset.writable_data()
+    pole_hole_cells = data[largest_pole_hole]
+    pole_hole_cells[:, layers_with_data] = pole_hole
+    data[largest_pole_hole] = pole_hole_cells
 
     return gridset
 
 
 def concentration_cutoff(cutoff, gridset_in):
-    gridset = copy.deepcopy(gridset_in)
+    gridset = copy_on_write(gridset_in)
+
+    if isinstance(gridset['data'], ConcentrationPlanes):
+        planes = gridset.writable_data()
+        planes.concentration[planes.where_percent(lambda percent: percent < cutoff)] = 0
+        return gridset
 
     gridset['data'] = grid_filters.concentration_cutoff(cutoff, gridset['data'])
 
@@ -56,11 +230,21 @@ def concentration_cutoff(cutoff, gridset_in):
 
 
 def concentration_to_extent(extent_threshold, gridset_in):
-    gridset = copy.deepcopy(gridset_in)
+    gridset = copy_on_write(gridset_in)
     conc = gridset['data']
 
     max_valid = gridset['metadata']['valid_data_range'][1]
 
+    if isinstance(conc, ConcentrationPlanes):
+        gridset['data'] = _extent_grid_from_planes(
+            conc,
+            flags=gridset['metadata']['flags'],
+            missing_value=gridset['metadata']['missing_value'],
+            valid_extent_range=(extent_threshold, max_valid)
+        )
+        gridset['metadata']['valid_data_range'] = (0, 1)
+        return gridset
+
     gridset['data'] = _extent_grid_from_conc_grid(
         conc,
         flags=gridset['metadata']['flags'],
@@ -96,7 +280,7 @@ def ensure_full_nrt_month(gridset):
 
 
 def drop_bad_dates(gridset_in):
-    gridset = copy.deepcopy(gridset_in)
+    gridset = copy_on_write(gridset_in)
 
     if gridset['metadata']['temporality'] == 'M':
         log.warn('Tried to drop bad dates from a monthly gridset, '
@@ -159,23 +343,15 @@ def drop_invalid_ice(invalid_ice_mask, gridset_in):
     and set them to 0.
 
     """
-    gridset = copy.deepcopy(gridset_in)
-
-    if np.all(gridset['data'] == gridset['metadata']['missing_value']):
-        return gridset
-
-    if invalid_ice_mask.shape != gridset['data'].shape:
-        layers = gridset['data'].shape[2]
-        invalid_ice_mask = np.dstack([invalid_ice_mask] * layers)
+    gridset = copy_on_write(gridset_in)
 
-        for layer in np.arange(layers):
-            if np.all(gridset['data'][:, :, layer] == gridset['metadata']['missing_value']):
-                invalid_ice_mask[:, :, layer] = False
+    if isinstance(gridset['data'], ConcentrationPlanes):
+        return _drop_invalid_ice_from_planes(invalid_ice_mask, gridset)
 
-    flagged = np.ma.masked_outside(gridset['data'], *gridset['metadata']['valid_data_range'])
-    missing = np.ma.masked_equal(gridset['data'], gridset['metadata']['missing_value'])
-    not_flagged = ~flagged.mask | missing.mask
-    invalid_ice_or_ocean = invalid_ice_mask & not_flagged
+    invalid_ice_or_ocean = _invalid_ice_or_ocean(invalid_ice_mask, gridset['data'],
+                                                 gridset['metadata'])
+    if invalid_ice_or_ocean is None:
+        return gridset
 
     gridset['data'] = np.where(invalid_ice_or_ocean, 0, gridset['data'])
     gridset['metadata']['drop_invalid_ice'] = True
@@ -184,9 +360,15 @@ def drop_invalid_ice(invalid_ice_mask, gridset_in):
 
 
 def drop_land(land, coast, gridset_in):
-    gridset = copy.deepcopy(gridset_in)
+    gridset = copy_on_write(gridset_in)
+
+    if isinstance(gridset['data'], ConcentrationPlanes):
+        planes = gridset.writable_data()
+        planes.flags[(planes.flags == land) | (planes.flags == coast)] = 0
+        gridset['metadata']['drop_land'] = True
+        return gridset
 
-    ice_only = gridset['data']
+    ice_only = gridset.writable_data()
     for type_ in [land, coast]:
         ice_only[ice_only == type_] = 0
 
@@ -204,7 +386,7 @@ def interpolate(gridset_in):
        update the gridset such that missing values in the gridset for the
        target date are interpolated from the other days' data"""
 
-    gridset = copy.deepcopy(gridset_in)
+    gridset = copy_on_write(gridset_in)
     date = gridset['metadata']['period']
     period_index = gridset['metadata']['period_index']
     file_list = gridset['metadata']['files']
@@ -242,7 +424,10 @@ def interpolate(gridset_in):
 
 
 def prevent_empty(gridset):
-    all_missing = np.all(gridset['data'] == gridset['metadata']['missing_value'])
+    data = gridset['data']
+    if isinstance(data, ConcentrationPlanes):
+        data = data.flags
+    all_missing = np.all(data == gridset['metadata']['missing_value'])
 
     no_data = 0 in gridset['data'].shape
 
@@ -254,10 +439,73 @@ def prevent_empty(gridset):
     return gridset
 
 
+def _apply_largest_pole_hole_to_planes(gridset, pole_hole):
+    planes = gridset['data']
+    if planes.ndim != 3:
+        return gridset
+
+    largest_pole_hole = np.any(planes.flags == pole_hole, axis=2)
+    layers_with_data = ~np.all(planes.flags == gridset['metadata']['missing_value'], axis=(0, 1))
+
+    planes = gridset.writable_data()
+    for plane, value in ((planes.flags, pole_hole), (planes.concentration, 0)):
+        pole_hole_cells = plane[largest_pole_hole]
+        pole_hole_cells[:, layers_with_data] = value
+        plane[largest_pole_hole] = pole_hole_cells
+
+    return gridset
+
+
+def _drop_invalid_ice_from_planes(invalid_ice_mask, gridset):
+    """drop_invalid_ice for a gridset holding ConcentrationPlanes."""
+    flags = gridset['data'].flags
+    missing = flags == gridset['metadata']['missing_value']
+
+    if np.all(missing):
+        return gridset
+
+    if invalid_ice_mask.shape != flags.shape:
+        # ignore layers that are all missing
+        layers_with_data = ~np.all(missing, axis=(0, 1))
+        invalid_ice_mask = invalid_ice_mask[:, :, np.newaxis] & layers_with_data
+
+    invalid_ice_or_ocean = invalid_ice_mask & ((flags == 0) | missing)
+
+    planes = gridset.writable_data()
+    planes.concentration[invalid_ice_or_ocean] = 0
+    planes.flags[invalid_ice_or_ocean] = 0
+    gridset['metadata']['drop_invalid_ice'] = True
+
+    return gridset
+
+
+def _extent_grid_from_planes(planes, flags={}, missing_value=None,
+                             valid_extent_range=(nt.EXTENT_THRESHOLD, 100)):
+    """_extent_grid_from_conc_grid for ConcentrationPlanes."""
+    flags = dict(flags)
+    if missing_value:
+        flags['missing'] = missing_value
+
+    low, high = valid_extent_range
+    extent = planes.valid & planes.where_percent(
+        lambda percent: ~((percent < low) | (percent > high)))
+
+    pole_hole_value = flags.pop('pole', None)
+    if pole_hole_value:
+        extent |= planes.flags == pole_hole_value
+
+    extent = extent.astype('int')
+    for flag in set(flags.values()):
+        extent[planes.flags == flag] += flag
+
+    return extent
+
+
 def _extent_grid_from_conc_grid(conc,
                                 flags={},
                                 missing_value=None,
-                                valid_extent_range=(nt.EXTENT_THRESHOLD, 100)):
+                                valid_extent_range=(nt.EXTENT_THRESHOLD, 100),
+                                zero=None):
     """Take a grid of concentration values and return an extent grid. Given flag
     values will be preserved in the return grid, except that gridcells flagged
     as pole values will be counted as part of the extent. Extent gridcells are
@@ -274,26 +522,46 @@ def _extent_grid_from_conc_grid(conc,
     valid_extent_range: tuple, the minimum and maximum concentration values to
         count as part of the extent
 
+    zero: optional boolean array of gridcells to treat as a concentration of 0,
+        whatever their value in conc
+
     """
-    flags = copy.deepcopy(flags)
+    flags = dict(flags)
     if missing_value:
         flags['missing'] = missing_value
 
-    ice = ~np.ma.masked_outside(conc, *valid_extent_range).mask
+    values = np.ma.getdata(conc)
+    masked = np.ma.getmask(conc)
+    low, high = sorted(valid_extent_range)
+
+    # like np.ma.masked_outside, masked gridcells are never extent
+    extent = ~((values < low) | (values > high))
 
     pole_hole_value = flags.pop('pole', None)
     if pole_hole_value:
-        pole_hole = conc == pole_hole_value
-    else:
-        pole_hole = np.zeros_like(conc).astype('bool')
-
-    extent_grid = (ice | pole_hole).astype('int')
-
-    flag_grid = np.zeros_like(extent_grid)
-    for flag in flags.values():
-        flag_grid[conc == flag] = flag
-
-    return (extent_grid + flag_grid)
+        extent |= values == pole_hole_value
+
+    counted = None
+    if zero is not None:
+        counted = ~zero
+        if low <= 0 <= high:
+            extent |= zero
+        else:
+            extent &= counted
+    if masked is not np.ma.nomask:
+        extent &= ~masked
+        counted = ~masked if counted is None else counted & ~masked
+
+    extent_grid = extent.astype('int')
+    for flag in set(flags.values()):
+        cells = values == flag
+        if counted is not None:
+            cells &= counted
+        extent_grid[cells] += int(flag)
+
+    if isinstance(conc, np.ma.MaskedArray):
+        return np.ma.MaskedArray(extent_grid, mask=masked)
+    return extent_grid
 
 
 def _index_by_date(filelist, date):
@@ -7,11 +7,19 @@ import os
 from calendar import monthrange
 from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 
 from .errors import SeaIceDataInvalidSearchPathsError
 import seaice.nasateam as nt
 from .cache import SeaiceFsCache
+from . import manifest
+
+# filename fields already parsed by the file manifest, keyed by path
+_manifest_parsed_filenames = {}
+
+FILENAME_COLUMNS = ['filename', 'date', 'year', 'month', 'day', 'platform', 'version',
+                    'hemisphere']
 
 
 def daily_file_path(hemisphere, period_index, search_paths):
@@ -28,9 +36,9 @@ def monthly_file_path(hemisphere, year, month, search_paths):
 
     files = _find_all_nasateam_ice_files_multiple_paths(search_paths)
 
-    data_frame = _get_monthly_filename_data_frame(files, hemisphere['short_name'])
-    data_frame = data_frame[data_frame.index == '{y:04}-{m:02}'.format(y=year, m=month)]
-    data_frame = _filter_by_preferred_platform_dates(data_frame)
+    data_frame = _get_preferred_filename_tables(files)[('M', hemisphere['short_name'])]
+    period = pd.Period('{y:04}-{m:02}'.format(y=year, m=month), freq='M')
+    data_frame = data_frame.loc[period:period]
 
     paths = list(data_frame.filename)
 
@@ -61,12 +69,107 @@ def _find_all_nasateam_ice_files_multiple_paths(search_paths):
     if isinstance(search_paths, str):
         raise SeaIceDataInvalidSearchPathsError('search_paths must be an iterable other than str')
 
+    if nt.FILE_MANIFEST_PATH:
+        return _find_all_nasateam_ice_files_in_manifest(nt.FILE_MANIFEST_PATH,
+                                                        tuple(search_paths))
+
     ice_files = []
     for sp in search_paths:
         ice_files.extend(_find_all_nasateam_ice_files(sp))
     return tuple(sorted(ice_files))
 
 
+@SeaiceFsCache
+def _find_all_nasateam_ice_files_in_manifest(manifest_path, search_paths):
+    """Return the same files as _find_all_nasateam_ice_files_multiple_paths, read
+    from the file manifest at manifest_path after bringing it up to date.
+
+    """
+    file_manifest = manifest.FileManifest(manifest_path)
+    try:
+        records = file_manifest.records(search_paths)
+    finally:
+        file_manifest.close()
+
+    for filename, *fields in records:
+        _manifest_parsed_filenames[filename] = fields
+
+    return tuple(sorted(record[0] for record in records))
+
+
+def _parse_filenames(file_list):
+    """Return a DataFrame with a column for each group of nt.DATA_FILENAME_MATCHER
+    and a row for each file in file_list whose name matches it. Fields already
+    parsed by the file manifest are reused rather than matched again; the rest
+    are matched all at once.
+
+    """
+    rows = []
+    unparsed = []
+    for f in file_list:
+        fields = _manifest_parsed_filenames.get(f)
+        if fields is None:
+            unparsed.append(f)
+        elif fields[0] is not None:
+            rows.append((f, *fields))
+
+    parsed = pd.DataFrame.from_records(rows, columns=FILENAME_COLUMNS)
+
+    if unparsed:
+        extracted = pd.Series(unparsed, dtype=object).str.extract(nt.DATA_FILENAME_MATCHER)
+        extracted = extracted.dropna(subset=['filename'])
+        if rows:
+            parsed = pd.concat([parsed, extracted[FILENAME_COLUMNS]], ignore_index=True)
+
+            # restore the order of file_list
+            order = {f: i for i, f in enumerate(file_list)}
+            parsed = parsed.iloc[parsed.filename.map(order).argsort(kind='mergesort')]
+        else:
+            parsed = extracted[FILENAME_COLUMNS]
+
+    return parsed.reset_index(drop=True)
+
+
+@lru_cache(maxsize=4)
+def _get_filename_tables(file_list):
+    """Return a dict of DataFrames describing the files in file_list, keyed by
+    (freq, hemisphere short name) where freq is 'D' for daily files and 'M' for
+    monthly files. Each DataFrame is indexed by Period.
+
+    Every filename is parsed once, however many hemispheres and temporalities
+    are looked up.
+
+    """
+    return _filename_tables(file_list)
+
+
+def _filename_tables(file_list):
+    table = _parse_filenames(file_list)
+
+    # the data files have 'n' or 's' for the hemisphere indicator, but we prefer
+    # to work with capital letters for the hemispheres
+    for column in ('platform', 'version', 'hemisphere'):
+        table[column] = table[column].astype('category')
+    table['hemisphere'] = table.hemisphere.cat.rename_categories(str.upper)
+
+    is_daily = table.day.notnull()
+
+    daily = table[is_daily]
+    daily = daily.set_index(pd.PeriodIndex(
+        pd.to_datetime(daily['date'], format='%Y%m%d').values, freq='D'))
+
+    monthly = table[~is_daily].drop('day', axis=1)
+    monthly = monthly.set_index(pd.PeriodIndex(
+        pd.to_datetime(monthly['date'], format='%Y%m').values, freq='M'))
+
+    tables = {}
+    for freq, df in (('D', daily), ('M', monthly)):
+        for hemi_short_name in (nt.NORTH['short_name'], nt.SOUTH['short_name']):
+            tables[(freq, hemi_short_name)] = df[df.hemisphere == hemi_short_name]
+
+    return tables
+
+
 def _filter_overlapping_nrt_and_final(file_list=[]):
     """Return one file name per date. Up to the date
     nt.LAST_DAY_WITH_VALID_FINAL_DATA, prefer gsfc-final files over near
@@ -76,125 +179,146 @@ def _filter_overlapping_nrt_and_final(file_list=[]):
     file_list -- list of file names (default [])
 
     """
-    @lru_cache(maxsize=None)
-    def _date_from_filename(filename):
-        datestr = nt.DATA_FILENAME_MATCHER.search(filename).group('date')
-        return dt.datetime.strptime(datestr, '%Y%m%d').date()
+    last_final_date = nt.LAST_DAY_WITH_VALID_FINAL_DATA.strftime('%Y%m%d')
 
-    # nrt files are clearly identified
-    nrt_file_list = [f for f in file_list
-                     if nt.DATA_FILENAME_MATCHER.search(f).group('version') == 'nrt']
+    final_file_list, nrt_file_list = set(), []
+    for f in file_list:
+        match = nt.DATA_FILENAME_MATCHER.search(f)
 
-    # final files are all the rest
-    final_file_list = list(set(file_list) - set(nrt_file_list))
+        # nrt files are clearly identified; final files are all the rest
+        if match.group('version') == 'nrt':
+            nrt_file_list.append((f, match.group('date')))
 
-    # we only want final files for dates up to LAST_DAY_WITH_VALID_FINAL_DATA
-    final_file_list = [f for f in final_file_list
-                       if _date_from_filename(f) <= nt.LAST_DAY_WITH_VALID_FINAL_DATA]
+        # we only want final files for dates up to LAST_DAY_WITH_VALID_FINAL_DATA
+        elif match.group('date') <= last_final_date:
+            final_file_list.add((f, match.group('date')))
 
     # keep only nrt files for dates where we don't have a final file
-    final_dates = [_date_from_filename(f) for f in final_file_list]
-    nrt_file_list = [f for f in nrt_file_list if _date_from_filename(f) not in final_dates]
+    final_dates = {date for f, date in final_file_list}
+    nrt_file_list = [(f, date) for f, date in nrt_file_list if date not in final_dates]
 
-    return sorted(final_file_list + nrt_file_list)
+    return sorted(f for f, date in list(final_file_list) + nrt_file_list)
 
 
-@lru_cache(maxsize=2)
-def _get_daily_filename_data_frame(file_list, hemi_short_name):
-    filename_matches = [nt.DATA_FILENAME_MATCHER.search(f) for f in file_list]
-    parsed_daily_filenames = [m.groups() for m in filename_matches if m.group('day')]
+def _resolve_overlapping_nrt_and_final(data_frame, last_final_day):
+    """Return the rows of a daily DataFrame for a single hemisphere that
+    _filter_overlapping_nrt_and_final would keep."""
+    is_nrt = np.asarray(data_frame.version == 'nrt', dtype=bool)
+    is_final = ~is_nrt & np.asarray(data_frame.index <= pd.Period(last_final_day, freq='D'))
 
-    df = pd.DataFrame().from_records(
-        parsed_daily_filenames,
-        columns=['filename', 'date', 'year', 'month', 'day', 'platform', 'version', 'hemisphere']
-    )
+    final_dates = data_frame.index[is_final]
+    keep = is_final | (is_nrt & ~data_frame.index.isin(final_dates))
 
-    # the data files have 'n' or 's' for the hemisphere indicator, but we prefer
-    # to work with capital letters for the hemispheres
-    df.hemisphere = df.hemisphere.apply(str.upper)
+    return data_frame[keep]
 
-    df = df.set_index(pd.to_datetime(df['date'].values).to_period('D'))
 
-    df = df[df.hemisphere == hemi_short_name]
+# the last resolved tables for each value of nt.LAST_DAY_WITH_VALID_FINAL_DATA,
+# kept so that files added to a file list can be resolved incrementally
+_authoritative_daily_tables = {}
 
-    return df
 
+def _get_authoritative_daily_tables(file_list):
+    """Return a dict of DataFrames, keyed by hemisphere short name, holding the
+    authoritative daily files in file_list: the files from each date's
+    preferred platform, with near real-time files dropped for any date that
+    has a final file up to nt.LAST_DAY_WITH_VALID_FINAL_DATA. Each DataFrame is
+    sorted by its PeriodIndex.
 
-@lru_cache(maxsize=2)
-def _get_monthly_filename_data_frame(file_list, hemi_short_name):
-    """"Returns a Pandas DataFrame constructed from the given list of filenames,
-    filtered by hemisphere. The DataFrame is indexed by Period and is useful for
-    extracting files matching certain kinds of date ranges, e.g., a given month
-    across a range of years. To create an indexed DataFrame for monthly files, a
-    day-of-month value of 1 is used (e.g., January 1980 is indexed as January 1,
-    1980).
-    """
-    filename_matches = [nt.DATA_FILENAME_MATCHER.search(f) for f in file_list]
-    parsed_monthly_filenames = [m.groups() for m in filename_matches if not m.group('day')]
+    When file_list only adds files to the previous list, only the dates of the
+    added files are resolved again.
 
-    df = pd.DataFrame().from_records(
-        parsed_monthly_filenames,
-        columns=['filename', 'date', 'year', 'month', 'day', 'platform', 'version', 'hemisphere']
-    )
+    """
+    last_final_day = nt.LAST_DAY_WITH_VALID_FINAL_DATA
+    hemispheres = (nt.NORTH['short_name'], nt.SOUTH['short_name'])
+
+    previous = _authoritative_daily_tables.get(last_final_day)
+    if previous is not None and previous['file_list'] == file_list:
+        return previous['tables']
+
+    if (previous is not None and len(file_list) > len(previous['files']) and
+            previous['files'].issubset(file_list)):
+        added = tuple(f for f in file_list if f not in previous['files'])
+        added_tables = _filename_tables(added)
+
+        candidates, tables = {}, {}
+        for hemi in hemispheres:
+            added_candidates = _filter_by_preferred_platform_dates(added_tables[('D', hemi)])
+            candidates[hemi] = pd.concat([previous['candidates'][hemi],
+                                          added_candidates]).sort_index(kind='mergesort')
+
+            affected = candidates[hemi].index.isin(added_candidates.index)
+            unaffected = previous['tables'][hemi]
+            unaffected = unaffected[~unaffected.index.isin(added_candidates.index)]
+            resolved = _resolve_overlapping_nrt_and_final(candidates[hemi][affected],
+                                                          last_final_day)
+            tables[hemi] = pd.concat([unaffected, resolved]).sort_index(kind='mergesort')
+    else:
+        preferred = _get_preferred_filename_tables(file_list)
+        candidates = {hemi: preferred[('D', hemi)] for hemi in hemispheres}
+        tables = {hemi: _resolve_overlapping_nrt_and_final(candidates[hemi], last_final_day)
+                  for hemi in hemispheres}
 
-    # the data files have 'n' or 's' for the hemisphere indicator, but we prefer
-    # to work with capital letters for the hemispheres
-    df.hemisphere = df.hemisphere.apply(str.upper)
+    _authoritative_daily_tables[last_final_day] = {'file_list': file_list,
+                                                   'files': frozenset(file_list),
+                                                   'candidates': candidates,
+                                                   'tables': tables}
+    return tables
 
-    df = df.drop('day', axis=1)
 
-    df = df.set_index(pd.to_datetime(df['date'].values + '01').to_period('M'))
+def _get_daily_filename_data_frame(file_list, hemi_short_name):
+    return _get_filename_tables(file_list)[('D', hemi_short_name)]
 
-    df = df[df.hemisphere == hemi_short_name]
 
-    return df
+def _get_monthly_filename_data_frame(file_list, hemi_short_name):
+    """"Returns a Pandas DataFrame constructed from the given list of filenames,
+    filtered by hemisphere. The DataFrame is indexed by Period and is useful for
+    extracting files matching certain kinds of date ranges, e.g., a given month
+    across a range of years.
+    """
+    return _get_filename_tables(file_list)[('M', hemi_short_name)]
 
 
 def _filter_by_preferred_platform_dates(data_frame):
     """Return a new DataFrame with exactly one row per hemisphere per date,
     selecting the file associated with the preferred platform when necessary.
     """
+    north = data_frame[data_frame.hemisphere == nt.NORTH['short_name']]
+    south = data_frame[data_frame.hemisphere == nt.SOUTH['short_name']]
 
-    def preferred_platform(row):
-        platform = row['platform']
-        if platform not in nt.PLATFORM_RANGES:
-            return False
-
-        for start, finish in nt.PLATFORM_RANGES[platform]:
-            # row.name is really the index of that row, which is a pd.Period
-            row_period = row.name
-
-            # choose the 15th of the month to match the old IDL code
-            #
-            # this means if there are multiple files (different platforms) for
-            # that month, the preferred platform is the one used on the 15th
-            if row_period.freqstr == 'M':
-                row_period = pd.Period(dt.date(row_period.year, row_period.month, 15), 'D')
+    data_frame = pd.concat([north, south])
+    data_frame = data_frame[_preferred_platform_mask(data_frame)]
 
-            if pd.Timestamp(start) <= row_period.to_timestamp() <= pd.Timestamp(finish):
-                return True
+    return data_frame.sort_index(kind='mergesort')
 
-        return False
 
-    def filter_platform(df):
+def _preferred_platform_mask(data_frame):
+    """Return a boolean array that is True for each row of data_frame whose date
+    falls in one of the nt.PLATFORM_RANGES of its platform."""
+    dates = data_frame.index.to_timestamp()
 
-        try:
-            df = df[df.apply(preferred_platform, axis=1)]
-        except ValueError:  # DataFrame.__getitem__: 'Must pass DataFrame with boolean values only'
-            # either nothing was bad, or nothing in the bad set passed the filter
-            pass
+    # choose the 15th of the month to match the old IDL code
+    #
+    # this means if there are multiple files (different platforms) for
+    # that month, the preferred platform is the one used on the 15th
+    if data_frame.index.freqstr == 'M':
+        dates = dates + pd.Timedelta(days=14)
 
-        return df
+    platforms = data_frame.platform.values
+    mask = np.zeros(len(data_frame), dtype=bool)
+    for platform, ranges in nt.PLATFORM_RANGES.items():
+        on_platform = np.asarray(platforms == platform, dtype=bool)
+        for start, finish in ranges:
+            mask |= on_platform & (dates >= pd.Timestamp(start)) & (dates <= pd.Timestamp(finish))
 
-    north = data_frame[data_frame.hemisphere == nt.NORTH['short_name']]
-    south = data_frame[data_frame.hemisphere == nt.SOUTH['short_name']]
+    return mask
 
-    north = filter_platform(north)
-    south = filter_platform(south)
 
-    data_frame = north.append(south).sort_index()
-
-    return data_frame
+@lru_cache(maxsize=4)
+def _get_preferred_filename_tables(file_list):
+    """Return the tables of _get_filename_tables, keyed the same way, with only
+    the files from each date's preferred platform, sorted by date."""
+    return {key: _filter_by_preferred_platform_dates(df)
+            for key, df in _get_filename_tables(file_list).items()}
 
 
 def daily_file_paths_in_date_range(hemisphere, start_date, end_date, search_paths):
@@ -213,17 +337,19 @@ def _daily_file_paths_in_period_index(hemisphere, period_index, search_paths):
     """
     files = _find_all_nasateam_ice_files_multiple_paths(search_paths)
 
-    data_frame = _get_daily_filename_data_frame(files, hemisphere['short_name'])
+    data_frame = _get_authoritative_daily_tables(files)[hemisphere['short_name']]
 
-    labels = data_frame.index.intersection(period_index)
-    if labels.empty:
+    if len(period_index) == 0:
         return []
-    data_frame = data_frame.loc[labels]
-
-    data_frame = _filter_by_preferred_platform_dates(data_frame)
 
-    paths = list(data_frame.filename)
+    first, last = period_index.min(), period_index.max()
+    data_frame = data_frame.loc[first:last]
+    if len(period_index) != (last - first).n + 1:
+        # not a contiguous range of dates
+        data_frame = data_frame[data_frame.index.isin(period_index)]
 
-    paths = _filter_overlapping_nrt_and_final(paths)
+    is_nrt = np.asarray(data_frame.version == 'nrt', dtype=bool)
+    final_paths = set(data_frame.filename.values[~is_nrt])
+    nrt_paths = list(data_frame.filename.values[is_nrt])
 
-    return paths
+    return sorted(list(final_paths) + nrt_paths)
@@ -0,0 +1,251 @@
+"""A persistent, on-disk manifest of the Goddard nasateam files below a set of
+search paths.
+
+Walking the whole archive with os.walk dominates the startup time of every
+process that needs to locate a file. The manifest stores every nasateam
+filename found below a search path in a SQLite database, together with the
+fields parsed out of the filename (date, platform, version, hemisphere).
+
+Refreshing the manifest is incremental: each directory's mtime is recorded
+when it is listed, and a directory is only listed again when its mtime
+changes. Directories whose mtime is too recent to be trusted (see
+RACY_MTIME_SECONDS) are always listed again on the next refresh.
+
+"""
+import fnmatch
+import logging
+import os
+import sqlite3
+import time
+
+import seaice.nasateam as nt
+
+log = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+FILENAME_FILTER = '*nt_*.bin'
+
+# a directory modified this recently may still be changing within the
+# resolution of the filesystem's timestamps, so its mtime is not recorded
+RACY_MTIME_SECONDS = 2
+
+# order matches the groups of nt.DATA_FILENAME_MATCHER after 'filename'
+PARSED_FIELDS = ('date', 'year', 'month', 'day', 'platform', 'version', 'hemisphere')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS info (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS directories (
+    root TEXT NOT NULL,
+    reldir TEXT NOT NULL,
+    parent TEXT,
+    mtime_ns INTEGER,
+    PRIMARY KEY (root, reldir)
+);
+CREATE TABLE IF NOT EXISTS files (
+    root TEXT NOT NULL,
+    reldir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    date TEXT,
+    year TEXT,
+    month TEXT,
+    day TEXT,
+    platform TEXT,
+    version TEXT,
+    hemisphere TEXT,
+    PRIMARY KEY (root, reldir, name)
+);
+"""
+
+
+class FileManifest(object):
+    """SQLite backed manifest of nasateam files.
+
+    Paths returned by the manifest are joined onto the search path exactly as
+    it was given, so they are identical to the paths os.walk would produce
+    for that search path.
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = None
+
+    def filenames(self, search_paths, refresh=True):
+        """Return a sorted tuple of all nasateam files below the given search
+        paths."""
+        return tuple(sorted(record[0] for record in self.records(search_paths, refresh)))
+
+    def records(self, search_paths, refresh=True):
+        """Return a list of tuples, one per nasateam file below the given search
+        paths. Each tuple holds the full path followed by the fields in
+        PARSED_FIELDS; the fields are None for files whose names do not match
+        nt.DATA_FILENAME_MATCHER.
+
+        """
+        records = []
+        for search_path in search_paths:
+            if refresh:
+                self.refresh(search_path)
+
+            rows = self._db.execute(
+                'SELECT reldir, name, {} FROM files WHERE root = ?'.format(
+                    ', '.join(PARSED_FIELDS)),
+                (_root_key(search_path),)
+            )
+            for reldir, name, *fields in rows:
+                records.append((os.path.join(search_path, reldir, name), *fields))
+
+        return records
+
+    def refresh(self, search_path):
+        """Bring the manifest up to date for a single search path, listing only
+        the directories that changed since the last refresh."""
+        root = _root_key(search_path)
+        known = {reldir: mtime_ns for reldir, mtime_ns in self._db.execute(
+            'SELECT reldir, mtime_ns FROM directories WHERE root = ?', (root,))}
+
+        listed = 0
+        now = time.time()
+        with self._db:
+            stack = ['']
+            while stack:
+                reldir = stack.pop()
+                try:
+                    mtime_ns = os.stat(os.path.join(root, reldir)).st_mtime_ns
+                except OSError:
+                    self._forget(root, reldir)
+                    continue
+
+                if reldir in known and known[reldir] == mtime_ns:
+                    stack.extend(self._subdirectories(root, reldir))
+                    continue
+
+                subdirs = self._list(root, reldir, mtime_ns, now)
+                stack.extend(subdirs)
+                listed += 1
+
+        log.debug('refreshed manifest {} for {}; listed {} of {} known '
+                  'directories'.format(self.path, search_path, listed, len(known)))
+
+    def verify(self, search_paths):
+        """Compare the manifest with a full walk of the search paths. Returns a
+        tuple (missing, extra): files on disk that are not in the manifest,
+        and files in the manifest that are not on disk.
+
+        """
+        in_manifest = set(self.filenames(search_paths, refresh=False))
+
+        on_disk = set()
+        for search_path in search_paths:
+            for root, dirs, files in os.walk(search_path):
+                on_disk.update(os.path.join(root, f) for f in fnmatch.filter(files,
+                                                                             FILENAME_FILTER))
+
+        return sorted(on_disk - in_manifest), sorted(in_manifest - on_disk)
+
+    def clear(self):
+        """Remove every entry from the manifest."""
+        with self._db:
+            self._db.execute('DELETE FROM directories')
+            self._db.execute('DELETE FROM files')
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @property
+    def _db(self):
+        if self._connection is None:
+            self._connection = _connect(self.path)
+        return self._connection
+
+    def _list(self, root, reldir, mtime_ns, now):
+        """List one directory, replacing what the manifest knows about it. Returns
+        the relative paths of its subdirectories."""
+        subdirs, files = [], []
+        with os.scandir(os.path.join(root, reldir)) as entries:
+            for entry in entries:
+                if _is_dir(entry):
+                    # like os.walk, don't descend into symlinked directories
+                    if not entry.is_symlink():
+                        subdirs.append(os.path.join(reldir, entry.name))
+                else:
+                    files.append(entry.name)
+
+        # forget subdirectories that have been removed
+        for known_subdir in self._subdirectories(root, reldir):
+            if known_subdir not in subdirs:
+                self._forget(root, known_subdir)
+
+        nasateam_files = fnmatch.filter(files, FILENAME_FILTER)
+        self._db.execute('DELETE FROM files WHERE root = ? AND reldir = ?', (root, reldir))
+        self._db.executemany(
+            'INSERT INTO files VALUES (?, ?, ?, {})'.format(', '.join('?' * len(PARSED_FIELDS))),
+            [(root, reldir, name, *_parse(name)) for name in nasateam_files]
+        )
+
+        if now - mtime_ns / 1e9 < RACY_MTIME_SECONDS:
+            mtime_ns = None
+        parent = None if reldir == '' else os.path.dirname(reldir)
+        self._db.execute('INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?)',
+                         (root, reldir, parent, mtime_ns))
+
+        for subdir in subdirs:
+            self._db.execute('INSERT OR IGNORE INTO directories VALUES (?, ?, ?, NULL)',
+                             (root, subdir, reldir))
+
+        return subdirs
+
+    def _subdirectories(self, root, reldir):
+        return [subdir for subdir, in self._db.execute(
+            'SELECT reldir FROM directories WHERE root = ? AND parent = ?', (root, reldir))]
+
+    def _forget(self, root, reldir):
+        """Remove a directory and everything below it from the manifest."""
+        if reldir == '':
+            where, args = 'root = ?', (root,)
+        else:
+            prefix = reldir + os.sep
+            where = 'root = ? AND (reldir = ? OR substr(reldir, 1, ?) = ?)'
+            args = (root, reldir, len(prefix), prefix)
+
+        self._db.execute('DELETE FROM files WHERE ' + where, args)
+        self._db.execute('DELETE FROM directories WHERE ' + where, args)
+
+
+def _connect(path):
+    connection = sqlite3.connect(path, timeout=60)
+    connection.executescript(_SCHEMA)
+
+    row = connection.execute("SELECT value FROM info WHERE key = 'schema_version'").fetchone()
+    if row is None or int(row[0]) != SCHEMA_VERSION:
+        with connection:
+            connection.execute('DELETE FROM directories')
+            connection.execute('DELETE FROM files')
+            connection.execute("INSERT OR REPLACE INTO info VALUES ('schema_version', ?)",
+                               (str(SCHEMA_VERSION),))
+
+    return connection
+
+
+def _root_key(search_path):
+    return os.path.abspath(search_path)
+
+
+def _is_dir(entry):
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def _parse(name):
+    match = nt.DATA_FILENAME_MATCHER.search(name)
+    if match is None:
+        return (None,) * len(PARSED_FIELDS)
+    return tuple(match.group(field) for field in PARSED_FIELDS)
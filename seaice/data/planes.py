@@ -0,0 +1,181 @@
+"""Concentration grids held as two compact planes instead of one float64 array.
+
+Gridsets built from nasateam files normally hold a float64 array mixing
+concentrations, within the gridset's 'valid_data_range', with flag values
+(see nt.FLAGS), and most code using them separates the two again with masked
+arrays. ConcentrationPlanes keeps them apart:
+
+    concentration: the concentration of each cell multiplied by `scale`; the
+        raw uint8 values of the nasateam files (scale nt.SCALE), or floating
+        point percentages (scale 1) where the values are not raw file values,
+        e.g. averages of daily grids. 0 wherever the cell is flagged.
+
+    flags: uint8 flag value of each cell; 0 wherever the cell holds a
+        concentration.
+
+A cube of raw values takes 2 bytes per cell instead of 8.
+
+Gridsets holding ConcentrationPlanes are built by passing planes=True to
+seaice.data.getter._concentration_gridset_by_filelist,
+concentration_monthly_over_years and concentration_seasonal_over_years. They
+can be given to the drop_land, drop_invalid_ice, apply_largest_pole_hole,
+concentration_cutoff, concentration_to_extent and prevent_empty filters, to
+getter.flag_layer_from_cube, and to seaice.sedna.cube.ConcentrationCube.
+
+"""
+import numpy as np
+
+from . import errors as e
+import seaice.nasateam as nt
+
+
+class ConcentrationPlanes(object):
+    """A 2D or 3D array of concentrations with a separate plane of flag values."""
+
+    def __init__(self, concentration, flags, scale=1.0):
+        if concentration.shape != flags.shape:
+            raise e.SeaIceDataValueError(
+                'concentration shape {} does not match flags shape {}'.format(
+                    concentration.shape, flags.shape))
+
+        self.concentration = concentration
+        self.flags = flags
+        self.scale = scale
+
+    @classmethod
+    def from_raw(cls, raw, valid_range=nt.VALID_DATA_RANGE, scale=nt.SCALE):
+        """Return ConcentrationPlanes for an array of raw uint8 nasateam values."""
+        concentration_lookup, flag_lookup = raw_value_lookups(valid_range)
+        return cls(concentration_lookup[raw], flag_lookup[raw], scale)
+
+    @classmethod
+    def from_data(cls, data, valid_data_range, scale=nt.SCALE):
+        """Return ConcentrationPlanes for gridset data holding concentrations within
+        valid_data_range and flag values outside it.
+
+        The concentrations are stored as uint8 values multiplied by scale when
+        that represents every one of them exactly, and as they are otherwise.
+
+        """
+        data = np.ma.getdata(data)
+        valid = ~((data < valid_data_range[0]) | (data > valid_data_range[1]))
+        flags = np.where(valid, 0, data).astype(np.uint8)
+
+        concentration = np.where(valid, data, 0)
+        raw = np.rint(concentration * scale)
+        if np.all((raw >= 0) & (raw <= np.iinfo(np.uint8).max)):
+            candidate = cls(raw.astype(np.uint8), flags, scale)
+            if np.array_equal(candidate.percent(fill_value=0), concentration):
+                return candidate
+
+        return cls(concentration, flags)
+
+    @classmethod
+    def stack(cls, planes_list):
+        """Return the ConcentrationPlanes stacking the given 2D or 3D planes along the
+        third axis, like np.dstack."""
+        scales = {planes.scale for planes in planes_list}
+        dtypes = {planes.concentration.dtype for planes in planes_list}
+
+        if len(scales) == 1 and len(dtypes) == 1:
+            concentration = np.dstack([planes.concentration for planes in planes_list])
+            scale = scales.pop()
+        else:
+            concentration = np.dstack([planes.percent(fill_value=0) for planes in planes_list])
+            scale = 1.0
+
+        return cls(concentration, np.dstack([planes.flags for planes in planes_list]), scale)
+
+    @property
+    def shape(self):
+        return self.flags.shape
+
+    @property
+    def ndim(self):
+        return self.flags.ndim
+
+    @property
+    def nbytes(self):
+        return self.concentration.nbytes + self.flags.nbytes
+
+    @property
+    def valid(self):
+        """Boolean array, True where the cell holds a concentration."""
+        return self.flags == 0
+
+    def percent(self, dtype=np.float64, fill_value=np.nan):
+        """Return the concentrations as percentages, with fill_value wherever the cell
+        is flagged."""
+        percent = self.concentration.astype(dtype)
+        if self.scale != 1:
+            percent /= self.scale
+        percent[~self.valid] = fill_value
+        return percent
+
+    def masked(self, dtype=np.float64):
+        """Return the concentrations as a masked array of percentages, masked wherever
+        the cell is flagged."""
+        return np.ma.array(self.percent(dtype, fill_value=0), mask=~self.valid)
+
+    def to_data(self):
+        """Return the float64 array of percentages and flag values used by gridsets
+        that do not hold ConcentrationPlanes."""
+        return np.where(self.valid, self.percent(fill_value=0), self.flags)
+
+    def where_percent(self, condition):
+        """Return a boolean array, True where condition, a function of an array of
+        percentages, is True for the cell's concentration. Flagged cells have a
+        concentration of 0."""
+        if self.concentration.dtype == np.uint8:
+            return condition(np.arange(256) / self.scale)[self.concentration]
+        return condition(self.concentration / self.scale)
+
+    def flag_layer(self, missing_value=None):
+        """Return the masked array flag_layer_from_cube gives for the flags of a
+        cube holding these planes: a cell is unmasked if and only if it has the
+        same flag value in every layer, ignoring layers in which every flagged
+        cell is missing_value.
+
+        """
+        if self.ndim == 2:
+            return np.ma.array(self.flags, mask=self.valid)
+
+        flagged = ~self.valid
+        layers = range(self.shape[2])
+        if missing_value is not None:
+            skipped = np.any(flagged, axis=(0, 1)) & np.all(
+                (self.flags == missing_value) | ~flagged, axis=(0, 1))
+            layers = np.flatnonzero(~skipped)
+
+        if len(layers) == 0:
+            return np.ma.array(self.flags[:, :, 0], mask=self.valid[:, :, 0])
+
+        flag_layer = self.flags[:, :, layers[0]].copy()
+        same = flag_layer != 0
+        for layer in layers[1:]:
+            same &= self.flags[:, :, layer] == flag_layer
+
+        return np.ma.array(flag_layer, mask=~same)
+
+    def copy(self):
+        return ConcentrationPlanes(self.concentration.copy(), self.flags.copy(), self.scale)
+
+    def squeeze(self):
+        return ConcentrationPlanes(np.squeeze(self.concentration), np.squeeze(self.flags),
+                                   self.scale)
+
+    def __getitem__(self, key):
+        return ConcentrationPlanes(self.concentration[key], self.flags[key], self.scale)
+
+    def __repr__(self):
+        return '<ConcentrationPlanes shape={} concentration dtype={} scale={}>'.format(
+            self.shape, self.concentration.dtype, self.scale)
+
+
+def raw_value_lookups(valid_range=nt.VALID_DATA_RANGE):
+    """Return a tuple of uint8 arrays (concentration, flags) mapping each possible
+    raw uint8 value to its value in each plane."""
+    values = np.arange(256, dtype=np.uint8)
+    in_range = (values >= valid_range[0]) & (values <= valid_range[1])
+    zero = np.uint8(0)
+    return np.where(in_range, values, zero), np.where(in_range, zero, values)
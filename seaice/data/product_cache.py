@@ -0,0 +1,98 @@
+"""On-disk cache of derived concentration grids.
+
+Monthly concentrations averaged from daily files are computed again by every
+process that needs them. When nt.PRODUCT_CACHE_PATH is set,
+getter.concentration_monthly keeps what each one is computed from there:
+
+    <kind>/<hemisphere>/<period>_<key>.npz
+
+The key is a hash of the kind, hemisphere and period of the grid, of the path,
+size and mtime of every file it is computed from, and of the settings it
+depends on, so an entry is never stale: once a file changes, the grid is
+looked up under a new key and computed again.
+
+An entry holds the arrays its builder returns and the list of files they were
+computed from. A monthly entry holds the uint16 sum of each gridcell's raw
+daily concentrations, the uint8 count of days with a concentration and a uint8
+flag layer, 4 bytes per gridcell, from which the average is computed exactly.
+Seasonal concentrations are not cached themselves; they are averaged from the
+cached monthly ones.
+
+Entries are written to a temporary file and renamed into place, so processes
+sharing the cache never read a partly written entry; processes computing the
+same grid at once write identical entries.
+
+"""
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+
+from . import stores
+import seaice.nasateam as nt
+
+log = logging.getLogger(__name__)
+
+CACHE_VERSION = 2
+
+
+def cached(kind, nt_hemi, period, sources, build):
+    """Return the (arrays, files) pair build() returns, a dict of the arrays a
+    derived grid is computed from and the list of files they were computed
+    from, from the cache in nt.PRODUCT_CACHE_PATH if it is there, otherwise
+    from build(), adding it to the cache.
+
+    kind: name of the kind of grid, e.g. 'monthly'
+
+    period: string naming the period of the grid, e.g. '2019-03'
+
+    sources: list of the (kind, files) pairs the grid is computed from, as
+        returned by getter._monthly_sources.
+
+    """
+    path = entry_path(kind, nt_hemi, period, sources)
+
+    entry = _load(path)
+    if entry is not None:
+        return entry
+
+    arrays, files = build()
+    _save(path, arrays, files)
+
+    return arrays, files
+
+
+def entry_path(kind, nt_hemi, period, sources):
+    """Return the path of the cache entry of the grid with the given inputs."""
+    key = [CACHE_VERSION, kind, nt_hemi['short_name'], period,
+           list(nt.VALID_DATA_RANGE), nt.SCALE, sorted(nt.FLAGS.items()),
+           [[source_kind, stores.file_stats(files)] for source_kind, files in sources]]
+    digest = hashlib.sha1(json.dumps(key).encode('utf-8')).hexdigest()
+
+    return os.path.join(nt.PRODUCT_CACHE_PATH, kind, nt_hemi['short_name'],
+                        '{}_{}.npz'.format(period, digest))
+
+
+def _save(path, arrays, files):
+    """Write the entry to path, replacing it atomically."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    entry = {'array_' + name: array for name, array in arrays.items()}
+    entry.update({'version': np.array(CACHE_VERSION),
+                  'files': np.array(json.dumps(files))})
+    stores.save_npz(path, entry)
+
+    log.debug('cached {}'.format(path))
+
+
+def _load(path):
+    """Return the (arrays, files) pair saved at path, or None if there is none or it
+    cannot be read."""
+    def read(npz):
+        arrays = {name[len('array_'):]: npz[name]
+                  for name in npz.files if name.startswith('array_')}
+        return arrays, json.loads(str(npz['files']))
+
+    return stores.load_npz(path, CACHE_VERSION, read, 'cache entry')
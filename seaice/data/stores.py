@@ -0,0 +1,84 @@
+"""Helpers for the files seaice.data keeps on disk: the trend and climatology
+stores, the product cache, the cube archive and the valid ice mask bundle.
+
+Each of them is written to a temporary file in its directory and renamed into
+place (atomic_path), so a process reading it never sees a partly written
+file, and is rebuilt rather than read when it cannot be loaded (load_npz).
+Those that depend on the data files record their path, size and mtime
+(file_stats).
+
+"""
+import contextlib
+import logging
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+@contextlib.contextmanager
+def atomic_path(path):
+    """Yield the path of a temporary file, next to path, for the caller to write.
+    When the block exits normally, the file is made world readable and
+    replaces path atomically; otherwise it is removed."""
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path), suffix='.tmp',
+                                    dir=os.path.dirname(os.path.abspath(path)))
+    os.close(fd)
+
+    try:
+        yield tmp_path
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def save_npz(path, arrays):
+    """Write the dict of arrays to the compressed npz file at path, replacing it
+    atomically."""
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, 'wb') as fp:
+            np.savez_compressed(fp, **arrays)
+
+
+def load_npz(path, version, read, description):
+    """Return read(npz) for the npz file at path, or None if there is none, if
+    its 'version' array is not version, or if it cannot be read.
+
+    description names the kind of file in the warning logged when it cannot be
+    read, e.g. 'trend store'.
+
+    """
+    try:
+        with np.load(path) as npz:
+            if int(npz['version']) != version:
+                return None
+
+            return read(npz)
+    except FileNotFoundError:
+        return None
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as err:
+        log.warning('ignoring unreadable {} {}: {}'.format(description, path, err))
+        return None
+
+
+def file_stats(files):
+    """Return the [path, size, mtime_ns] of each of the files, the record of
+    them that fingerprints and cache keys are computed from."""
+    stats = []
+    for filename in files:
+        st = os.stat(filename)
+        stats.append([filename, st.st_size, st.st_mtime_ns])
+
+    return stats
+
+
+def json_default(value):
+    """json.dumps default for the numpy scalars in gridset metadata."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError('{!r} is not JSON serializable'.format(value))
@@ -0,0 +1,161 @@
+from unittest.mock import Mock, patch
+import os
+import shutil
+import tempfile
+import unittest
+
+from nose.tools import assert_equals
+import numpy as np
+import numpy.testing as npt
+
+import seaice.data.archive as archive
+import seaice.data.getter as getter
+
+TEST_DATA = os.path.join(os.path.dirname(__file__),
+                         os.path.pardir, os.path.pardir, os.path.pardir,
+                         'test_data', 'seaice.data')
+SOUTH_DAILY_FILE = os.path.join(TEST_DATA, 'nt_19871118_f08_v01_s.bin')
+NORTH_DAILY_FILE = os.path.join(TEST_DATA, 'nt_20010107_f13_v01_n.bin')
+NORTH_DAILY_FILE_2 = os.path.join(TEST_DATA, 'nt_20010106_f13_v1.1_n.bin')
+NORTH_MONTHLY_FILE = os.path.join(TEST_DATA, 'nt_200101_f13_v01_n.bin')
+ALL_FILES = [SOUTH_DAILY_FILE, NORTH_DAILY_FILE, NORTH_DAILY_FILE_2, NORTH_MONTHLY_FILE]
+
+
+class Test_store_name(unittest.TestCase):
+
+    def test_daily(self):
+        assert_equals('nt_daily_n_2001.nc', archive.store_name(NORTH_DAILY_FILE))
+
+    def test_monthly(self):
+        assert_equals('nt_monthly_n.nc', archive.store_name(NORTH_MONTHLY_FILE))
+
+    def test_nrt(self):
+        assert_equals('nt_daily_s_2015.nc', archive.store_name('nt_20150901_f17_nrt_s.bin'))
+
+    def test_not_a_data_file(self):
+        assert_equals(None, archive.store_name('README'))
+
+
+class Test_CubeArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.archive = archive.CubeArchive(self.path)
+
+    def tearDown(self):
+        self.archive.close()
+        shutil.rmtree(self.path)
+
+    def test_update_writes_one_store_per_hemisphere_and_year(self):
+        written, unchanged = self.archive.update(ALL_FILES)
+
+        assert_equals(['nt_daily_n_2001.nc', 'nt_daily_s_1987.nc', 'nt_monthly_n.nc'], written)
+        assert_equals([], unchanged)
+        assert_equals(sorted(written), sorted(os.listdir(self.path)))
+
+    def test_update_skips_unchanged_stores(self):
+        self.archive.update(ALL_FILES)
+
+        written, unchanged = self.archive.update(ALL_FILES)
+
+        assert_equals([], written)
+        assert_equals(3, len(unchanged))
+
+    def test_update_rewrites_stores_with_added_files(self):
+        self.archive.update([NORTH_DAILY_FILE, NORTH_MONTHLY_FILE])
+
+        written, unchanged = self.archive.update([NORTH_DAILY_FILE, NORTH_DAILY_FILE_2,
+                                                  NORTH_MONTHLY_FILE])
+
+        assert_equals(['nt_daily_n_2001.nc'], written)
+        assert_equals(['nt_monthly_n.nc'], unchanged)
+
+    def test_read_matches_files(self):
+        self.archive.update(ALL_FILES)
+        file_list = [NORTH_DAILY_FILE_2, NORTH_MONTHLY_FILE, NORTH_DAILY_FILE, NORTH_DAILY_FILE_2]
+
+        actual = self.archive.read(file_list)
+
+        expected = np.dstack([getter._read_goddard_nasateam_file(f) for f in file_list])
+        assert_equals(np.uint8, actual.dtype)
+        npt.assert_array_equal(expected, actual)
+
+    def _copy(self, filename):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        return shutil.copy2(filename, directory)
+
+    def test_read_looks_files_up_by_basename(self):
+        self.archive.update([NORTH_DAILY_FILE])
+
+        actual = self.archive.read([self._copy(NORTH_DAILY_FILE)])
+
+        npt.assert_array_equal(getter._read_goddard_nasateam_file(NORTH_DAILY_FILE),
+                               actual[:, :, 0])
+
+    def test_read_returns_None_if_a_file_changed(self):
+        filename = self._copy(NORTH_DAILY_FILE)
+        self.archive.update([filename, NORTH_DAILY_FILE_2])
+
+        st = os.stat(filename)
+        os.utime(filename, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+
+        assert_equals(None, self.archive.read([NORTH_DAILY_FILE_2, filename]))
+        self.assertIsNotNone(self.archive.read([NORTH_DAILY_FILE_2]))
+
+    def test_read_returns_None_if_a_file_is_gone(self):
+        filename = self._copy(NORTH_DAILY_FILE)
+        self.archive.update([filename])
+
+        os.remove(filename)
+
+        assert_equals(None, self.archive.read([filename]))
+
+    def test_read_returns_None_if_any_file_is_missing(self):
+        self.archive.update([NORTH_DAILY_FILE])
+
+        assert_equals(None, self.archive.read([NORTH_DAILY_FILE, NORTH_DAILY_FILE_2]))
+        assert_equals(None, self.archive.read([NORTH_MONTHLY_FILE]))
+
+    def test_read_reopens_rewritten_stores(self):
+        self.archive.update([NORTH_DAILY_FILE])
+        self.archive.read([NORTH_DAILY_FILE])
+
+        self.archive.update([NORTH_DAILY_FILE, NORTH_DAILY_FILE_2])
+
+        self.assertIsNotNone(self.archive.read([NORTH_DAILY_FILE_2]))
+
+
+class Test__concentration_gridset_by_filelist_from_archive(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        archive.CubeArchive(self.path).update(ALL_FILES)
+
+    def tearDown(self):
+        archive.cube_archive(self.path).close()
+        shutil.rmtree(self.path)
+
+    def test_matches_gridset_from_files(self):
+        file_list = [NORTH_DAILY_FILE_2, NORTH_DAILY_FILE]
+        expected = getter._concentration_gridset_by_filelist(file_list)
+
+        with patch('seaice.nasateam.CUBE_ARCHIVE_PATH', self.path):
+            mock_read = Mock()
+            with patch.dict(getter.GODDARD_NASATEAM_READERS, {'fromfile': mock_read}):
+                actual = getter._concentration_gridset_by_filelist(file_list)
+
+        mock_read.assert_not_called()
+        npt.assert_array_equal(expected['data'], actual['data'])
+        assert_equals(expected['data'].dtype, actual['data'].dtype)
+        assert_equals(expected['metadata']['files'], actual['metadata']['files'])
+
+    def test_falls_back_to_files_missing_from_archive(self):
+        file_list = [os.path.join(TEST_DATA, 'nt_20010107_f13_v01_n.bin')]
+        shutil.rmtree(self.path)
+        os.makedirs(self.path)
+
+        with patch('seaice.nasateam.CUBE_ARCHIVE_PATH', self.path):
+            actual = getter._concentration_gridset_by_filelist(file_list)
+
+        assert_equals((448, 304), actual['data'].shape)
@@ -0,0 +1,120 @@
+from unittest.mock import Mock, patch
+import os
+import shutil
+import tempfile
+import unittest
+
+from nose.tools import assert_equals
+import numpy as np
+import numpy.testing as npt
+
+from seaice.data.cache import DecodedGridCache
+import seaice.data.getter as getter
+
+TEST_DATA = os.path.join(os.path.dirname(__file__),
+                         os.path.pardir, os.path.pardir, os.path.pardir,
+                         'test_data', 'seaice.data')
+NORTH_DAILY_FILE = os.path.join(TEST_DATA, 'nt_20010107_f13_v01_n.bin')
+
+
+class Test_DecodedGridCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.paths = []
+        for name in ('a', 'b', 'c'):
+            path = os.path.join(self.directory, name)
+            open(path, 'wb').close()
+            self.paths.append(path)
+
+        self.load = Mock(side_effect=lambda path: np.zeros(100, dtype=np.uint8))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_loads_each_file_once(self):
+        cache = DecodedGridCache(1000)
+
+        first = cache.get(self.paths[0], self.load)
+        second = cache.get(self.paths[0], self.load)
+
+        self.assertIs(first, second)
+        assert_equals(1, self.load.call_count)
+        assert_equals((1, 1, 0, 1, 100, 1000), tuple(cache.info()))
+
+    def test_cached_grids_are_read_only(self):
+        cache = DecodedGridCache(1000)
+
+        grid = cache.get(self.paths[0], self.load)
+
+        self.assertFalse(grid.flags.writeable)
+
+    def test_evicts_least_recently_used_over_budget(self):
+        cache = DecodedGridCache(200)
+        cache.get(self.paths[0], self.load)
+        cache.get(self.paths[1], self.load)
+        cache.get(self.paths[0], self.load)
+
+        cache.get(self.paths[2], self.load)
+        cache.get(self.paths[0], self.load)
+        cache.get(self.paths[1], self.load)
+
+        # b was evicted when c was added; a was used more recently
+        assert_equals(4, self.load.call_count)
+        info = cache.info()
+        assert_equals((2, 4, 2), (info.hits, info.misses, info.evictions))
+        assert_equals(200, info.nbytes)
+
+    def test_reloads_replaced_files(self):
+        cache = DecodedGridCache(1000)
+        cache.get(self.paths[0], self.load)
+
+        with open(self.paths[0], 'wb') as fp:
+            fp.write(b'new')
+        cache.get(self.paths[0], self.load)
+
+        assert_equals(2, self.load.call_count)
+
+    def test_does_not_hold_grids_larger_than_budget(self):
+        cache = DecodedGridCache(50)
+
+        cache.get(self.paths[0], self.load)
+
+        assert_equals(0, cache.info().entries)
+
+    def test_resize_evicts(self):
+        cache = DecodedGridCache(1000)
+        for path in self.paths:
+            cache.get(path, self.load)
+
+        cache.resize(100)
+
+        assert_equals((1, 100, 2), (cache.info().entries, cache.info().nbytes,
+                                    cache.info().evictions))
+
+
+class Test_getter_decoded_grid_cache(unittest.TestCase):
+
+    def setUp(self):
+        getter.decoded_grid_cache.cache_clear()
+
+    def tearDown(self):
+        getter.decoded_grid_cache.cache_clear()
+
+    def test_gridsets_share_decoded_grids(self):
+        expected = getter._concentration_gridset_by_filelist([NORTH_DAILY_FILE])
+
+        read = Mock(side_effect=getter._read_goddard_nasateam_file)
+        with patch.dict(getter.GODDARD_NASATEAM_READERS, {'fromfile': read}):
+            actual = getter._concentration_gridset_by_filelist([NORTH_DAILY_FILE,
+                                                                NORTH_DAILY_FILE])
+
+        read.assert_not_called()
+        npt.assert_array_equal(expected['data'], actual['data'][:, :, 1])
+        assert_equals(2, getter.decoded_grid_cache.info().hits)
+
+    @patch('seaice.nasateam.DECODED_GRID_CACHE_BYTES', 0)
+    def test_disabled_by_zero_budget(self):
+        getter._concentration_gridset_by_filelist([NORTH_DAILY_FILE])
+
+        assert_equals(0, getter.decoded_grid_cache.info().misses)
@@ -0,0 +1,201 @@
+from unittest.mock import patch
+import os
+import shutil
+import tempfile
+import unittest
+
+from nose.tools import assert_equals, raises
+import numpy as np
+import numpy.testing as npt
+import pandas as pd
+import pandas.util.testing as pdt
+
+from seaice.data.errors import SeaIceDataNoData
+import seaice.data.api as api
+import seaice.data.climatology_store as climatology_store
+import seaice.nasateam as nt
+
+HEMISPHERE = {'short_name': 'N', 'shape': (6, 5)}
+MONTH = 3
+MISSING = nt.FLAGS['missing']
+POLE = nt.FLAGS['pole']
+LAND = nt.FLAGS['land']
+
+
+class Test_store_name(unittest.TestCase):
+
+    def test_name(self):
+        assert_equals('climatology_S_03_1981-2010.npz',
+                      climatology_store.store_name(nt.SOUTH, 3, 1981, 2010))
+
+
+class Test_concentration_monthly_anomaly(unittest.TestCase):
+    """Anomalies computed with a stored climatology match anomalies computed from
+    every year of the climatology, on synthetic March concentrations."""
+
+    def setUp(self):
+        self.store_path = tempfile.mkdtemp()
+        self.fingerprint = 'fingerprint'
+        self.missing_years = [1982]
+        self.daily_years = [1984]
+        self.years_read = []
+
+    def tearDown(self):
+        shutil.rmtree(self.store_path)
+
+    def _invalid_ice_mask(self, hemisphere, month):
+        mask = np.zeros(HEMISPHERE['shape'], dtype=bool)
+        mask[5, :] = True
+        return mask
+
+    def _concentration_monthly(self, hemisphere, year, month, search_paths, *args):
+        self.years_read.append(year)
+
+        rng = np.random.RandomState(year)
+        period_index = pd.period_range('{}-{}'.format(year, month), periods=1, freq='M')
+        if year in self.daily_years:
+            period_index = pd.period_range('{}-{}-01'.format(year, month), periods=31, freq='D')
+
+        if year in self.missing_years:
+            data = np.full(HEMISPHERE['shape'], MISSING, dtype=np.float64)
+        else:
+            data = np.round(rng.uniform(0, 100, HEMISPHERE['shape']), 1)
+            data[:, 4] = LAND
+            data[0, 0] = POLE
+            if year == 1983:
+                data[0, 1] = POLE
+
+        return {'data': data,
+                'metadata': {'files': ['nt_{}{:02}_f08_v01_n.bin'.format(year, month)],
+                             'period_index': period_index,
+                             'period': pd.Period('{}-{}'.format(year, month), freq='M'),
+                             'temporality': 'M',
+                             'valid_data_range': (0., 100.),
+                             'flags': {k: v for k, v in nt.FLAGS.items() if k != 'missing'},
+                             'missing_value': MISSING}}
+
+    def _anomaly(self, store, allow_empty_gridset=True):
+        with patch.object(nt, 'CLIMATOLOGY_STORE_PATH', self.store_path if store else None), \
+                patch('seaice.nasateam.invalid_ice_mask', side_effect=self._invalid_ice_mask), \
+                patch('seaice.data.getter.concentration_monthly',
+                      side_effect=self._concentration_monthly), \
+                patch('seaice.data.climatology_store._fingerprint',
+                      side_effect=lambda *args: self.fingerprint):
+            return api.concentration_monthly_anomaly(HEMISPHERE, 2001, MONTH, 1979, 1990,
+                                                     search_paths=['/search/path'],
+                                                     allow_empty_gridset=allow_empty_gridset)
+
+    def _years_read(self):
+        years, self.years_read = self.years_read, []
+        return years
+
+    def _assert_same_anomaly(self):
+        actual = self._anomaly(store=True)
+        expected = self._anomaly(store=False)
+
+        npt.assert_array_equal(expected['data'], actual['data'])
+        for key in ('valid_data_range', 'climatology_files', 'month_files', 'type'):
+            assert_equals(expected['metadata'][key], actual['metadata'][key])
+        pdt.assert_index_equal(expected['metadata']['climatology_period_index'],
+                               actual['metadata']['climatology_period_index'])
+
+    def test_matches_anomaly_of_every_year(self):
+        self._assert_same_anomaly()
+
+        self.assertTrue(os.path.exists(os.path.join(self.store_path,
+                                                    'climatology_N_03_1979-1990.npz')))
+
+    def test_matches_stored_anomaly(self):
+        self._anomaly(store=True)
+
+        self._assert_same_anomaly()
+
+    def test_reads_only_the_month_once_stored(self):
+        self._anomaly(store=True)
+        assert_equals([2001] + list(range(1979, 1991)), self._years_read())
+
+        self._anomaly(store=True)
+
+        assert_equals([2001], self._years_read())
+
+    def test_rebuilds_when_the_fingerprint_changes(self):
+        self._anomaly(store=True)
+        self._years_read()
+
+        self.fingerprint = 'changed'
+        self._anomaly(store=True)
+
+        assert_equals([2001] + list(range(1979, 1991)), self._years_read())
+
+    def test_ignores_unreadable_store(self):
+        with open(os.path.join(self.store_path, 'climatology_N_03_1979-1990.npz'), 'w') as fp:
+            fp.write('not a store')
+
+        self._assert_same_anomaly()
+
+    @raises(SeaIceDataNoData)
+    def test_stored_empty_climatology_raises_when_not_allowed(self):
+        self.missing_years = list(range(1979, 1991))
+        self._anomaly(store=True)
+
+        self._anomaly(store=True, allow_empty_gridset=False)
+
+
+class Test__period_index(unittest.TestCase):
+
+    def _round_trip(self, period_index):
+        return climatology_store._period_index([[str(period), period.freqstr]
+                                                for period in period_index])
+
+    def test_monthly(self):
+        period_index = pd.period_range('1980-01', periods=3, freq='M')
+
+        pdt.assert_index_equal(period_index, self._round_trip(period_index))
+
+    def test_empty(self):
+        period_index = pd.PeriodIndex([], freq='M')
+
+        pdt.assert_index_equal(period_index, self._round_trip(period_index))
+
+    def test_mixed(self):
+        period_index = pd.PeriodIndex(['1980-01'], freq='M').append(
+            pd.period_range('1981-01-01', periods=3, freq='D'))
+
+        pdt.assert_index_equal(period_index, self._round_trip(period_index))
+
+
+class Test__fingerprint(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.monthly_file = os.path.join(self.directory, 'nt_198003_n07_v01_n.bin')
+        self.daily_file = os.path.join(self.directory, 'nt_19800301_n07_v01_n.bin')
+        for filename in (self.monthly_file, self.daily_file):
+            with open(filename, 'wb') as fp:
+                fp.write(b'\x00' * 4)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _fingerprint(self, min_days_for_valid_month=20):
+        with patch('seaice.data.locator.monthly_file_path', return_value=self.monthly_file), \
+                patch('seaice.data.locator.all_daily_file_paths_for_month',
+                      return_value=[self.daily_file]), \
+                patch('seaice.nasateam.invalid_ice_mask',
+                      return_value=np.zeros(HEMISPHERE['shape'], dtype=bool)):
+            return climatology_store._fingerprint(HEMISPHERE, MONTH, 1980, 1980,
+                                                  [self.directory], min_days_for_valid_month)
+
+    def test_is_stable(self):
+        assert_equals(self._fingerprint(), self._fingerprint())
+
+    def test_changes_when_a_file_is_modified(self):
+        before = self._fingerprint()
+
+        st = os.stat(self.monthly_file)
+        os.utime(self.monthly_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+
+        self.assertNotEqual(before, self._fingerprint())
+
+    def test_changes_with_settings(self):
+        self.assertNotEqual(self._fingerprint(20), self._fingerprint(25))
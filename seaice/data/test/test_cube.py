@@ -76,3 +76,51 @@ class Test_apply_patch(unittest.TestCase):
 
         actual = c.apply_patch(d1, patch)
         npt.assert_array_equal(expected, actual)
+
+
+class Test_ExtentMedian(unittest.TestCase):
+    def _median_of_cube(self, cube):
+        ice_extent = np.median(np.where(cube > 1, 0, cube), axis=2) >= 0.5
+        ice_or_ocean = np.where(ice_extent, 1, 0)
+        always_land = np.all(np.in1d(cube, [254, 255, 253]).reshape(cube.shape), axis=2)
+        return np.where(always_land, 254, ice_or_ocean)
+
+    def test_matches_median_of_cube(self):
+        rng = np.random.RandomState(0)
+        for layers in (1, 2, 3, 4, 30, 31):
+            cube = rng.choice([0, 1, 251, 253, 254, 255], size=(10, 8, layers))
+            cube[0, :, :] = 254
+            cube[1, :, :] = rng.choice([253, 254, 255], size=(8, layers))
+
+            median = c.ExtentMedian(1, 0, 255, 254, 253)
+            median.add(cube)
+
+            npt.assert_array_equal(self._median_of_cube(cube), median.median())
+
+    def test_adding_grids_one_at_a_time(self):
+        cube = np.dstack([np.array([[1, 0], [254, 1]]),
+                          np.array([[1, 1], [255, 0]]),
+                          np.array([[0, 0], [253, 0]]),
+                          np.array([[0, 0], [254, 251]])])
+
+        median = c.ExtentMedian(1, 0, 255, 254, 253)
+        for layer in range(cube.shape[2]):
+            median.add(cube[:, :, layer])
+
+        expected = np.array([[1, 0],
+                             [254, 0]])
+
+        npt.assert_array_equal(expected, median.median())
+        self.assertEqual(4, median.layers)
+
+    def test_count_dtype(self):
+        rng = np.random.RandomState(1)
+        cube = rng.choice([0, 1, 254], size=(6, 5, 31))
+
+        expected = c.ExtentMedian(1, 0, 255, 254, 253)
+        expected.add(cube)
+        median = c.ExtentMedian(1, 0, 255, 254, 253, count_dtype=np.uint16)
+        for layer in range(cube.shape[2]):
+            median.add(cube[:, :, layer])
+
+        npt.assert_array_equal(expected.median(), median.median())
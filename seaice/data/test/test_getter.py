@@ -12,10 +12,12 @@ import pandas as pd
 import pandas.util.testing as pdt
 
 from seaice.data.errors import DateOutOfRangeError
+from seaice.data.errors import SeaIceDataValueError
 from seaice.data.errors import YearMonthOutOfRangeError
 import seaice.data.getter as getter
 import seaice.data.gridset_filters as gridset_filters
 import seaice.data.locator as locator
+from seaice.data.planes import ConcentrationPlanes
 from .util import mock_today
 import seaice.nasateam as nt
 
@@ -288,7 +290,8 @@ class Test_concentration_monthly(unittest.TestCase):
         day1_grid = np.ma.array([[10., 30.], [50., 60.]])
         day2_grid = np.ma.array([[20., 50.], [80., 100.]])
         getter._concentration_gridset_by_filelist.return_value = {
-            'data': np.ma.dstack([day1_grid, day2_grid]),
+            'data': ConcentrationPlanes.from_data(np.ma.dstack([day1_grid, day2_grid]),
+                                                  (0., 100.)),
             'metadata': {'missing_value': 255., 'valid_data_range': (0., 100.)}
         }
 
@@ -300,7 +303,7 @@ class Test_concentration_monthly(unittest.TestCase):
         actual = getter.concentration_monthly(hemisphere, year, month, search_paths)
         expected = np.ma.array([[15., 40.], [65., 80.]])
 
-        getter._concentration_gridset_by_filelist.assert_called_with(daily_files)
+        getter._concentration_gridset_by_filelist.assert_called_with(daily_files, planes=True)
         npt.assert_array_equal(expected, actual['data'])
 
     @patch('seaice.data.getter.empty_gridset')
@@ -617,7 +620,8 @@ class Test_concentration_seasonal_over_years(unittest.TestCase):
                 year,
                 months,
                 search_paths,
-                min_valid_days
+                min_valid_days,
+                monthly_gridsets=None
             )
 
     @patch('seaice.data.getter.concentration_seasonal')
@@ -755,6 +759,117 @@ class Test_concentration_seasonal_over_years(unittest.TestCase):
 
         self.assertEqual(actual['metadata'], expected_metadata)
 
+    @patch('seaice.data.getter.concentration_seasonal')
+    def test_planes_are_stacked(self, _mock_concentration_seasonal):
+        grids = [np.array([[10.1, 251.], [20., 254.]]),
+                 np.array([[30.2, 251.], [40., 254.]]),
+                 np.array([[50.05, 251.], [60., 255.]])]
+        getter.concentration_seasonal.side_effect = [
+            {'data': grid,
+             'metadata': {'files': [], 'valid_data_range': (0., 100.), 'flags': {},
+                          'missing_value': 255}}
+            for grid in grids
+        ]
+
+        actual = getter.concentration_seasonal_over_years(
+            nt.NORTH, 1980, 1982, (3, 4, 5), ['wherever'], 20, planes=True
+        )
+
+        expected = ConcentrationPlanes.stack(
+            [ConcentrationPlanes.from_data(grid, (0., 100.)) for grid in grids])
+        npt.assert_array_equal(actual['data'].to_data(), expected.to_data())
+        npt.assert_array_equal(actual['data'].flags, expected.flags)
+
+    @patch('seaice.data.getter.concentration_monthly')
+    def test_builds_shared_months_once(self, _mock_concentration_monthly):
+        getter.concentration_monthly.side_effect = lambda hemisphere, year, month, *args: {
+            'data': np.full((2, 2), month, dtype=np.float64),
+            'metadata': {'files': ['nt_{}{:02}_f08_v01_n.bin'.format(year, month)],
+                         'valid_data_range': (0., 100.),
+                         'flags': {},
+                         'missing_value': 255}
+        }
+        monthly_gridsets = getter.MonthlyGridsets()
+
+        winter = getter.concentration_seasonal_over_years(
+            nt.NORTH, 1981, 1982, (12, 1), ['wherever'], 20,
+            monthly_gridsets=monthly_gridsets
+        )
+        getter.concentration_seasonal_over_years(
+            nt.NORTH, 1981, 1982, (11, 12), ['wherever'], 20,
+            monthly_gridsets=monthly_gridsets
+        )
+
+        calls = [call[0][1:3] for call in getter.concentration_monthly.call_args_list]
+        assert_equals(sorted(calls), sorted(set(calls)))
+        assert_equals(6, len(calls))
+        npt.assert_array_equal(winter['data'], np.full((2, 2, 2), 6.5))
+        assert_equals([['nt_198012_f08_v01_n.bin'], ['nt_198101_f08_v01_n.bin']],
+                      winter['metadata']['files'][0])
+
+
+class Test_MonthlyGridsets(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = 0
+
+    def _concentration_monthly(self, hemisphere, year, month, search_paths, min_days):
+        self.calls += 1
+        return {'data': np.array([[year % 100 + month / 10., 253.], [33.3333, 255.]]),
+                'metadata': {'files': ['nt_{}{:02}_f08_v01_n.bin'.format(year, month)],
+                             'valid_data_range': (0., 100.)}}
+
+    def _get(self, monthly_gridsets, *args):
+        with patch('seaice.data.getter.concentration_monthly',
+                   side_effect=self._concentration_monthly):
+            return monthly_gridsets.get(*args)
+
+    def test_builds_each_gridset_once(self):
+        monthly_gridsets = getter.MonthlyGridsets()
+
+        first = self._get(monthly_gridsets, nt.NORTH, 1980, 1, ['wherever'], 20)
+        second = self._get(monthly_gridsets, nt.NORTH, 1980, 1, ['wherever'], 20)
+
+        assert_equals(1, self.calls)
+        expected = self._concentration_monthly(nt.NORTH, 1980, 1, ['wherever'], 20)
+        npt.assert_array_equal(expected['data'], first['data'])
+        npt.assert_array_equal(expected['data'], second['data'])
+        assert_equals(expected['metadata'], second['metadata'])
+
+    def test_keys_on_every_argument(self):
+        monthly_gridsets = getter.MonthlyGridsets()
+
+        self._get(monthly_gridsets, nt.NORTH, 1980, 1, ['wherever'], 20)
+        self._get(monthly_gridsets, nt.SOUTH, 1980, 1, ['wherever'], 20)
+        self._get(monthly_gridsets, nt.NORTH, 1981, 1, ['wherever'], 20)
+        self._get(monthly_gridsets, nt.NORTH, 1980, 2, ['wherever'], 20)
+        self._get(monthly_gridsets, nt.NORTH, 1980, 1, ['elsewhere'], 20)
+        self._get(monthly_gridsets, nt.NORTH, 1980, 1, ['wherever'], 15)
+
+        assert_equals(6, self.calls)
+        assert_equals(6, len(monthly_gridsets))
+
+    def test_returns_new_arrays(self):
+        monthly_gridsets = getter.MonthlyGridsets()
+
+        first = self._get(monthly_gridsets, nt.NORTH, 1980, 1, ['wherever'], 20)
+        first['data'][:] = 0
+        first['metadata']['files'].append('another')
+
+        second = self._get(monthly_gridsets, nt.NORTH, 1980, 1, ['wherever'], 20)
+        assert_equals(80.1, second['data'][0, 0])
+        assert_equals(['nt_198001_f08_v01_n.bin'], second['metadata']['files'])
+
+    def test_keeps_only_given_months(self):
+        monthly_gridsets = getter.MonthlyGridsets(months=[12])
+
+        for _ in range(2):
+            self._get(monthly_gridsets, nt.NORTH, 1980, 11, ['wherever'], 20)
+            self._get(monthly_gridsets, nt.NORTH, 1980, 12, ['wherever'], 20)
+
+        assert_equals(3, self.calls)
+        assert_equals(1, len(monthly_gridsets))
+
 
 class Test_extent_daily_median(unittest.TestCase):
     @patch('seaice.datastore.get_bad_days_for_hemisphere')
@@ -872,6 +987,76 @@ class Test_extent_daily_median(unittest.TestCase):
             pdt.assert_index_equal(expected, actual['metadata']['period_index'][index])
 
 
+class Test_extent_daily_median_climatology(unittest.TestCase):
+
+    def setUp(self):
+        self.dates_read = []
+
+    def _concentration_daily(self, hemisphere, date, search_paths, interpolation_radius):
+        self.dates_read.append(date)
+
+        rng = np.random.RandomState(date.toordinal())
+        data = rng.choice([0., 10., 20., 60., 90., 100., 253., 254., 255.], size=(3, 4))
+        return {'data': data,
+                'metadata': {'period': pd.Period(date, freq='D'),
+                             'temporality': 'D',
+                             'period_index': pd.period_range(date, periods=1, freq='D'),
+                             'valid_data_range': (0., 100.),
+                             'flags': {'coast': 253, 'land': 254},
+                             'missing_value': 255,
+                             'hemi': 'N',
+                             'files': ['nt_{:%Y%m%d}_f08_v01_n.bin'.format(date)]}}
+
+    def _patched(self, function, *args, **kwargs):
+        with patch('seaice.datastore.get_bad_days_for_hemisphere', return_value=[]), \
+                patch('seaice.data.getter.concentration_daily',
+                      side_effect=self._concentration_daily):
+            return function(*args, **kwargs)
+
+    def _medians(self, start_year, end_year, **kwargs):
+        return self._patched(lambda: list(getter.extent_daily_median_climatology(
+            nt.NORTH, start_year, end_year, search_paths=['wherever'], **kwargs)))
+
+    def _dates_read(self):
+        dates, self.dates_read = self.dates_read, []
+        return dates
+
+    def test_matches_median_of_every_dayofyear(self):
+        actual = self._medians(1980, 1981)
+
+        assert_equals(list(range(1, 367)), [dayofyear for dayofyear, _ in actual])
+        for dayofyear, gridset in actual:
+            expected = self._patched(getter.extent_daily_median, nt.NORTH, 1980, 1981,
+                                     dayofyear, search_paths=['wherever'])
+
+            npt.assert_array_equal(expected['data'], gridset['data'])
+            for key in ('files', 'dayofyear', 'years', 'valid_data_range', 'flags',
+                        'missing_value'):
+                assert_equals(expected['metadata'][key], gridset['metadata'][key])
+            for expected_index, actual_index in zip(expected['metadata']['period_index'],
+                                                    gridset['metadata']['period_index']):
+                pdt.assert_index_equal(expected_index, actual_index)
+
+    def test_reads_each_day_once_in_order(self):
+        self._medians(1980, 1982)
+
+        dates = self._dates_read()
+        assert_equals(sorted(set(dates)), dates)
+        assert_equals(dt.date(1980, 1, 1), dates[0])
+        assert_equals(dt.date(1983, 1, 1), dates[-1])
+        assert_equals(366 + 365 + 365 + 1, len(dates))
+
+    def test_first_day_of_year_counts_for_dayofyear_366_of_year_before(self):
+        medians = dict(self._medians(1980, 1982, dayofyears=[1, 366]))
+
+        assert_equals([1980, 1982, 1983], medians[366]['metadata']['years'])
+        assert_equals([['nt_19801231_f08_v01_n.bin'],
+                       ['nt_19820101_f08_v01_n.bin'],
+                       ['nt_19830101_f08_v01_n.bin']], medians[366]['metadata']['files'])
+        assert_equals([1980, 1981, 1982], medians[1]['metadata']['years'])
+        assert_equals(5, len(self._dates_read()))
+
+
 class Test_extent_monthly_median(unittest.TestCase):
 
     @patch('seaice.data.getter.concentration_monthly')
@@ -992,6 +1177,37 @@ class Test__concentration_gridset_by_filelist(unittest.TestCase):
         pdt.assert_index_equal(actual['metadata']['period_index'],
                                pd.PeriodIndex(['2001-01-07'], freq='D'))
 
+    def test_mmap_reader_matches_default_reader(self):
+        file_list = [SOUTH_DAILY_FILE, SOUTH_DAILY_FILE]
+
+        expected = getter._concentration_gridset_by_filelist(file_list)
+        actual = getter._concentration_gridset_by_filelist(file_list, reader='mmap')
+
+        npt.assert_array_equal(actual['data'], expected['data'])
+        npt.assert_array_equal(actual['data'].mask, expected['data'].mask)
+        assert_equals(actual['data'].dtype, expected['data'].dtype)
+
+    @raises(SeaIceDataValueError)
+    def test_unknown_reader_raises(self):
+        getter._concentration_gridset_by_filelist([NORTH_DAILY_FILE], reader='fake')
+
+
+class Test__read_goddard_nasateam_file_mmap(unittest.TestCase):
+
+    def test_matches_fromfile(self):
+        expected = getter._read_goddard_nasateam_file(NORTH_DAILY_FILE)
+
+        actual = getter._read_goddard_nasateam_file_mmap(NORTH_DAILY_FILE)
+
+        npt.assert_array_equal(actual, expected)
+        assert_equals(actual.dtype, np.uint8)
+        assert_equals(actual.shape, (448, 304))
+
+    def test_is_read_only(self):
+        actual = getter._read_goddard_nasateam_file_mmap(NORTH_DAILY_FILE)
+
+        self.assertFalse(actual.flags.writeable)
+
 
 class Test__concentration_average_gridset_from_daily_filelist(unittest.TestCase):
 
@@ -1002,8 +1218,8 @@ class Test__concentration_average_gridset_from_daily_filelist(unittest.TestCase)
                             [30, 40]])
 
         cube = np.ma.dstack((grid, grid, grid))
-        gridset = {'data': cube, 'metadata': {'missing_value': 255.,
-                                              'valid_data_range': (0., 100.)}}
+        gridset = {'data': ConcentrationPlanes.from_data(cube, (0., 100.)),
+                   'metadata': {'missing_value': 255., 'valid_data_range': (0., 100.)}}
         mocked_concentration_gridset_by_filelist.return_value = gridset
 
         expected = copy.deepcopy(grid)
@@ -1023,8 +1239,8 @@ class Test__concentration_average_gridset_from_daily_filelist(unittest.TestCase)
                              [30, 40]])
 
         cube = np.ma.dstack((grid, grid2, grid))
-        gridset = {'data': cube, 'metadata': {'missing_value': 255.,
-                                              'valid_data_range': (0., 100.)}}
+        gridset = {'data': ConcentrationPlanes.from_data(cube, (0., 100.)),
+                   'metadata': {'missing_value': 255., 'valid_data_range': (0., 100.)}}
         mocked_concentration_gridset_by_filelist.return_value = gridset
 
         expected = copy.deepcopy(grid)
@@ -1044,8 +1260,8 @@ class Test__concentration_average_gridset_from_daily_filelist(unittest.TestCase)
                           [30, 40]])
 
         cube = np.ma.dstack((grid, grid2, grid))
-        gridset = {'data': cube, 'metadata': {'missing_value': 255.,
-                                              'valid_data_range': (0., 100.)}}
+        gridset = {'data': ConcentrationPlanes.from_data(cube, (0., 100.)),
+                   'metadata': {'missing_value': 255., 'valid_data_range': (0., 100.)}}
         mocked_concentration_gridset_by_filelist.return_value = gridset
 
         expected = np.array([[255, 20],
@@ -1066,8 +1282,8 @@ class Test__concentration_average_gridset_from_daily_filelist(unittest.TestCase)
                           [30, 40]])
 
         cube = np.ma.dstack((grid, grid2, grid))
-        gridset = {'data': cube, 'metadata': {'missing_value': 255.,
-                                              'valid_data_range': (0., 100.)}}
+        gridset = {'data': ConcentrationPlanes.from_data(cube, (0., 100.)),
+                   'metadata': {'missing_value': 255., 'valid_data_range': (0., 100.)}}
         mocked_concentration_gridset_by_filelist.return_value = gridset
 
         expected = np.array([[255, 20],
@@ -1078,6 +1294,24 @@ class Test__concentration_average_gridset_from_daily_filelist(unittest.TestCase)
         npt.assert_array_equal(expected, actual['data'])
         npt.assert_array_equal(expected.data, actual['data'].data)
 
+    @patch('seaice.data.getter._concentration_gridset_by_filelist')
+    def test_averages_raw_concentrations(self, mocked_concentration_gridset_by_filelist):
+        cube = np.dstack(([[20.4, 251.], [0., 100.]],
+                          [[20.8, 251.], [0.4, 100.]],
+                          [[255., 255.], [255., 99.6]]))
+        gridset = {'data': ConcentrationPlanes.from_data(cube, (0., 100.)),
+                   'metadata': {'missing_value': 255., 'valid_data_range': (0., 100.)}}
+        mocked_concentration_gridset_by_filelist.return_value = gridset
+
+        expected = np.array([[103 / 5, 255.],
+                             [1 / 5, 749 / 7.5]])
+
+        actual = getter._concentration_average_gridset_from_daily_filelist(['file_list'])
+
+        mocked_concentration_gridset_by_filelist.assert_called_with(['file_list'], planes=True)
+        npt.assert_array_equal(expected, actual['data'])
+        assert_equals(np.float64, actual['data'].dtype)
+
 
 class Test_double_weight_smmr_files(unittest.TestCase):
     def test_does_not_affect_non_n07(self):
@@ -1441,6 +1675,54 @@ class Test__flag_layer_from_cube(unittest.TestCase):
         npt.assert_array_equal(expected, actual)
         npt.assert_array_equal(expected.mask, actual.mask)
 
+    def test_fully_masked_layer_is_not_skipped(self):
+        grid1 = np.ma.array([[251, 255],
+                             [255, 255]],
+                            mask=[[False, True],
+                                  [True, True]])
+
+        grid2 = np.ma.array([[251, 255],
+                             [255, 255]],
+                            mask=[[True, True],
+                                  [True, True]])
+
+        flag_cube = np.ma.dstack([grid1, grid2])
+
+        actual = getter.flag_layer_from_cube(flag_cube, missing_value=255)
+
+        npt.assert_array_equal([[True, True], [True, True]], actual.mask)
+
+    def test_matches_layer_by_layer_reduction(self):
+        def by_layer(flag_cube, missing_value):
+            flag_layer = flag_cube[:, :, 0]
+            for i in range(flag_cube.shape[2]):
+                if not np.all(flag_cube[:, :, i] == missing_value):
+                    flag_layer = flag_cube[:, :, i].copy()
+                    break
+
+            for i in range(flag_cube.shape[2]):
+                if np.all(flag_cube[:, :, i] == missing_value):
+                    continue
+                match = (flag_layer == flag_cube[:, :, i]).filled(False)
+                flag_layer = np.ma.array(flag_layer, mask=~match)
+
+            return flag_layer
+
+        rng = np.random.RandomState(0)
+        for layers in (1, 2, 5, 31):
+            data = rng.choice([251., 253., 254., 255.], p=[.7, .1, .1, .1], size=(8, 6, layers))
+            mask = rng.random_sample(data.shape) < .3
+            data[:, :, ::3] = 255.
+            mask[:, :, 1::4] = True
+            flag_cube = np.ma.array(data, mask=mask)
+
+            for missing_value in (255., np.nan):
+                expected = by_layer(flag_cube, missing_value)
+                actual = getter.flag_layer_from_cube(flag_cube, missing_value)
+
+                npt.assert_array_equal(expected.mask, actual.mask)
+                npt.assert_array_equal(expected.compressed(), actual.compressed())
+
 
 class Test__rows_columns_from_goddard_nasateam_header(unittest.TestCase):
 
@@ -1461,6 +1743,60 @@ class Test__scale_valid_data(unittest.TestCase):
         npt.assert_array_equal(expected, actual)
 
 
+class Test__load_concentration_cube(unittest.TestCase):
+
+    def _expected(self, file_list):
+        data_cube = np.ma.dstack([getter._read_goddard_nasateam_file(f) for f in file_list])
+        return getter._scale_valid_data(data_cube, nt.VALID_DATA_RANGE, nt.SCALE)
+
+    def test_matches_scaled_dstack(self):
+        file_list = [NORTH_DAILY_FILE, NORTH_DAILY_FILE, NORTH_DAILY_FILE]
+
+        actual = getter._load_concentration_cube(file_list)
+
+        npt.assert_array_equal(actual, self._expected(file_list))
+        assert_equals(actual.dtype, np.float64)
+        assert_equals(actual.shape, (448, 304, 3))
+
+    @patch('seaice.nasateam.DECODED_GRID_CACHE_BYTES', 0)
+    def test_layers_are_in_file_list_order(self):
+        grids = {'a': np.array([[0, 100], [250, 255]], dtype=np.uint8),
+                 'b': np.array([[251, 252], [253, 254]], dtype=np.uint8),
+                 'c': np.array([[5, 10], [249, 1]], dtype=np.uint8)}
+        file_list = ['c', 'a', 'b', 'a']
+
+        with patch.dict(getter.GODDARD_NASATEAM_READERS, {'fromfile': grids.get}):
+            actual = getter._load_concentration_cube(file_list, reader='fromfile')
+
+        expected = getter._scale_valid_data(np.ma.dstack([grids[f] for f in file_list]),
+                                            nt.VALID_DATA_RANGE, nt.SCALE)
+        npt.assert_array_equal(actual, expected)
+
+    @patch('seaice.nasateam.DECODED_GRID_CACHE_BYTES', 0)
+    def test_scales_every_possible_value_like_scale_valid_data(self):
+        values = np.arange(256, dtype=np.uint8).reshape(16, 16)
+
+        with patch.dict(getter.GODDARD_NASATEAM_READERS, {'fromfile': lambda f: values}):
+            actual = getter._load_concentration_cube(['x'], reader='fromfile')
+
+        expected = getter._scale_valid_data(values, nt.VALID_DATA_RANGE, nt.SCALE)
+        npt.assert_array_equal(actual[:, :, 0], expected)
+
+    @raises(SeaIceDataValueError)
+    def test_raises_on_mismatched_shapes(self):
+        getter._load_concentration_cube([NORTH_DAILY_FILE, SOUTH_DAILY_FILE])
+
+    def test_planes_hold_the_same_data(self):
+        file_list = [NORTH_DAILY_FILE, NORTH_DAILY_FILE]
+
+        actual = getter._load_concentration_cube(file_list, planes=True)
+
+        npt.assert_array_equal(actual.to_data(), self._expected(file_list))
+        assert_equals(actual.concentration.dtype, np.uint8)
+        assert_equals(actual.flags.dtype, np.uint8)
+        assert_equals(actual.nbytes * 4, self._expected(file_list).data.nbytes)
+
+
 class Test_concentration_monthly_over_years(unittest.TestCase):
     monthly_stub = {'data': np.zeros(nt.NORTH['shape']),
                     'metadata': {'files': [],
@@ -1501,6 +1837,19 @@ class Test_concentration_monthly_over_years(unittest.TestCase):
         expected = (rows, cols, 3)
         assert_equals(expected, actual['data'].shape)
 
+    @patch('seaice.data.getter.concentration_monthly')
+    def test_monthly_over_years_planes(self, mock_monthly):
+        monthly = copy.deepcopy(self.monthly_stub)
+        monthly['data'] = np.full(nt.NORTH['shape'], 10.)
+        monthly['data'][0, 0] = nt.FLAGS['pole']
+        mock_monthly.return_value = monthly
+
+        actual = getter.concentration_monthly_over_years(nt.NORTH, 1981, 1983, 1,
+                                                         search_paths=TEST_DATA, planes=True)
+
+        assert_equals(np.uint8, actual['data'].concentration.dtype)
+        npt.assert_array_equal(np.dstack([monthly['data']] * 3), actual['data'].to_data())
+
     @patch('seaice.data.getter.concentration_monthly')
     def test_monthly_over_years_metadata(self, mock_monthly):
         hemi = nt.NORTH
@@ -0,0 +1,105 @@
+import copy
+import pickle
+import unittest
+
+from nose.tools import assert_equals, assert_true, assert_false
+import numpy as np
+import numpy.testing as npt
+
+from seaice.data.gridset import Gridset, copy_on_write
+import seaice.data.gridset_filters as gf
+import seaice.nasateam as nt
+
+
+def _gridset():
+    return {'data': np.array([[[1., 254.], [253., 50.]],
+                              [[251., 20.], [0., 100.]]]),
+            'metadata': {'flags': {'pole': 251, 'land': 254, 'coast': 253},
+                         'missing_value': 255,
+                         'valid_data_range': (0., 100.)}}
+
+
+class Test_copy_on_write(unittest.TestCase):
+
+    def test_shares_data_and_copies_metadata(self):
+        gridset = _gridset()
+
+        actual = copy_on_write(gridset)
+
+        assert_true(isinstance(actual, Gridset))
+        assert_true(actual['data'] is gridset['data'])
+        assert_true(actual.shares_data)
+        assert_false(actual['metadata'] is gridset['metadata'])
+        assert_equals(gridset['metadata'], actual['metadata'])
+
+    def test_writable_data_copies_shared_data_once(self):
+        gridset = _gridset()
+        original = gridset['data'].copy()
+        actual = copy_on_write(gridset)
+
+        data = actual.writable_data()
+        data[0, 0, 0] = 99
+
+        assert_false(actual.shares_data)
+        assert_true(actual.writable_data() is data)
+        npt.assert_array_equal(original, gridset['data'])
+
+    def test_copies_of_a_gridset_both_copy_before_writing(self):
+        gridset = Gridset(_gridset())
+        data = gridset['data']
+
+        actual = gridset.copy()
+        gridset.writable_data()[0, 0, 0] = 99
+
+        assert_true(actual['data'] is data)
+        assert_equals(1., actual['data'][0, 0, 0])
+
+    def test_assigned_data_is_not_shared(self):
+        actual = copy_on_write(_gridset())
+
+        actual['data'] = np.zeros((2, 2))
+
+        assert_false(actual.shares_data)
+
+    def test_deepcopy_and_pickle(self):
+        gridset = copy_on_write(_gridset())
+
+        for actual in (copy.deepcopy(gridset), pickle.loads(pickle.dumps(gridset))):
+            assert_true(isinstance(actual, Gridset))
+            npt.assert_array_equal(gridset['data'], actual['data'])
+            assert_equals(gridset['metadata'], actual['metadata'])
+
+
+class Test_filters_share_unchanged_data(unittest.TestCase):
+
+    def test_filters_do_not_change_their_input(self):
+        gridset = _gridset()
+        original = gridset['data'].copy()
+
+        gf.drop_land(nt.FLAGS['land'], nt.FLAGS['coast'], gridset)
+        gf.apply_largest_pole_hole(gridset)
+
+        npt.assert_array_equal(original, gridset['data'])
+
+    def test_filters_that_do_not_change_data_share_it(self):
+        gridset = _gridset()
+        gridset['metadata']['temporality'] = 'M'
+
+        actual = gf.drop_bad_dates(gridset)
+
+        assert_true(actual['data'] is gridset['data'])
+
+    def test_filters_that_change_data_do_not_share_it(self):
+        gridset = _gridset()
+
+        actual = gf.concentration_cutoff(15, gridset)
+
+        assert_false(np.may_share_memory(gridset['data'], actual['data']))
+
+    def test_apply_filters_result_never_shares_input_data(self):
+        gridset = _gridset()
+
+        actual = gf.apply_filters(gridset, [gf.prevent_empty])
+
+        npt.assert_array_equal(gridset['data'], actual['data'])
+        assert_false(np.may_share_memory(gridset['data'], actual['data']))
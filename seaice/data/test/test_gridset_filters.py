@@ -1,4 +1,6 @@
 import datetime as dt
+import functools
+import os
 import unittest
 from unittest.mock import patch
 
@@ -7,6 +9,7 @@ import numpy.testing as npt
 import pandas as pd
 import pandas.util.testing as pdt
 
+import seaice.data.getter as getter
 import seaice.data.gridset_filters as gf
 from seaice.data.gridset_filters import apply_largest_pole_hole
 from seaice.data.gridset_filters import concentration_cutoff
@@ -21,6 +24,9 @@ import seaice.nasateam as nt
 LAND = nt.FLAGS['land']
 COAST = nt.FLAGS['coast']
 
+TEST_DATA = os.path.join(os.path.dirname(__file__),
+                         os.path.pardir, os.path.pardir, os.path.pardir, 'test_data')
+
 
 class Test_apply_largest_pole_hole(unittest.TestCase):
     def test_no_pole_hole(self):
@@ -854,3 +860,201 @@ class Test__extent_grid_from_conc_grid(unittest.TestCase):
                              [255, 255]])
 
         npt.assert_array_equal(actual, expected)
+
+
+class Test_trend_filters_match_layer_by_layer_filters(unittest.TestCase):
+    """drop_invalid_ice and apply_largest_pole_hole as they were written before
+    they broadcast the invalid ice mask, compared on a stack of monthly grids
+    like the one trend_gridset filters."""
+
+    @staticmethod
+    def _drop_invalid_ice_by_layer(invalid_ice_mask, gridset):
+        data = gridset['data']
+        missing_value = gridset['metadata']['missing_value']
+
+        if np.all(data == missing_value):
+            return data
+
+        if invalid_ice_mask.shape != data.shape:
+            layers = data.shape[2]
+            invalid_ice_mask = np.dstack([invalid_ice_mask] * layers)
+
+            for layer in np.arange(layers):
+                if np.all(data[:, :, layer] == missing_value):
+                    invalid_ice_mask[:, :, layer] = False
+
+        flagged = np.ma.masked_outside(data, *gridset['metadata']['valid_data_range'])
+        missing = np.ma.masked_equal(data, missing_value)
+        not_flagged = ~flagged.mask | missing.mask
+
+        return np.where(invalid_ice_mask & not_flagged, 0, data)
+
+    @staticmethod
+    def _apply_largest_pole_hole_by_layer(gridset):
+        data = gridset['data'].copy()
+        pole_hole = gridset['metadata']['flags']['pole']
+
+        largest_pole_hole = np.any(data == pole_hole, axis=2)
+        for i in np.arange(data.shape[2]):
+            if np.all(data[:, :, i] == gridset['metadata']['missing_value']):
+                continue
+            data[largest_pole_hole, i] = pole_hole
+
+        return data
+
+    def setUp(self):
+        monthly_files = [os.path.join(TEST_DATA, 'seaice.data', 'nt_200101_f13_v01_n.bin'),
+                         os.path.join(TEST_DATA, 'sedna', 'nt_201301_f17_v1.1_n.bin'),
+                         os.path.join(TEST_DATA, 'sedna', 'nt_201305_f17_v1.1_n.bin'),
+                         os.path.join(TEST_DATA, 'sedna', 'nt_201306_f17_v1.1_n.bin')]
+        gridset = getter._concentration_gridset_by_filelist(monthly_files)
+
+        missing = np.full(nt.NORTH['shape'] + (1,), nt.FLAGS['missing'])
+        data = np.ma.dstack([gridset['data'][:, :, 0:2], missing, gridset['data'][:, :, 2:]])
+        self.gridset = {'data': data, 'metadata': gridset['metadata']}
+
+        self.invalid_ice_mask = nt.invalid_ice_mask(nt.NORTH, 1)
+
+    def test_drop_invalid_ice(self):
+        expected = self._drop_invalid_ice_by_layer(self.invalid_ice_mask, self.gridset)
+
+        actual = drop_invalid_ice(self.invalid_ice_mask, self.gridset)
+
+        self.assertIs(type(expected), type(actual['data']))
+        npt.assert_array_equal(expected, actual['data'])
+
+    def test_drop_invalid_ice_with_masked_values(self):
+        self.gridset['data'] = np.ma.masked_greater(self.gridset['data'], 99.)
+
+        expected = self._drop_invalid_ice_by_layer(self.invalid_ice_mask, self.gridset)
+
+        actual = drop_invalid_ice(self.invalid_ice_mask, self.gridset)
+
+        npt.assert_array_equal(expected, actual['data'])
+
+    def test_apply_largest_pole_hole(self):
+        expected = self._apply_largest_pole_hole_by_layer(self.gridset)
+
+        actual = apply_largest_pole_hole(self.gridset)
+
+        npt.assert_array_equal(expected, actual['data'])
+        npt.assert_array_equal(np.ma.getmaskarray(expected), np.ma.getmaskarray(actual['data']))
+
+    def test_apply_largest_pole_hole_with_masked_values(self):
+        self.gridset['data'] = np.ma.masked_inside(self.gridset['data'], 50., 60.)
+
+        expected = self._apply_largest_pole_hole_by_layer(self.gridset)
+
+        actual = apply_largest_pole_hole(self.gridset)
+
+        npt.assert_array_equal(expected.data, actual['data'].data)
+        npt.assert_array_equal(expected.mask, actual['data'].mask)
+
+    def test_trend_filters(self):
+        expected = self._apply_largest_pole_hole_by_layer({
+            'data': self._drop_invalid_ice_by_layer(self.invalid_ice_mask, self.gridset),
+            'metadata': self.gridset['metadata']})
+
+        actual = gf.apply_filters(self.gridset, [
+            functools.partial(drop_invalid_ice, self.invalid_ice_mask),
+            apply_largest_pole_hole])
+
+        npt.assert_array_equal(expected, actual['data'])
+
+
+class Test_apply_filters_extent_chain(unittest.TestCase):
+    """apply_filters applies drop_land, drop_invalid_ice, concentration_to_extent
+    and prevent_empty in one pass, with the same result as applying them one
+    after another."""
+
+    def setUp(self):
+        data = np.array([[[10., 80.], [LAND, 255.]],
+                         [[COAST, 251.], [90., 255.]],
+                         [[14., 15.], [255., 255.]]])
+        self.gridset = {
+            'data': data,
+            'metadata': {'missing_value': 255.,
+                         'valid_data_range': (0., 100.),
+                         'flags': {'pole': 251., 'land': LAND, 'coast': COAST}}
+        }
+        self.invalid_ice_mask = np.array([[True, False],
+                                          [False, False],
+                                          [True, True]])
+
+    def _filters(self, extent_threshold=15):
+        return [functools.partial(drop_land, LAND, COAST),
+                functools.partial(drop_invalid_ice, self.invalid_ice_mask),
+                functools.partial(gf.concentration_to_extent, extent_threshold),
+                prevent_empty]
+
+    def assert_same_result(self, filters):
+        expected = functools.reduce(lambda gridset, filter_: filter_(gridset), filters,
+                                    self.gridset)
+        actual = gf.apply_filters(self.gridset, filters)
+
+        self.assertIs(type(expected['data']), type(actual['data']))
+        self.assertEqual(expected['data'].dtype, actual['data'].dtype)
+        npt.assert_array_equal(np.ma.getmaskarray(expected['data']),
+                               np.ma.getmaskarray(actual['data']))
+        npt.assert_array_equal(expected['data'], actual['data'])
+        self.assertEqual(expected['metadata'], actual['metadata'])
+
+    def test_fuses_the_extent_chain(self):
+        filters = [functools.partial(drop_land, LAND, COAST), drop_bad_dates] + \
+            self._filters()[1:] + [ensure_full_nrt_month]
+
+        actual = gf._fuse_extent_filters(filters)
+
+        self.assertEqual(filters[0:2], actual[0:2])
+        self.assertIsInstance(actual[2], gf.ExtentFilters)
+        self.assertEqual(filters[2:5], actual[2].filters)
+        self.assertEqual(filters[5:], actual[3:])
+
+    def test_keeps_other_filters(self):
+        filters = [functools.partial(drop_land, LAND, COAST),
+                   functools.partial(drop_invalid_ice, self.invalid_ice_mask),
+                   prevent_empty]
+
+        self.assertEqual(filters, gf._fuse_extent_filters(filters))
+
+    def test_extent_filters(self):
+        self.assert_same_result(self._filters())
+
+    def test_extent_filters_without_drop_land(self):
+        self.assert_same_result(self._filters()[1:])
+
+    def test_extent_threshold_of_zero(self):
+        self.assert_same_result(self._filters(extent_threshold=0))
+
+    def test_extent_filters_with_masked_array(self):
+        self.gridset['data'] = np.ma.array(self.gridset['data'])
+
+        self.assert_same_result(self._filters())
+
+    def test_extent_filters_with_masked_values(self):
+        self.gridset['data'] = np.ma.masked_equal(self.gridset['data'], 14.)
+
+        self.assert_same_result(self._filters())
+
+    def test_extent_filters_with_2d_data(self):
+        self.gridset['data'] = self.gridset['data'][:, :, 0]
+
+        self.assert_same_result(self._filters())
+
+    def test_extent_filters_with_all_missing_data(self):
+        self.gridset['data'] = np.ma.array(np.full((3, 2, 2), 255.))
+
+        self.assert_same_result(self._filters()[:-1])
+
+    def test_does_not_modify_input(self):
+        expected = self.gridset['data'].copy()
+
+        gf.apply_filters(self.gridset, self._filters())
+
+        npt.assert_array_equal(expected, self.gridset['data'])
+
+    def test_raises_error_with_all_missing_data(self):
+        self.gridset['data'] = np.full((3, 2, 2), 255.)
+
+        with self.assertRaises(e.SeaIceDataNoData):
+            gf.apply_filters(self.gridset, self._filters())
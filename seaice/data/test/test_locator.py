@@ -5,6 +5,7 @@ from nose.tools import assert_equals
 import datetime as dt
 import numpy as np
 import pandas as pd
+import pandas.util.testing as pdt
 
 import seaice.data.locator as locator
 import seaice.nasateam as nt
@@ -337,6 +338,30 @@ class Test__filter_by_preferred_platform_dates(unittest.TestCase):
 
         np.testing.assert_array_equal(expected, actual)
 
+    def test_filter_monthly_uses_platform_on_the_15th(self):
+        data_frame = locator._get_monthly_filename_data_frame(('nt_198708_f08_v01_n.bin',
+                                                               'nt_198708_n07_v01_n.bin',
+                                                               'nt_198709_f08_v01_n.bin',
+                                                               'nt_198709_n07_v01_n.bin'), 'N')
+
+        expected = ['nt_198708_n07_v01_n.bin', 'nt_198709_f08_v01_n.bin']
+
+        actual = list(locator._filter_by_preferred_platform_dates(data_frame).filename)
+
+        assert_equals(expected, actual)
+
+    def test_filter_daily_at_platform_boundary(self):
+        data_frame = locator._get_daily_filename_data_frame(('nt_19870820_f08_v01_s.bin',
+                                                             'nt_19870820_n07_v01_s.bin',
+                                                             'nt_19870821_f08_v01_s.bin',
+                                                             'nt_19870821_n07_v01_s.bin'), 'S')
+
+        expected = ['nt_19870820_n07_v01_s.bin', 'nt_19870821_f08_v01_s.bin']
+
+        actual = list(locator._filter_by_preferred_platform_dates(data_frame).filename)
+
+        assert_equals(expected, actual)
+
     def test_filter_does_not_use_unkown_platform_when_only_choice(self):
 
         data_frame = locator._get_daily_filename_data_frame(('nt_20071228_f00_v01_n.bin',), 'N')
@@ -485,6 +510,130 @@ class Test__get_daily_filename_data_frame(unittest.TestCase):
         assert_equals(str(actual_frame.index[0]), expected_first_index)
 
 
+class Test__get_filename_tables(unittest.TestCase):
+
+    files = ('/anyroot/README',
+             '/anyroot/nt_201208_f17_v1.1_s.bin',
+             '/anyroot/nt_20120919_f17_nrt_n.bin',
+             '/anyroot/nt_20120919_f17_nrt_s.bin',
+             '/anyroot/nt_20120920_f17_nrt_n.bin')
+
+    def setUp(self):
+        locator._get_filename_tables.cache_clear()
+
+    def test_tables_for_each_hemisphere_and_temporality(self):
+        tables = locator._get_filename_tables(self.files)
+
+        assert_equals(['/anyroot/nt_20120919_f17_nrt_n.bin', '/anyroot/nt_20120920_f17_nrt_n.bin'],
+                      list(tables[('D', 'N')].filename))
+        assert_equals(['/anyroot/nt_20120919_f17_nrt_s.bin'], list(tables[('D', 'S')].filename))
+        assert_equals([], list(tables[('M', 'N')].filename))
+        assert_equals(['/anyroot/nt_201208_f17_v1.1_s.bin'], list(tables[('M', 'S')].filename))
+        pdt.assert_index_equal(pd.PeriodIndex(['2012-08'], freq='M'), tables[('M', 'S')].index)
+
+    def test_columns_are_categorical(self):
+        table = locator._get_filename_tables(self.files)[('D', 'N')]
+
+        for column in ('platform', 'version', 'hemisphere'):
+            assert_equals('category', table[column].dtype.name)
+
+    def test_filenames_are_parsed_once_for_every_lookup(self):
+        with patch('seaice.data.locator._parse_filenames',
+                   wraps=locator._parse_filenames) as mock_parse:
+            for hemi in ('N', 'S'):
+                locator._get_daily_filename_data_frame(self.files, hemi)
+                locator._get_monthly_filename_data_frame(self.files, hemi)
+
+        assert_equals(1, mock_parse.call_count)
+
+
+class Test__daily_file_paths_in_period_index(unittest.TestCase):
+
+    files = ['/anyroot/nt_20120918_f17_v1.1_n.bin',
+             '/anyroot/nt_20120919_f17_v1.1_n.bin',
+             '/anyroot/nt_20120920_f17_v1.1_n.bin',
+             '/anyroot/nt_20120921_f17_v1.1_n.bin',
+             '/anyroot/nt_20120921_f13_v1.1_n.bin']
+
+    @patch('seaice.data.locator._find_all_nasateam_ice_files')
+    def test_contiguous_range(self, mock_find):
+        mock_find.return_value = self.files
+        period_index = pd.period_range('2012-09-19', '2012-09-30', freq='D')
+
+        actual = locator._daily_file_paths_in_period_index(nt.NORTH, period_index, ['empty'])
+
+        assert_equals(self.files[1:4], actual)
+
+    @patch('seaice.data.locator._find_all_nasateam_ice_files')
+    def test_non_contiguous_dates(self, mock_find):
+        mock_find.return_value = self.files
+        period_index = pd.PeriodIndex(['2012-09-21', '2012-09-18'], freq='D')
+
+        actual = locator._daily_file_paths_in_period_index(nt.NORTH, period_index, ['empty'])
+
+        assert_equals([self.files[0], self.files[3]], actual)
+
+    @patch('seaice.data.locator._find_all_nasateam_ice_files')
+    def test_no_dates(self, mock_find):
+        mock_find.return_value = self.files
+
+        actual = locator._daily_file_paths_in_period_index(nt.NORTH, pd.PeriodIndex([], freq='D'),
+                                                           ['empty'])
+
+        assert_equals([], actual)
+
+
+class Test__get_authoritative_daily_tables(unittest.TestCase):
+
+    files = ('/anyroot/nt_20160212_f17_nrt_n.bin',
+             '/anyroot/nt_20160212_f17_v1.1_n.bin',
+             '/anyroot/nt_20160213_f17_nrt_n.bin',
+             '/anyroot/nt_20160213_f17_v1.1_n.bin',
+             '/anyroot/nt_20160214_f17_nrt_n.bin',
+             '/anyroot/nt_20160214_f17_v1.1_n.bin',
+             '/anyroot/nt_20160214_f17_v1.1_s.bin')
+
+    def setUp(self):
+        locator._authoritative_daily_tables.clear()
+
+    def tearDown(self):
+        locator._authoritative_daily_tables.clear()
+
+    @patch('seaice.nasateam.LAST_DAY_WITH_VALID_FINAL_DATA', dt.date(2016, 2, 13))
+    def test_matches__filter_overlapping_nrt_and_final(self):
+        tables = locator._get_authoritative_daily_tables(self.files)
+
+        assert_equals(locator._filter_overlapping_nrt_and_final(self.files[:6]),
+                      sorted(tables['N'].filename))
+        assert_equals([], list(tables['S'].filename))
+
+    @patch('seaice.nasateam.LAST_DAY_WITH_VALID_FINAL_DATA', dt.date(2016, 2, 13))
+    def test_cutoff_is_part_of_the_key(self):
+        locator._get_authoritative_daily_tables(self.files)
+
+        with patch('seaice.nasateam.LAST_DAY_WITH_VALID_FINAL_DATA', dt.date(2016, 2, 14)):
+            tables = locator._get_authoritative_daily_tables(self.files)
+
+        assert_equals(['/anyroot/nt_20160212_f17_v1.1_n.bin',
+                       '/anyroot/nt_20160213_f17_v1.1_n.bin',
+                       '/anyroot/nt_20160214_f17_v1.1_n.bin'], sorted(tables['N'].filename))
+
+    @patch('seaice.nasateam.LAST_DAY_WITH_VALID_FINAL_DATA', dt.date(2016, 2, 13))
+    def test_added_files_are_resolved_incrementally(self):
+        locator._get_authoritative_daily_tables(self.files[:3])
+        added = ('/anyroot/nt_20160215_f17_nrt_n.bin',)
+
+        with patch('seaice.data.locator._filename_tables',
+                   wraps=locator._filename_tables) as mock_tables:
+            tables = locator._get_authoritative_daily_tables(self.files + added)
+
+        mock_tables.assert_called_once_with(self.files[3:] + added)
+        expected = locator._filter_overlapping_nrt_and_final(self.files[:6] + added)
+        assert_equals(expected, sorted(tables['N'].filename))
+        # a final file after the cutoff is never used
+        assert_equals([], list(tables['S'].filename))
+
+
 class Test__get_monthly_filename_data_frame(unittest.TestCase):
 
     def test__get_monthly_filename_data_frame(self):
@@ -0,0 +1,181 @@
+from unittest.mock import patch
+import os
+import shutil
+import tempfile
+import unittest
+
+from nose.tools import assert_equals
+
+from seaice.data.cache import SeaiceFsCache
+import seaice.data.locator as locator
+import seaice.data.manifest as manifest
+
+
+def _touch(*parts):
+    path = os.path.join(*parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+    return path
+
+
+def _walked(search_path):
+    locator._find_all_nasateam_ice_files.cache_clear()
+    return locator._find_all_nasateam_ice_files(search_path)
+
+
+class Test_FileManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.archive = tempfile.mkdtemp()
+        self.manifest_path = os.path.join(tempfile.mkdtemp(), 'manifest.sqlite')
+
+        _touch(self.archive, 'north', '1987', 'nt_19870101_n07_v1.1_n.bin')
+        _touch(self.archive, 'north', '1987', 'nt_19870103_n07_v1.1_n.bin')
+        _touch(self.archive, 'north', 'monthly', 'nt_198701_n07_v1.1_n.bin')
+        _touch(self.archive, 'south', 'nt_20150901_f17_nrt_s.bin')
+        _touch(self.archive, 'south', 'nt_20150901_f17_nrt_s.png')
+        _touch(self.archive, 'south', 'README')
+
+        # make every directory old enough for its mtime to be trusted
+        for root, dirs, files in os.walk(self.archive):
+            os.utime(root, (1, 1))
+
+        self.manifest = manifest.FileManifest(self.manifest_path)
+
+    def tearDown(self):
+        self.manifest.close()
+        shutil.rmtree(self.archive)
+        shutil.rmtree(os.path.dirname(self.manifest_path))
+
+    def test_filenames_match_walk(self):
+        expected = tuple(_walked(self.archive))
+
+        actual = self.manifest.filenames([self.archive])
+
+        assert_equals(expected, actual)
+
+    def test_records_hold_parsed_fields(self):
+        records = self.manifest.records([self.archive])
+
+        expected = (os.path.join(self.archive, 'north', 'monthly', 'nt_198701_n07_v1.1_n.bin'),
+                    '198701', '1987', '01', None, 'n07', 'v1.1', 'n')
+
+        self.assertIn(expected, records)
+
+    def test_unchanged_directories_are_not_listed_again(self):
+        self.manifest.filenames([self.archive])
+
+        with patch('seaice.data.manifest.os.scandir') as mock_scandir:
+            actual = self.manifest.filenames([self.archive])
+
+        mock_scandir.assert_not_called()
+        assert_equals(4, len(actual))
+
+    def test_picks_up_added_files(self):
+        self.manifest.filenames([self.archive])
+
+        added = _touch(self.archive, 'north', '1987', 'nt_19870105_n07_v1.1_n.bin')
+        os.utime(os.path.dirname(added), (2, 2))
+
+        actual = self.manifest.filenames([self.archive])
+
+        self.assertIn(added, actual)
+        assert_equals(tuple(_walked(self.archive)), actual)
+
+    def test_picks_up_added_directories(self):
+        self.manifest.filenames([self.archive])
+
+        added = _touch(self.archive, 'north', '1988', 'nt_19880101_f08_v1.1_n.bin')
+        os.utime(os.path.join(self.archive, 'north'), (2, 2))
+
+        actual = self.manifest.filenames([self.archive])
+
+        self.assertIn(added, actual)
+
+    def test_forgets_removed_directories(self):
+        self.manifest.filenames([self.archive])
+
+        shutil.rmtree(os.path.join(self.archive, 'north', '1987'))
+        os.utime(os.path.join(self.archive, 'north'), (2, 2))
+
+        actual = self.manifest.filenames([self.archive])
+
+        assert_equals(tuple(_walked(self.archive)), actual)
+        assert_equals(2, len(actual))
+
+    def test_verify_reports_stale_entries(self):
+        self.manifest.filenames([self.archive])
+
+        added = _touch(self.archive, 'south', 'nt_20150902_f17_nrt_s.bin')
+
+        missing, extra = self.manifest.verify([self.archive])
+
+        assert_equals([added], missing)
+        assert_equals([], extra)
+
+    def test_recent_directories_are_listed_again(self):
+        os.utime(os.path.join(self.archive, 'south'))
+        self.manifest.filenames([self.archive])
+
+        # same mtime as before, but too recent to be trusted
+        added = _touch(self.archive, 'south', 'nt_20150902_f17_nrt_s.bin')
+        os.utime(os.path.join(self.archive, 'south'), (1, 1))
+        with patch('seaice.data.manifest.time.time', return_value=1.5):
+            self.manifest.refresh(self.archive)
+
+        self.assertIn(added, self.manifest.filenames([self.archive], refresh=False))
+
+
+class Test__find_all_nasateam_ice_files_in_manifest(unittest.TestCase):
+
+    def setUp(self):
+        self.archive = tempfile.mkdtemp()
+        self.manifest_dir = tempfile.mkdtemp()
+        _touch(self.archive, 'nt_20150901_f17_nrt_s.bin')
+        _touch(self.archive, 'nt_20150901_f17_nrt_n.bin')
+        locator._find_all_nasateam_ice_files_in_manifest.cache_clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.archive)
+        shutil.rmtree(self.manifest_dir)
+        locator._find_all_nasateam_ice_files_in_manifest.cache_clear()
+        locator._manifest_parsed_filenames.clear()
+
+    def test_locator_reads_files_from_manifest(self):
+        manifest_path = os.path.join(self.manifest_dir, 'manifest.sqlite')
+
+        with patch('seaice.nasateam.FILE_MANIFEST_PATH', manifest_path):
+            with patch('seaice.data.locator.os.walk') as mock_walk:
+                actual = locator._find_all_nasateam_ice_files_multiple_paths([self.archive])
+
+        mock_walk.assert_not_called()
+        assert_equals((os.path.join(self.archive, 'nt_20150901_f17_nrt_n.bin'),
+                       os.path.join(self.archive, 'nt_20150901_f17_nrt_s.bin')), actual)
+
+    def test_lookups_go_through_the_seaice_fs_cache(self):
+        manifest_path = os.path.join(self.manifest_dir, 'manifest.sqlite')
+        calls = []
+
+        def fs_cache(self, *args, **kwargs):
+            calls.append(args)
+            return self.func(*args, **kwargs)
+
+        with patch.object(SeaiceFsCache, '__call__', fs_cache), \
+                patch('seaice.nasateam.FILE_MANIFEST_PATH', manifest_path):
+            locator._find_all_nasateam_ice_files_multiple_paths([self.archive])
+            locator._find_all_nasateam_ice_files_multiple_paths([self.archive])
+
+        assert_equals([(manifest_path, (self.archive,))] * 2, calls)
+
+    def test_data_frames_use_fields_from_manifest(self):
+        manifest_path = os.path.join(self.manifest_dir, 'manifest.sqlite')
+
+        with patch('seaice.nasateam.FILE_MANIFEST_PATH', manifest_path):
+            files = locator._find_all_nasateam_ice_files_multiple_paths([self.archive])
+
+        with patch('seaice.nasateam.DATA_FILENAME_MATCHER') as mock_matcher:
+            frame = locator._get_daily_filename_data_frame(files, 'S')
+
+        mock_matcher.search.assert_not_called()
+        assert_equals([os.path.join(self.archive, 'nt_20150901_f17_nrt_s.bin')],
+                      list(frame.filename))
@@ -0,0 +1,134 @@
+import functools
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+
+from seaice.data.planes import ConcentrationPlanes
+import seaice.data.getter as getter
+import seaice.data.gridset_filters as gf
+import seaice.nasateam as nt
+
+POLE = nt.FLAGS['pole']
+COAST = nt.FLAGS['coast']
+LAND = nt.FLAGS['land']
+MISSING = nt.FLAGS['missing']
+
+
+def _raw_cube():
+    rng = np.random.RandomState(0)
+    raw = rng.choice(np.concatenate([np.arange(0, 251), [POLE, COAST, LAND, MISSING] * 40]),
+                     size=(6, 5, 4)).astype(np.uint8)
+    raw[0, 0, :] = POLE
+    raw[1, 1, :] = LAND
+    raw[:, :, 2] = MISSING
+    return raw
+
+
+def _gridsets(raw):
+    lookup = getter._scaled_value_lookup(nt.VALID_DATA_RANGE, nt.SCALE)
+    metadata = {'valid_data_range': (0., 100.)}
+    metadata.update(getter._flags_and_missing())
+
+    data = {'data': np.ma.array(lookup[raw]), 'metadata': dict(metadata)}
+    planes = {'data': ConcentrationPlanes.from_raw(raw), 'metadata': dict(metadata)}
+    return data, planes
+
+
+class Test_ConcentrationPlanes(unittest.TestCase):
+
+    def test_from_raw_matches_scaled_data(self):
+        raw = np.arange(256, dtype=np.uint8).reshape(16, 16)
+
+        actual = ConcentrationPlanes.from_raw(raw)
+
+        expected = getter._scale_valid_data(raw, nt.VALID_DATA_RANGE, nt.SCALE)
+        npt.assert_array_equal(actual.to_data(), expected)
+        npt.assert_array_equal(actual.valid, raw <= 250)
+
+    def test_percent_fills_flagged_cells(self):
+        planes = ConcentrationPlanes.from_raw(np.array([[0, 25], [250, MISSING]], dtype=np.uint8))
+
+        npt.assert_array_equal(planes.percent(), [[0., 10.], [100., np.nan]])
+
+    def test_from_data_keeps_raw_values_as_uint8(self):
+        raw = _raw_cube()
+        data, _ = _gridsets(raw)
+
+        actual = ConcentrationPlanes.from_data(data['data'], (0., 100.))
+
+        self.assertEqual(actual.concentration.dtype, np.uint8)
+        npt.assert_array_equal(actual.to_data(), data['data'])
+
+    def test_from_data_keeps_other_values_as_they_are(self):
+        data = np.array([[12.3456, 50.], [POLE, MISSING]])
+
+        actual = ConcentrationPlanes.from_data(data, (0., 100.))
+
+        self.assertEqual(actual.concentration.dtype, np.float64)
+        npt.assert_array_equal(actual.to_data(), data)
+
+    def test_stack_with_mixed_planes(self):
+        raw = ConcentrationPlanes.from_raw(np.array([[25, POLE]], dtype=np.uint8))
+        averaged = ConcentrationPlanes.from_data(np.array([[12.3456, MISSING]]), (0., 100.))
+
+        actual = ConcentrationPlanes.stack([raw, averaged])
+
+        npt.assert_array_equal(actual.to_data(), np.dstack([[[10., POLE]], [[12.3456, MISSING]]]))
+
+    def test_flag_layer_matches_flag_layer_from_cube(self):
+        raw = _raw_cube()
+        data, planes = _gridsets(raw)
+
+        expected = getter.flag_layer_from_cube(np.ma.masked_inside(data['data'], 0., 100.),
+                                               MISSING)
+        actual = getter.flag_layer_from_cube(planes['data'], MISSING)
+
+        npt.assert_array_equal(expected.mask, actual.mask)
+        npt.assert_array_equal(expected.compressed(), actual.compressed())
+
+
+class Test_filters_with_planes(unittest.TestCase):
+
+    def setUp(self):
+        self.data, self.planes = _gridsets(_raw_cube())
+        self.invalid_ice_mask = np.zeros((6, 5), dtype=bool)
+        self.invalid_ice_mask[3:, :] = True
+
+    def assert_same_result(self, filters):
+        expected = gf.apply_filters(self.data, filters)
+        actual = gf.apply_filters(self.planes, filters)
+
+        if isinstance(actual['data'], ConcentrationPlanes):
+            actual_data = actual['data'].to_data()
+        else:
+            actual_data = actual['data']
+        npt.assert_array_equal(expected['data'], actual_data)
+        self.assertEqual(expected['metadata'], actual['metadata'])
+
+    def test_drop_land(self):
+        self.assert_same_result([functools.partial(gf.drop_land, LAND, COAST)])
+
+    def test_drop_invalid_ice(self):
+        self.assert_same_result([functools.partial(gf.drop_invalid_ice, self.invalid_ice_mask)])
+
+    def test_apply_largest_pole_hole(self):
+        self.assert_same_result([gf.apply_largest_pole_hole])
+
+    def test_concentration_cutoff(self):
+        self.assert_same_result([functools.partial(gf.concentration_cutoff, 15.2)])
+
+    def test_concentration_to_extent(self):
+        self.assert_same_result([functools.partial(gf.drop_land, LAND, COAST),
+                                 functools.partial(gf.drop_invalid_ice, self.invalid_ice_mask),
+                                 functools.partial(gf.concentration_to_extent, 15.2),
+                                 gf.prevent_empty])
+
+    def test_does_not_modify_input(self):
+        expected = self.planes['data'].copy()
+
+        gf.apply_filters(self.planes, [functools.partial(gf.drop_land, LAND, COAST),
+                                       gf.apply_largest_pole_hole])
+
+        npt.assert_array_equal(expected.flags, self.planes['data'].flags)
+        npt.assert_array_equal(expected.concentration, self.planes['data'].concentration)
@@ -0,0 +1,199 @@
+from unittest.mock import patch
+import os
+import shutil
+import tempfile
+import unittest
+
+from nose.tools import assert_equals
+import numpy as np
+import numpy.testing as npt
+import pandas.util.testing as pdt
+
+import seaice.data.getter as getter
+import seaice.data.product_cache as product_cache
+import seaice.nasateam as nt
+
+TEST_DATA = os.path.join(os.path.dirname(__file__),
+                         os.path.pardir, os.path.pardir, os.path.pardir,
+                         'test_data', 'seaice.data')
+DAILY_FILES = ['nt_20010106_f13_v1.1_n.bin', 'nt_20010107_f13_v01_n.bin']
+
+
+class ProductCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.directory, 'cache')
+        self.daily_files = []
+        for filename in DAILY_FILES:
+            self.daily_files.append(shutil.copy(os.path.join(TEST_DATA, filename),
+                                                self.directory))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _get(self, cache, function, *args):
+        """Call the getter function with the daily files as the only files for
+        the month, with or without the cache."""
+        with patch.object(nt, 'PRODUCT_CACHE_PATH', self.cache_path if cache else None), \
+                patch('seaice.data.locator.monthly_file_path', return_value=None), \
+                patch('seaice.data.locator.all_daily_file_paths_for_month',
+                      side_effect=lambda *args: list(self.daily_files)):
+            return function(*args)
+
+    def _touch(self, filename):
+        st = os.stat(filename)
+        os.utime(filename, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+
+    def _entries(self):
+        return sorted(os.path.join(root, filename)
+                      for root, _, filenames in os.walk(self.cache_path)
+                      for filename in filenames)
+
+
+class Test_cached(ProductCacheTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.builds = 0
+        self.arrays = {'sums': np.array([[0, 1550], [0, 7750]], dtype=np.uint16),
+                       'counts': np.array([[2, 31], [0, 31]], dtype=np.uint8),
+                       'flags': np.array([[0, 0], [nt.FLAGS['land'], 0]], dtype=np.uint8)}
+
+    def _cached(self):
+        def build():
+            self.builds += 1
+            return self.arrays, self.daily_files
+
+        with patch.object(nt, 'PRODUCT_CACHE_PATH', self.cache_path):
+            return product_cache.cached('monthly', nt.NORTH, '2001-01',
+                                        [('daily', self.daily_files)], build)
+
+    def _assert_same_arrays(self, actual):
+        assert_equals(sorted(self.arrays), sorted(actual))
+        for name, expected in self.arrays.items():
+            npt.assert_array_equal(expected, actual[name])
+            assert_equals(expected.dtype, actual[name].dtype)
+
+    def test_builds_once(self):
+        self._cached()
+        actual, files = self._cached()
+
+        assert_equals(1, self.builds)
+        self._assert_same_arrays(actual)
+        assert_equals(self.daily_files, files)
+
+    def test_builds_again_when_a_file_changes(self):
+        self._cached()
+
+        self._touch(self.daily_files[0])
+        self._cached()
+
+        assert_equals(2, self.builds)
+        assert_equals(2, len(self._entries()))
+
+    def test_ignores_unreadable_entries(self):
+        self._cached()
+        with open(self._entries()[0], 'w') as fp:
+            fp.write('not an entry')
+
+        actual, _ = self._cached()
+
+        assert_equals(2, self.builds)
+        self._assert_same_arrays(actual)
+
+    def test_leaves_no_temporary_files(self):
+        self._cached()
+
+        entries = self._entries()
+        assert_equals(1, len(entries))
+        self.assertTrue(entries[0].endswith('.npz'))
+
+
+class Test_entry_path(ProductCacheTestCase):
+
+    def _entry_path(self, kind='monthly', period='2001-01'):
+        with patch.object(nt, 'PRODUCT_CACHE_PATH', self.cache_path):
+            return product_cache.entry_path(kind, nt.NORTH, period, [('daily', self.daily_files)])
+
+    def test_is_stable(self):
+        assert_equals(self._entry_path(), self._entry_path())
+
+    def test_is_named_for_the_kind_hemisphere_and_period(self):
+        path = self._entry_path()
+
+        assert_equals(os.path.join(self.cache_path, 'monthly', 'N'), os.path.dirname(path))
+        self.assertTrue(os.path.basename(path).startswith('2001-01_'))
+
+    def test_changes_when_a_file_is_modified(self):
+        before = self._entry_path()
+
+        self._touch(self.daily_files[1])
+
+        self.assertNotEqual(before, self._entry_path())
+
+    def test_changes_with_the_period(self):
+        self.assertNotEqual(self._entry_path(period='2001-01'), self._entry_path(period='2001-02'))
+
+
+class Test_concentration_monthly(ProductCacheTestCase):
+
+    def _monthly(self, cache):
+        return self._get(cache, getter.concentration_monthly, nt.NORTH, 2001, 1,
+                         [self.directory], 2)
+
+    def _assert_same_gridset(self, expected, actual):
+        npt.assert_array_equal(expected['data'], actual['data'])
+        assert_equals(expected['data'].dtype, actual['data'].dtype)
+        pdt.assert_index_equal(expected['metadata'].pop('period_index'),
+                               actual['metadata'].pop('period_index'))
+        assert_equals(expected['metadata'], actual['metadata'])
+
+    def test_matches_average_of_daily_files(self):
+        expected = self._monthly(cache=False)
+
+        self._assert_same_gridset(expected, self._monthly(cache=True))
+        self._assert_same_gridset(self._monthly(cache=False), self._monthly(cache=True))
+
+    def test_reads_daily_files_once(self):
+        with patch('seaice.data.getter._daily_sums', wraps=getter._daily_sums) as daily_sums:
+            self._monthly(cache=True)
+            self._monthly(cache=True)
+
+        assert_equals(1, daily_sums.call_count)
+
+    def test_stores_sums_of_raw_concentrations(self):
+        self._monthly(cache=True)
+
+        with np.load(self._entries()[0]) as npz:
+            assert_equals(np.uint16, npz['array_sums'].dtype)
+            assert_equals(np.uint8, npz['array_counts'].dtype)
+            assert_equals(np.uint8, npz['array_flags'].dtype)
+
+    def test_does_not_cache_empty_months(self):
+        self._get(True, getter.concentration_monthly, nt.NORTH, 2001, 1, [self.directory], 3)
+
+        assert_equals([], self._entries())
+
+
+class Test_concentration_seasonal(ProductCacheTestCase):
+
+    def _seasonal(self, cache):
+        return self._get(cache, getter.concentration_seasonal, nt.NORTH, 2001, [12, 1],
+                         [self.directory], 2)
+
+    def test_matches_average_of_months(self):
+        expected = self._seasonal(cache=False)
+
+        self._seasonal(cache=True)
+        actual = self._seasonal(cache=True)
+
+        npt.assert_array_equal(expected['data'], actual['data'])
+        assert_equals(expected['metadata'], actual['metadata'])
+
+    def test_reads_daily_files_once_per_month(self):
+        with patch('seaice.data.getter._daily_sums', wraps=getter._daily_sums) as daily_sums:
+            self._seasonal(cache=True)
+            self._seasonal(cache=True)
+
+        assert_equals(2, daily_sums.call_count)
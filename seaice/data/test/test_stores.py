@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from nose.tools import assert_equals, raises
+import numpy as np
+import numpy.testing as npt
+
+import seaice.data.stores as stores
+
+
+class Test_atomic_path(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'store.npz')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_replaces_path(self):
+        with open(self.path, 'w') as fp:
+            fp.write('old')
+
+        with stores.atomic_path(self.path) as tmp_path:
+            with open(tmp_path, 'w') as fp:
+                fp.write('new')
+
+        with open(self.path) as fp:
+            assert_equals('new', fp.read())
+        assert_equals(0o644, os.stat(self.path).st_mode & 0o777)
+        assert_equals(['store.npz'], os.listdir(self.directory))
+
+    def test_removes_temporary_file_on_error(self):
+        with open(self.path, 'w') as fp:
+            fp.write('old')
+
+        try:
+            with stores.atomic_path(self.path) as tmp_path:
+                with open(tmp_path, 'w') as fp:
+                    fp.write('partial')
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+
+        with open(self.path) as fp:
+            assert_equals('old', fp.read())
+        assert_equals(['store.npz'], os.listdir(self.directory))
+
+
+class Test_load_npz(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'store.npz')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _read(self, npz):
+        return npz['grid']
+
+    def test_round_trip(self):
+        grid = np.arange(6, dtype=np.uint8).reshape(2, 3)
+        stores.save_npz(self.path, {'version': np.array(1), 'grid': grid})
+
+        actual = stores.load_npz(self.path, 1, self._read, 'store')
+
+        npt.assert_array_equal(grid, actual)
+        assert_equals(np.uint8, actual.dtype)
+
+    def test_missing_file(self):
+        self.assertIsNone(stores.load_npz(self.path, 1, self._read, 'store'))
+
+    def test_other_version(self):
+        stores.save_npz(self.path, {'version': np.array(1), 'grid': np.zeros(2)})
+
+        self.assertIsNone(stores.load_npz(self.path, 2, self._read, 'store'))
+
+    def test_unreadable_file(self):
+        with open(self.path, 'w') as fp:
+            fp.write('not a store')
+
+        self.assertIsNone(stores.load_npz(self.path, 1, self._read, 'store'))
+
+    def test_missing_array(self):
+        stores.save_npz(self.path, {'version': np.array(1)})
+
+        self.assertIsNone(stores.load_npz(self.path, 1, self._read, 'store'))
+
+
+class Test_file_stats(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'nt_20010107_f13_v01_n.bin')
+        with open(self.filename, 'wb') as fp:
+            fp.write(b'\x00' * 4)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_stats(self):
+        st = os.stat(self.filename)
+
+        actual = stores.file_stats([self.filename])
+
+        assert_equals([[self.filename, 4, st.st_mtime_ns]], actual)
+
+
+class Test_json_default(unittest.TestCase):
+
+    def test_numpy_scalars(self):
+        actual = json.dumps([np.float64(0.5), np.int32(3)], default=stores.json_default)
+
+        assert_equals('[0.5, 3]', actual)
+
+    @raises(TypeError)
+    def test_other_values(self):
+        json.dumps(object(), default=stores.json_default)
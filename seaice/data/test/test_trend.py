@@ -1,5 +1,5 @@
 import datetime as dt
-import itertools
+import multiprocessing
 import re
 import unittest
 from unittest.mock import patch
@@ -540,10 +540,75 @@ class Test__std_gridset(unittest.TestCase):
         expected_std = np.array([15, 15, 20]).std()
         expected_data = np.full((2, 2), expected_std)
 
-        npt.assert_array_equal(actual_data, expected_data)
+        npt.assert_array_almost_equal(actual_data, expected_data)
         self.assertEqual(actual_files, expected_files)
 
 
+class Test__std_gridsets_by_year(unittest.TestCase):
+
+    @staticmethod
+    def _concentration_daily(nt_hemi, year, month, day, **kwargs):
+        rng = np.random.RandomState(year * 400 + month * 31 + day)
+        return {'data': rng.uniform(0, 100, size=(3, 4)),
+                'metadata': {'files': ['nt_{:04}{:02}{:02}_f08_v01_n.bin'.format(year, month, day)],
+                             'period_index': pd.period_range(dt.date(year, month, day),
+                                                             periods=1, freq='D'),
+                             'valid_data_range': (0, 100)}}
+
+    def test_returns_float32_grids_in_order(self):
+        args_by_year = [({}, pd.date_range('{}-02-01'.format(year), '{}-02-10'.format(year)))
+                        for year in (1990, 1991, 1992)]
+
+        with patch('seaice.data.api.concentration_daily', side_effect=self._concentration_daily):
+            actual = trend._std_gridsets_by_year(trend._std_gridset, args_by_year)
+            expected = [trend._std_gridset(*args) for args in args_by_year]
+
+        for actual_gridset, expected_gridset in zip(actual, expected):
+            self.assertEqual(actual_gridset['data'].dtype, np.float32)
+            npt.assert_array_equal(actual_gridset['data'],
+                                   expected_gridset['data'].astype(np.float32))
+            self.assertEqual(actual_gridset['metadata']['files'],
+                             expected_gridset['metadata']['files'])
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork',
+                         'workers only see the patched reader when forked')
+    def test_workers_return_the_same_gridsets(self):
+        args_by_year = [({}, pd.date_range('{}-02-01'.format(year), '{}-02-10'.format(year)))
+                        for year in range(1990, 1995)]
+
+        with patch('seaice.data.api.concentration_daily', side_effect=self._concentration_daily):
+            expected = trend._std_gridsets_by_year(trend._std_gridset, args_by_year)
+            actual = trend._std_gridsets_by_year(trend._std_gridset, args_by_year, workers=3)
+
+        for actual_gridset, expected_gridset in zip(actual, expected):
+            npt.assert_array_equal(actual_gridset['data'], expected_gridset['data'])
+            self.assertEqual(actual_gridset['metadata']['files'],
+                             expected_gridset['metadata']['files'])
+            pdt.assert_index_equal(actual_gridset['metadata']['period_index'],
+                                   expected_gridset['metadata']['period_index'])
+
+
+class Test_RunningStd(unittest.TestCase):
+    def test_matches_std_of_stacked_grids(self):
+        rng = np.random.RandomState(0)
+        grids = [rng.uniform(0, 100, size=(5, 6)) for _ in range(31)]
+        grids[3][0, 0] = 251
+        grids[4] = np.ma.masked_greater(grids[4], 90)
+        for grid in grids:
+            grid[1, 1] = 253
+
+        running_std = trend.RunningStd()
+        for grid in grids:
+            running_std.add(grid, (0, 100))
+        actual = running_std.std()
+
+        expected = np.ma.masked_outside(np.ma.dstack(grids), 0, 100).std(axis=2)
+
+        npt.assert_array_equal(actual.mask, expected.mask)
+        npt.assert_allclose(actual.filled(0), expected.filled(0), rtol=1e-12)
+        self.assertEqual(actual.data[1, 1], 0)
+
+
 class Test__trend_grid(unittest.TestCase):
     def test_returns_zero_with_zero_weights(self):
         conc1 = np.array([[1., 1.],
@@ -647,70 +712,100 @@ class Test__trend_grid(unittest.TestCase):
         with self.assertRaises(AssertionError):
             trend._trend_grid(concentration_cube, weight_cube, clipping_threshold=100)
 
-    # test that we pass the weights on, but don't worry about testing how they
-    # affect the resulting numbers
-    @patch('seaice.data.trend.ThreadPool')
-    @patch('statsmodels.api.WLS')
-    def test_weights_passed_to_regression_function(self, mock_WLS, mock_pool):
-        class mock_WLS_value(object):
-            class result(object):
-                f_pvalue = .01
-                params = [np.nan, 5]
-
-            def fit(self):
-                return self.result()
-
-        class mock_pool_value(object):
-            def __enter__(self, *args):
-                return self
-
-            def __exit__(self, *args):
-                pass
-
-            def starmap(self, f, arr):
-                return list(itertools.starmap(f, arr))
-
-        mock_WLS.return_value = mock_WLS_value()
-        mock_pool.return_value = mock_pool_value()
-
+    def test_returns_nan_where_a_weighted_concentration_is_nan(self):
         conc1 = np.array([[1., 1.],
                           [1., 1.]])
-        conc2 = np.array([[1., 3.],
-                          [4., 5.]])
+        conc2 = np.array([[2., 3.],
+                          [np.nan, np.nan]])
         conc3 = np.array([[3., 5.],
                           [7., 9.]])
-        concentration_cube = np.dstack([conc1, conc2, conc3])
+        conc4 = np.array([[4., 7.],
+                          [10., 13.]])
+        concentration_cube = np.dstack([conc1, conc2, conc3, conc4])
 
-        weight1 = np.array([[.19, .17],
-                            [.19, .17]])
-        weight2 = np.array([[0.5, 0.5],
-                            [0.5, 0.5]])
-        weight3 = np.array([[0.33, 0.25],
-                            [0.33, 0.25]])
-        weight_cube = np.dstack([weight1, weight2, weight3])
+        weight1 = np.ones_like(conc1)
+        weight = np.array([[1., 1.],
+                           [1., 0.]])
+        weight_cube = np.dstack([weight1, weight, weight1, weight1])
 
-        trend._trend_grid(concentration_cube, weight_cube, clipping_threshold=100)
+        actual = trend._trend_grid(concentration_cube, weight_cube, clipping_threshold=100)
 
-        # http://connor-johnson.com/2014/02/18/linear-regression-with-python/
-        #
-        # See trend.py where statsmodels.add_constant is called
-        X = np.stack([np.array([1, 1, 1]), np.array([0, 1, 2])], axis=1)
+        expected = np.array([[10., 20.],
+                             [np.nan, 40.]])
 
-        npt.assert_array_equal(mock_WLS.call_args_list[0][0][0], np.array([1, 1, 3]))
-        npt.assert_array_equal(mock_WLS.call_args_list[0][0][1], X)
-        npt.assert_array_equal(mock_WLS.call_args_list[0][1]['weights'], np.array([.19, 0.5, 0.33]))
+        npt.assert_array_almost_equal(actual, expected)
 
-        npt.assert_array_equal(mock_WLS.call_args_list[1][0][0], np.array([1, 3, 5]))
-        npt.assert_array_equal(mock_WLS.call_args_list[1][0][1], X)
-        npt.assert_array_equal(mock_WLS.call_args_list[1][1]['weights'], np.array([.17, 0.5, 0.25]))
+    def test_clips_slopes(self):
+        conc1 = np.array([[1., 1.]])
+        conc2 = np.array([[6., -4.]])
+        conc3 = np.array([[11., -9.]])
+        concentration_cube = np.dstack([conc1, conc2, conc3])
 
-        npt.assert_array_equal(mock_WLS.call_args_list[2][0][0], np.array([1, 4, 7]))
-        npt.assert_array_equal(mock_WLS.call_args_list[2][0][1], X)
-        npt.assert_array_equal(mock_WLS.call_args_list[2][1]['weights'], np.array([.19, 0.5, 0.33]))
+        weight_cube = np.ones_like(concentration_cube)
 
-        npt.assert_array_equal(mock_WLS.call_args_list[3][0][0], np.array([1, 5, 9]))
-        npt.assert_array_equal(mock_WLS.call_args_list[3][0][1], X)
-        npt.assert_array_equal(mock_WLS.call_args_list[3][1]['weights'], np.array([.17, 0.5, 0.25]))
+        actual = trend._trend_grid(concentration_cube, weight_cube, clipping_threshold=30)
+
+        npt.assert_array_almost_equal(actual, np.array([[30., -30.]]))
+
+    def test_matches_statsmodels_wls(self):
+        import statsmodels.api as sm
+
+        rng = np.random.RandomState(0)
+        rows, cols, years = 20, 15, 40
+        slopes = rng.uniform(-2, 2, size=(rows, cols, 1))
+        noise = rng.normal(scale=rng.uniform(0, 30, size=(rows, cols, 1)),
+                           size=(rows, cols, years))
+        concentration_cube = 50 + slopes * np.arange(years) + noise
+        weight_cube = 1 / rng.uniform(1, 20, size=(rows, cols, years))**2
+        weight_cube[rng.rand(rows, cols, years) < .3] = 0
+        weight_cube[0, :, 2:] = 0
+        concentration_cube[1, :3, 5] = np.nan
+
+        actual = trend._trend_grid(concentration_cube, weight_cube, clipping_threshold=20)
+
+        # the statsmodels WLS fit of each gridcell that _trend_grid replaced
+        expected = np.zeros((rows, cols))
+        for row, col in np.ndindex(rows, cols):
+            w = weight_cube[row, col]
+            nonzero = w != 0
+            if np.sum(nonzero) < 3:
+                continue
+
+            x = sm.add_constant(np.arange(years)[nonzero])
+            result = sm.WLS(concentration_cube[row, col][nonzero], x, weights=w[nonzero]).fit()
+            if result.f_pvalue > trend.MAXIMUM_F_TEST_P_VALUE:
+                continue
+            expected[row, col] = np.clip(result.params[1] * 10, -20, 20)
+
+        self.assertTrue(np.any(expected == 0) and np.any(np.abs(expected) == 20))
+        npt.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9)
+
+
+class Test_TrendStatistics(unittest.TestCase):
+    def test_merging_layer_by_layer_matches_statistics_of_whole_cube(self):
+        rng = np.random.RandomState(1)
+        rows, cols, years = 6, 7, 30
+        concentration_cube = 40 + rng.uniform(-1, 1, size=(rows, cols, 1)) * np.arange(years)
+        concentration_cube += rng.normal(scale=5, size=(rows, cols, years))
+        weight_cube = rng.uniform(0, 1, size=(rows, cols, years))
+        weight_cube[rng.rand(rows, cols, years) < .3] = 0
+        weight_cube[0, 0, :] = 0
+        concentration_cube[1, 1, 4] = np.nan
+
+        expected = trend.TrendStatistics.from_cubes(concentration_cube, weight_cube)
+
+        actual = trend.TrendStatistics.from_cubes(concentration_cube[:, :, :1],
+                                                  weight_cube[:, :, :1])
+        for year in range(1, years):
+            actual = actual.merge(trend.TrendStatistics.from_cubes(
+                concentration_cube[:, :, year:year + 1], weight_cube[:, :, year:year + 1],
+                first_x=year))
+
+        for name in trend.TrendStatistics.FIELDS:
+            npt.assert_allclose(getattr(actual, name), getattr(expected, name),
+                                rtol=1e-9, atol=1e-9, err_msg=name)
+        npt.assert_allclose(actual.trend(clipping_threshold=20),
+                            expected.trend(clipping_threshold=20), rtol=1e-9, atol=1e-9)
 
 
 class Test__weight_from_std(unittest.TestCase):
@@ -0,0 +1,258 @@
+from unittest.mock import patch
+import datetime as dt
+import os
+import shutil
+import tempfile
+import unittest
+
+from nose.tools import assert_equals
+import numpy as np
+import numpy.testing as npt
+import pandas as pd
+import pandas.util.testing as pdt
+
+import seaice.data.trend as trend
+import seaice.data.trend_store as trend_store
+import seaice.nasateam as nt
+
+HEMISPHERE = {'short_name': 'N', 'shape': (6, 5)}
+MONTH = 1
+MISSING = nt.FLAGS['missing']
+POLE = nt.FLAGS['pole']
+LAND = nt.FLAGS['land']
+
+
+class Test_store_name(unittest.TestCase):
+
+    def test_name(self):
+        assert_equals('trend_N_01_1979.npz', trend_store.store_name(nt.NORTH, 1, 1979))
+
+
+class Test_trend_gridset(unittest.TestCase):
+    """Trends computed from a store match trends computed from every year, on
+    synthetic monthly concentrations and standard deviations for Januaries
+    from 1979."""
+
+    def setUp(self):
+        self.store_path = tempfile.mkdtemp()
+        self.fingerprints = {}
+        self.pole_holes = {1983: [(0, 0), (0, 1)]}
+        self.missing_years = [1981]
+        self.years_read = []
+        self.std_years_read = []
+
+    def tearDown(self):
+        shutil.rmtree(self.store_path)
+
+    def _invalid_ice_mask(self, hemisphere, month):
+        mask = np.zeros(HEMISPHERE['shape'], dtype=bool)
+        mask[5, :] = True
+        return mask
+
+    def _concentration_monthly(self, hemisphere, year, month, search_paths, *args):
+        self.years_read.append(year)
+
+        rng = np.random.RandomState(year)
+        if year in self.missing_years:
+            data = np.full(HEMISPHERE['shape'], MISSING, dtype=np.float64)
+        else:
+            data = np.round(np.linspace(10, 80, 30).reshape(HEMISPHERE['shape']) +
+                            rng.uniform(-5, 5, HEMISPHERE['shape']) + .4 * (year - 1979))
+            data[:, 4] = LAND
+            for cell in self.pole_holes.get(year, []):
+                data[cell] = POLE
+
+        return {'data': data,
+                'metadata': {'files': ['nt_{}{:02}_f08_v01_n.bin'.format(year, month)],
+                             'period_index': pd.period_range('{}-{}'.format(year, month),
+                                                             periods=1, freq='M'),
+                             'valid_data_range': (0., 100.),
+                             'flags': {k: v for k, v in nt.FLAGS.items() if k != 'missing'},
+                             'missing_value': MISSING}}
+
+    def _std_gridset(self, hemisphere, year, month, dates, search_paths, min_days):
+        self.std_years_read.append(year)
+
+        if year in self.missing_years:
+            return {'data': np.full(HEMISPHERE['shape'], np.nan), 'metadata': None}
+
+        rng = np.random.RandomState(year + 1000)
+        return {'data': rng.uniform(1, 10, HEMISPHERE['shape']),
+                'metadata': {'files': [['nt_{:%Y%m%d}_f08_v01_n.bin'.format(date)]
+                                       for date in dates],
+                             'period_index': pd.PeriodIndex(dates, freq='D')}}
+
+    def _year_fingerprints(self, hemisphere, dates_by_year, month, search_paths):
+        return [self.fingerprints.get(year, 'fingerprint') for year, _ in dates_by_year]
+
+    def _trend_gridset(self, year, store, trend_start_year=None):
+        with patch.object(nt, 'TREND_STORE_PATH', self.store_path if store else None), \
+                patch('seaice.nasateam.invalid_ice_mask', side_effect=self._invalid_ice_mask), \
+                patch('seaice.data.getter.concentration_monthly',
+                      side_effect=self._concentration_monthly), \
+                patch('seaice.data.trend._daily_std_gridset_for_year',
+                      side_effect=self._std_gridset), \
+                patch('seaice.data.trend_store._year_fingerprints',
+                      side_effect=self._year_fingerprints):
+            return trend.trend_gridset(HEMISPHERE, year, MONTH, ['/search/path'],
+                                       trend_start_year=trend_start_year,
+                                       clipping_threshold=5)
+
+    def _assert_same_trend(self, year, trend_start_year=None):
+        actual = self._trend_gridset(year, store=True, trend_start_year=trend_start_year)
+        expected = self._trend_gridset(year, store=False, trend_start_year=trend_start_year)
+
+        npt.assert_allclose(actual['data'], expected['data'], rtol=1e-9, atol=1e-12)
+        npt.assert_array_equal(actual['metadata']['data']['flag_layer'].mask,
+                               expected['metadata']['data']['flag_layer'].mask)
+        npt.assert_array_equal(actual['metadata']['data']['weight'],
+                               expected['metadata']['data']['weight'])
+
+        for key in ('flags', 'valid_data_range', 'hemi', 'period', 'type', 'missing_value',
+                    'filename'):
+            assert_equals(expected['metadata'][key], actual['metadata'][key])
+
+        assert_equals(expected['metadata']['monthly']['files'],
+                      actual['metadata']['monthly']['files'])
+        pdt.assert_index_equal(expected['metadata']['monthly']['period_index'],
+                               actual['metadata']['monthly']['period_index'])
+        assert_equals(expected['metadata']['std']['files'], actual['metadata']['std']['files'])
+        for expected_index, actual_index in zip(expected['metadata']['std']['period_indexes'],
+                                                actual['metadata']['std']['period_indexes']):
+            pdt.assert_index_equal(expected_index, actual_index)
+
+        return actual
+
+    def _years_read(self):
+        years, self.years_read = self.years_read, []
+        return years
+
+    def _std_years_read(self):
+        years, self.std_years_read = self.std_years_read, []
+        return years
+
+    def test_matches_trend_of_every_year(self):
+        self._assert_same_trend(1990)
+
+        self.assertTrue(os.path.exists(os.path.join(self.store_path, 'trend_N_01_1979.npz')))
+
+    def test_matches_trend_with_start_year(self):
+        self._assert_same_trend(1990, trend_start_year=1982)
+
+    def test_folds_in_only_new_years(self):
+        self._trend_gridset(1988, store=True)
+        self._years_read()
+        self._std_years_read()
+
+        self._trend_gridset(1990, store=True)
+
+        assert_equals([1989, 1990], self._years_read())
+        assert_equals([1989, 1990], self._std_years_read())
+        self._assert_same_trend(1990)
+
+    def test_reads_nothing_when_up_to_date(self):
+        self._trend_gridset(1990, store=True)
+        self._years_read()
+        self._std_years_read()
+
+        self._trend_gridset(1990, store=True)
+
+        assert_equals([], self._years_read())
+        assert_equals([], self._std_years_read())
+
+    def test_rebuilds_when_a_fingerprint_changes(self):
+        self._trend_gridset(1990, store=True)
+        self._years_read()
+        self._std_years_read()
+
+        self.fingerprints[1985] = 'changed'
+        self._trend_gridset(1990, store=True)
+
+        assert_equals(list(range(1979, 1991)), self._years_read())
+        assert_equals([1985], self._std_years_read())
+        self._assert_same_trend(1990)
+
+    def test_rebuilds_when_a_new_pole_hole_is_larger(self):
+        self._trend_gridset(1988, store=True)
+        self._years_read()
+
+        self.pole_holes[1990] = [(0, 0), (0, 1), (1, 0), (1, 1)]
+        self._trend_gridset(1990, store=True)
+
+        assert_equals([1989, 1990] + list(range(1979, 1991)), self._years_read())
+        self._assert_same_trend(1990)
+
+    def test_earlier_year_leaves_store_unchanged(self):
+        self._trend_gridset(1990, store=True)
+        path = os.path.join(self.store_path, 'trend_N_01_1979.npz')
+        mtime = os.stat(path).st_mtime_ns
+
+        self._assert_same_trend(1986)
+
+        assert_equals(mtime, os.stat(path).st_mtime_ns)
+        assert_equals(1990, trend_store.TrendStore.load(path).years[-1])
+
+    def test_rebuilds_when_settings_change(self):
+        self._trend_gridset(1990, store=True)
+        self._years_read()
+
+        with patch.object(nt, 'LAST_DAY_WITH_VALID_FINAL_DATA', dt.date(1985, 1, 1)):
+            self._trend_gridset(1990, store=True)
+
+        assert_equals(list(range(1979, 1991)), self._years_read())
+
+    def test_ignores_unreadable_store(self):
+        with open(os.path.join(self.store_path, 'trend_N_01_1979.npz'), 'w') as fp:
+            fp.write('not a store')
+
+        self._assert_same_trend(1990)
+
+
+class Test__year_fingerprints(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.monthly_file = os.path.join(self.directory, 'nt_198001_n07_v01_n.bin')
+        self.daily_file = os.path.join(self.directory, 'nt_19800101_n07_v01_n.bin')
+        for filename in (self.monthly_file, self.daily_file):
+            with open(filename, 'wb') as fp:
+                fp.write(b'\x00' * 4)
+
+        self.bad_days = []
+        self.dates_by_year = [(1980, pd.date_range('1980-01-01', '1980-01-31'))]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _fingerprint(self):
+        with patch('seaice.data.locator.monthly_file_path', return_value=self.monthly_file), \
+                patch('seaice.data.locator.all_daily_file_paths_for_month',
+                      return_value=[self.daily_file]), \
+                patch('seaice.datastore.get_bad_days_for_hemisphere', return_value=self.bad_days):
+            return trend_store._year_fingerprints(HEMISPHERE, self.dates_by_year, 1,
+                                                  nt.DEFAULT_SEA_ICE_PATHS)[0]
+
+    def test_is_stable(self):
+        assert_equals(self._fingerprint(), self._fingerprint())
+
+    def test_changes_when_a_file_is_modified(self):
+        before = self._fingerprint()
+
+        st = os.stat(self.daily_file)
+        os.utime(self.daily_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+
+        self.assertNotEqual(before, self._fingerprint())
+
+    def test_changes_when_a_day_is_marked_bad(self):
+        before = self._fingerprint()
+
+        self.bad_days = [pd.Period('1980-01-05', freq='D')]
+
+        self.assertNotEqual(before, self._fingerprint())
+
+    def test_ignores_bad_days_of_other_years(self):
+        before = self._fingerprint()
+
+        self.bad_days = [pd.Period('1981-01-05', freq='D')]
+
+        assert_equals(before, self._fingerprint())
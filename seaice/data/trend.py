@@ -1,21 +1,24 @@
+import concurrent.futures
 import copy
 import datetime as dt
 from functools import lru_cache
 from functools import partial
 import logging
 import re
-from multiprocessing.pool import ThreadPool
 
 import numpy as np
 import pandas as pd
-import statsmodels.api as sm
 
 from . import api
+from . import errors as e
 from . import getter
 from . import gridset_filters as gf
 from . import locator
+from seaice.lazy_import import lazy_import
 import seaice.nasateam as nt
 
+scipy_special = lazy_import('scipy.special')
+
 log = logging.getLogger(__name__)
 
 
@@ -24,13 +27,34 @@ MAXIMUM_F_TEST_P_VALUE = .05
 
 def trend_gridset(nt_hemi, year, month, search_paths,
                   min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH,
-                  trend_start_year=None, *, clipping_threshold):
+                  trend_start_year=None, *, clipping_threshold, workers=1):
+    """Return a gridset of the decadal trend of the concentration of the given
+    month, over the years from trend_start_year (or the beginning of the
+    satellite era) to year.
+
+    The daily standard deviations of the years are computed by `workers`
+    processes when workers is greater than 1.
+
+    When nt.TREND_STORE_PATH is set, the trend is computed from the statistics
+    kept there for the hemisphere, month and start year, folding in only the
+    years that are new since they were saved (see seaice.data.trend_store).
+
+    """
+    if nt.TREND_STORE_PATH:
+        # imported here to avoid a circular import
+        from . import trend_store
+        return trend_store.trend_gridset(nt_hemi, year, month, search_paths,
+                                         min_days_for_valid_month, trend_start_year,
+                                         clipping_threshold=clipping_threshold,
+                                         workers=workers)
+
     dates = _datetime_index_for_trends(year, month, start_year=trend_start_year)
     start_year = dates[0].year
     end_year = dates[-1].year
 
     std_gridset = _daily_std_gridset_for_trends(nt_hemi, year, month, search_paths,
-                                                min_days_for_valid_month, trend_start_year)
+                                                min_days_for_valid_month, trend_start_year,
+                                                workers=workers)
     std_cube = std_gridset['data']
     weight_cube = _weight_from_std(std_cube)
 
@@ -39,50 +63,26 @@ def trend_gridset(nt_hemi, year, month, search_paths,
                                                               start_year,
                                                               end_year,
                                                               month,
-                                                              search_paths)
+                                                              search_paths,
+                                                              planes=True)
     stacked_gridset = gf.apply_filters(stacked_gridset,
                                        [partial(gf.drop_invalid_ice, invalid_ice_mask),
                                         gf.apply_largest_pole_hole])
-    stacked_valid_data = stacked_gridset['metadata']['valid_data_range']
+    stacked_planes = stacked_gridset['data']
 
-    concentration_cube = np.ma.masked_outside(
-        stacked_gridset['data'], *stacked_valid_data).filled(np.nan)
+    concentration_cube = stacked_planes.percent(fill_value=np.nan)
 
     trend_grid = _trend_grid(concentration_cube, weight_cube,
                              clipping_threshold=clipping_threshold)
 
-    # TODO: Instead of having flags and data in one array, consider splitting
-    # them in to two arrays, e.g.:
-    # std_gridset['data'] has 0-100 and NaN for flag/fill values, and
-    # std_gridset['flagdata'] has 251+ flag values and NaNs for data.
-    flag_layer = getter.flag_layer_from_cube(np.ma.masked_inside(stacked_gridset['data'],
-                                                                 *stacked_valid_data),
+    flag_layer = getter.flag_layer_from_cube(stacked_planes,
                                              stacked_gridset['metadata']['missing_value'])
 
     data = np.where(flag_layer.mask, trend_grid, flag_layer)
 
-    metadata = {}
-
-    flags = copy.deepcopy(nt.FLAGS)
-    flags.pop('missing')
-    metadata['flags'] = flags
-
-    valid_data_min = (stacked_gridset['metadata']['valid_data_range'][0] -
-                      stacked_gridset['metadata']['valid_data_range'][1])
-    valid_data_max = (stacked_gridset['metadata']['valid_data_range'][1] -
-                      stacked_gridset['metadata']['valid_data_range'][0])
-    metadata['valid_data_range'] = (valid_data_min, valid_data_max)
-
-    metadata['hemi'] = nt_hemi['short_name']
+    metadata = _trend_metadata(nt_hemi, search_paths, 'Monthly Trend',
+                               stacked_gridset['metadata'], std_gridset['metadata'])
     metadata['period'] = pd.Period('{}-{}'.format(year, month), freq='M')
-    metadata['search_paths'] = search_paths
-    metadata['temporality'] = 'M'
-    metadata['type'] = 'Monthly Trend'
-    metadata['missing_value'] = stacked_gridset['metadata']['missing_value']
-
-    metadata['std'] = std_gridset['metadata']
-    metadata['monthly'] = stacked_gridset['metadata']
-    metadata['filename'] = stacked_gridset['metadata']['files'][-1]
 
     metadata['data'] = {
         'concentration': concentration_cube,
@@ -99,7 +99,8 @@ def trend_gridset(nt_hemi, year, month, search_paths,
 
 
 def seasonal_trend_gridset(nt_hemi, year, season, search_paths, seasons,
-                           min_days_for_valid_month, *, clipping_threshold):
+                           min_days_for_valid_month, *, clipping_threshold, workers=1,
+                           monthly_gridsets=None):
     nt.validate_seasons(seasons)
     months = seasons[season]
     dates = nt.datetime_index_for_seasonal_trends(year, tuple(months))
@@ -112,7 +113,8 @@ def seasonal_trend_gridset(nt_hemi, year, season, search_paths, seasons,
     end_year = dates[-1].year
 
     std_gridset = _daily_std_gridset_for_seasonal_trends(nt_hemi, end_year, months, search_paths,
-                                                         min_days_for_valid_month)
+                                                         min_days_for_valid_month,
+                                                         workers=workers)
     std_cube = std_gridset['data']
     weight_cube = _weight_from_std(std_cube)
 
@@ -122,46 +124,27 @@ def seasonal_trend_gridset(nt_hemi, year, season, search_paths, seasons,
                                                                start_year,
                                                                end_year,
                                                                months,
-                                                               search_paths)
+                                                               search_paths,
+                                                               planes=True,
+                                                               monthly_gridsets=monthly_gridsets)
 
     stacked_gridset = gf.apply_filters(stacked_gridset,
                                        [partial(gf.drop_invalid_ice, invalid_ice_mask),
                                         gf.apply_largest_pole_hole])
-    stacked_valid_data = stacked_gridset['metadata']['valid_data_range']
+    stacked_planes = stacked_gridset['data']
 
-    concentration_cube = np.ma.masked_outside(
-        stacked_gridset['data'], *stacked_valid_data).filled(np.nan)
+    concentration_cube = stacked_planes.percent(fill_value=np.nan)
 
     trend_grid = _trend_grid(concentration_cube, weight_cube,
                              clipping_threshold=clipping_threshold)
 
-    flag_layer = getter.flag_layer_from_cube(np.ma.masked_inside(stacked_gridset['data'],
-                                                                 *stacked_valid_data),
+    flag_layer = getter.flag_layer_from_cube(stacked_planes,
                                              stacked_gridset['metadata']['missing_value'])
 
     data = np.where(flag_layer.mask, trend_grid, flag_layer)
 
-    metadata = {}
-
-    flags = copy.deepcopy(nt.FLAGS)
-    flags.pop('missing')
-    metadata['flags'] = flags
-
-    valid_data_min = (stacked_gridset['metadata']['valid_data_range'][0] -
-                      stacked_gridset['metadata']['valid_data_range'][1])
-    valid_data_max = (stacked_gridset['metadata']['valid_data_range'][1] -
-                      stacked_gridset['metadata']['valid_data_range'][0])
-    metadata['valid_data_range'] = (valid_data_min, valid_data_max)
-
-    metadata['hemi'] = nt_hemi['short_name']
-    metadata['search_paths'] = search_paths
-    metadata['temporality'] = 'M'
-    metadata['type'] = 'Seasonal Trend'
-    metadata['missing_value'] = stacked_gridset['metadata']['missing_value']
-
-    metadata['std'] = std_gridset['metadata']
-    metadata['monthly'] = stacked_gridset['metadata']
-    metadata['filename'] = stacked_gridset['metadata']['files'][-1]
+    metadata = _trend_metadata(nt_hemi, search_paths, 'Seasonal Trend',
+                               stacked_gridset['metadata'], std_gridset['metadata'])
 
     metadata['data'] = {
         'concentration': concentration_cube,
@@ -179,11 +162,11 @@ def seasonal_trend_gridset(nt_hemi, year, season, search_paths, seasons,
 
 def _daily_std_gridset_for_trends(nt_hemi, year, month, search_paths,
                                   min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH,
-                                  trend_start_year=None):
-    """Returns a gridset of monthly standard deviations. gridset['data'] is a cube
-    of standard deviations (i,j,k) [column, row, year], such that each layer(k)
-    contains the standard deviations for a single year. Each gridcell's standard
-    deviation (i,j), is computed from the standard deviation of the
+                                  trend_start_year=None, workers=1):
+    """Returns a gridset of monthly standard deviations. gridset['data'] is a float32
+    cube of standard deviations (i,j,k) [column, row, year], such that each
+    layer(k) contains the standard deviations for a single year. Each gridcell's
+    standard deviation (i,j), is computed from the standard deviation of the
     concentrations of all the daily concentration values for the month (1-31) at
     location (i,j).
 
@@ -196,39 +179,57 @@ def _daily_std_gridset_for_trends(nt_hemi, year, month, search_paths,
 
     search_paths: directories for 0051 and 0081 files
 
+    workers: int. number of processes computing the years' standard deviations;
+             see _std_gridsets_by_year
+
     """
     date_index = _datetime_index_for_trends(year, month, start_year=trend_start_year)
 
     # list of tuples sorted by year; (year, date_index[date_index.year == year])
     dates_by_year = sorted(date_index.groupby(date_index.year).items())
 
+    std_gridsets = _std_gridsets_by_year(
+        _daily_std_gridset_for_year,
+        [(nt_hemi, year, month, dates, search_paths, min_days_for_valid_month)
+         for year, dates in dates_by_year],
+        workers)
+
     data_list = []
     metadata = {'files': [], 'period_indexes': []}
 
-    for year, dates in dates_by_year:
-        daily_filename_list = locator.all_daily_file_paths_for_month(
-            nt_hemi, year, month, search_paths
-        )
-        daily_filename_list = getter.double_weight_smmr_files(daily_filename_list)
-
-        if len(daily_filename_list) >= min_days_for_valid_month:
-            std_gridset = _std_gridset(nt_hemi, dates)
-
-            data_list.append(std_gridset['data'])
+    for std_gridset in std_gridsets:
+        data_list.append(std_gridset['data'])
+        if std_gridset['metadata'] is not None:
             metadata['files'].append(std_gridset['metadata']['files'])
             metadata['period_indexes'].append(std_gridset['metadata']['period_index'])
-        else:
-            log.warn('Insufficient daily files found for {yyyy:04}-{mm:02}; appending grid layer '
-                     'filled with np.nan.'.format(yyyy=year, mm=month))
-            data_list.append(np.full(nt_hemi['shape'], np.nan))
 
     data = np.dstack(data_list)
 
     return {'data': data, 'metadata': metadata}
 
 
+def _daily_std_gridset_for_year(nt_hemi, year, month, dates, search_paths,
+                                min_days_for_valid_month):
+    """Returns the std gridset of the given dates, a single month of a single
+    year, or a gridset with a grid filled with np.nan and metadata None if there
+    are not enough daily files for the month.
+
+    """
+    daily_filename_list = locator.all_daily_file_paths_for_month(
+        nt_hemi, year, month, search_paths
+    )
+    daily_filename_list = getter.double_weight_smmr_files(daily_filename_list)
+
+    if len(daily_filename_list) >= min_days_for_valid_month:
+        return _std_gridset(nt_hemi, dates)
+
+    log.warn('Insufficient daily files found for {yyyy:04}-{mm:02}; appending grid layer '
+             'filled with np.nan.'.format(yyyy=year, mm=month))
+    return {'data': np.full(nt_hemi['shape'], np.nan), 'metadata': None}
+
+
 def _daily_std_gridset_for_seasonal_trends(nt_hemi, year, months, search_paths,
-                                           min_days_for_valid_month):
+                                           min_days_for_valid_month, workers=1):
     date_index = nt.datetime_index_for_seasonal_trends(year, tuple(months))
 
     # since winter is defined as December-February, count December as part of
@@ -239,11 +240,14 @@ def _daily_std_gridset_for_seasonal_trends(nt_hemi, year, months, search_paths,
     # list of tuples sorted by year; (year, date_index[date_index.year == year])
     dates_by_year = sorted(date_index.groupby(groupby_years).items())
 
+    std_gridsets = _std_gridsets_by_year(_std_gridset,
+                                         [(nt_hemi, dates) for year, dates in dates_by_year],
+                                         workers)
+
     data_list = []
     metadata = {'files': [], 'period_indexes': []}
 
-    for year, dates in dates_by_year:
-        std_gridset = _std_gridset(nt_hemi, dates)
+    for std_gridset in std_gridsets:
         data_list.append(std_gridset['data'])
         metadata['files'].append(std_gridset['metadata']['files'])
         metadata['period_indexes'].append(std_gridset['metadata']['period_index'])
@@ -253,6 +257,62 @@ def _daily_std_gridset_for_seasonal_trends(nt_hemi, year, months, search_paths,
     return {'data': data, 'metadata': metadata}
 
 
+def _std_gridsets_by_year(function, args_by_year, workers=1):
+    """Returns [function(*args) for args in args_by_year], the std gridsets of a
+    trend's years, with each gridset's data as float32.
+
+    When workers is greater than 1 the years are computed by a pool of that many
+    processes; the gridsets are still returned in the order of args_by_year.
+    function must be a module level function so it can be sent to the workers.
+
+    """
+    jobs = [(function,) + tuple(args) for args in args_by_year]
+
+    if workers > 1 and len(jobs) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            return list(pool.map(_float32_std_gridset, *zip(*jobs)))
+
+    return [_float32_std_gridset(*job) for job in jobs]
+
+
+def _float32_std_gridset(function, *args):
+    """Returns function(*args), a std gridset, with its data as float32, halving
+    the size of the grids returned by the workers of _std_gridsets_by_year and
+    of the trend's std cube."""
+    gridset = function(*args)
+    gridset['data'] = gridset['data'].astype(np.float32)
+    return gridset
+
+
+def _trend_metadata(nt_hemi, search_paths, type_, monthly_metadata, std_metadata):
+    """Returns the metadata of a trend gridset, without 'data', given the metadata
+    of the stacked concentrations it was computed from and of their standard
+    deviations."""
+    metadata = {}
+
+    flags = copy.deepcopy(nt.FLAGS)
+    flags.pop('missing')
+    metadata['flags'] = flags
+
+    valid_data_min = (monthly_metadata['valid_data_range'][0] -
+                      monthly_metadata['valid_data_range'][1])
+    valid_data_max = (monthly_metadata['valid_data_range'][1] -
+                      monthly_metadata['valid_data_range'][0])
+    metadata['valid_data_range'] = (valid_data_min, valid_data_max)
+
+    metadata['hemi'] = nt_hemi['short_name']
+    metadata['search_paths'] = search_paths
+    metadata['temporality'] = 'M'
+    metadata['type'] = type_
+    metadata['missing_value'] = monthly_metadata['missing_value']
+
+    metadata['std'] = std_metadata
+    metadata['monthly'] = monthly_metadata
+    metadata['filename'] = monthly_metadata['files'][-1]
+
+    return metadata
+
+
 @lru_cache(maxsize=16)
 def _datetime_index_for_trends(end_year, month, start_year=None):
     if start_year is None or dt.date(start_year, 1, 1) < nt.BEGINNING_OF_SATELLITE_ERA_MONTHLY:
@@ -290,11 +350,17 @@ def _gridset_matches_platform(gridset, pattern, platform):
 
 
 def _std_gridset(nt_hemi, dates):
-    list_of_dailies = []
+    """Returns a gridset of the standard deviation of each gridcell's daily
+    concentrations on the given dates, ignoring values outside the daily
+    gridsets' valid_data_range. Grids from SMMR files count twice.
 
-    metadata = {'files': [], 'period_index': pd.PeriodIndex([], freq='D')}
+    The daily grids are folded into a RunningStd as they are read, so only a few
+    grids are held in memory at once.
+
+    """
+    running_std = RunningStd()
 
-    valid_data_range = None
+    metadata = {'files': [], 'period_index': pd.PeriodIndex([], freq='D')}
 
     for date in dates:
         daily_gridset = api.concentration_daily(nt_hemi,
@@ -308,108 +374,193 @@ def _std_gridset(nt_hemi, dates):
         if empty:
             continue
 
-        list_of_dailies.append(daily_gridset['data'])
+        valid_data_range = daily_gridset['metadata']['valid_data_range']
+
+        running_std.add(daily_gridset['data'], valid_data_range)
         metadata['files'].append(daily_gridset['metadata']['files'])
 
         period_index = daily_gridset['metadata']['period_index']
         metadata['period_index'] = metadata['period_index'].append(period_index)
 
-        valid_data_range = daily_gridset['metadata']['valid_data_range']
-
         # double weight smmr files, mainly matters for August 1987
         if _gridset_matches_platform(daily_gridset, nt.DATA_FILENAME_MATCHER, nt.SMMR_PLATFORM):
-            list_of_dailies.append(daily_gridset['data'])
+            running_std.add(daily_gridset['data'], valid_data_range)
             metadata['files'].append(daily_gridset['metadata']['files'])
 
-    cube_of_dailies = np.ma.dstack(list_of_dailies)
-    cube_of_dailies = np.ma.masked_outside(cube_of_dailies, *valid_data_range)
+    if running_std.count is None:
+        raise e.SeaIceDataValueError('No daily data found for {} to {}'.format(
+            dates[0].date(), dates[-1].date()))
 
-    data = cube_of_dailies.std(axis=2)
-
-    gridset = {'data': data, 'metadata': metadata}
+    gridset = {'data': running_std.std(), 'metadata': metadata}
 
     return gridset
 
 
-def _trend_gridcell(concentrations, weights, *, clipping_threshold):
-    """Calculate the the decadal trend (average change or slope).
+class RunningStd(object):
+    """The population standard deviation of each gridcell over a sequence of
+    grids, updated one grid at a time with Welford's algorithm: the count, mean
+    and sum of squared deviations from the mean (m2) of each gridcell are
+    updated by each value.
 
-    To get the single-year trend, we calculate a WLS line of best fit, where
-    "x" is time in years. Since the slope represents the average annual change,
-    we must multiply by 10 to get the decadal change.
     """
-    nonzero_weights = (weights != 0)
-
-    # skip gridcells that don't have enough points to perform a linear
-    # regression
-    if np.sum(nonzero_weights) < 3:
-        return 0
-
-    y = concentrations
-    x = np.arange(y.size)
-    w = weights
-
-    # cut out any years for this gridcell with zero weight
-    y = y[nonzero_weights]
-    x = x[nonzero_weights]
-    w = w[nonzero_weights]
-
-    # > Since we want a linear model that looks like y ~ β_1*x + β_0, we
-    # > need to add an extra array or vector of ones to our independent
-    # > variable, df.Tobacco because the statsmodels OLS() function does not
-    # > assume that we would like a constant or intercept intercept term,
-    # > β_0. This is not so uncommon as it would seem; several regression
-    # > packages make this requirement.
-    #
-    # http://connor-johnson.com/2014/02/18/linear-regression-with-python/
-    #
-    # Additionally, this matches the algorithm used in the code for V2 of
-    # the Sea Ice Index:
-    #  https://bitbucket.org/nsidc/seaice_projects/src/v2.0.0/source/seaice_index/idl/
-    x = sm.add_constant(x)
-
-    # "WLS" = "Weighted Least Squares"
-    result = sm.WLS(y, x, weights=w).fit()
-
-    # reject the computed trend if the uncertainty is too high
-    if result.f_pvalue > MAXIMUM_F_TEST_P_VALUE:
-        return 0
-
-    # concentration change per year
-    slope = result.params[1]
-    # concentration change per decade
-    slope = slope * 10
-
-    # Apply clipping after calculating the final decadal trend value
-    if slope > clipping_threshold:
-        return clipping_threshold
-
-    if slope < -clipping_threshold:
-        return -clipping_threshold
-
-    return slope
+
+    def __init__(self):
+        self.count = None
+        self.mean = None
+        self.m2 = None
+
+    def add(self, grid, valid_data_range):
+        """Add the values of grid, a 2D array or masked array; masked values and
+        values outside valid_data_range are left out."""
+        values = np.ma.getdata(grid).astype(np.float64)
+        valid = ~(np.ma.getmaskarray(grid) |
+                  (values < valid_data_range[0]) | (values > valid_data_range[1]))
+
+        if self.count is None:
+            self.count = np.zeros(values.shape, dtype=np.int64)
+            self.mean = np.zeros(values.shape, dtype=np.float64)
+            self.m2 = np.zeros(values.shape, dtype=np.float64)
+
+        self.count += valid
+        delta = np.where(valid, values - self.mean, 0)
+        self.mean += np.where(valid, delta / np.maximum(self.count, 1), 0)
+        self.m2 += np.where(valid, delta * (values - self.mean), 0)
+
+    def std(self):
+        """Return the standard deviations as a masked array, masked, with a value
+        of 0, where a gridcell has no values."""
+        empty = self.count == 0
+        variance = np.where(empty, 0, self.m2) / np.maximum(self.count, 1)
+        return np.ma.array(np.sqrt(variance), mask=empty)
 
 
 def _trend_grid(concentration_cube, weight_cube, *, clipping_threshold):
-    """Build a grid for a decadal trend."""
+    """Build a grid for a decadal trend.
+
+    The trend of each gridcell is the slope of a weighted least squares (WLS)
+    line of best fit through its concentrations, where "x" is time in years
+    (the index of the layer) and the weights come from weight_cube. Since the
+    slope is the average annual change, it is multiplied by 10 to get the
+    decadal change, and then clipped to +/- clipping_threshold.
+
+    Layers with zero weight are left out of a gridcell's fit. The trend is 0
+    where fewer than 3 layers have nonzero weight, or where the p-value of the
+    fit's F-test is above MAXIMUM_F_TEST_P_VALUE, i.e., the uncertainty is too
+    high. It is NaN where a layer with nonzero weight has a NaN concentration.
+
+    This gives the same results as fitting each gridcell with
+    statsmodels.api.WLS(y, statsmodels.api.add_constant(x), weights=w), as did
+    the code for V2 of the Sea Ice Index:
+    https://bitbucket.org/nsidc/seaice_projects/src/v2.0.0/source/seaice_index/idl/
+    but computes every gridcell at once (see TrendStatistics).
+
+    """
     assert concentration_cube.shape == weight_cube.shape
     assert clipping_threshold
 
-    rows, cols, periods = weight_cube.shape
+    statistics = TrendStatistics.from_cubes(concentration_cube, weight_cube)
+    return statistics.trend(clipping_threshold=clipping_threshold)
 
-    # Flatten rows and cols of the concentration/weight cubes
-    # A shape of (448, 304, 41) becomes (136192, 41)
-    flattened_concentration_cube = concentration_cube.reshape((rows * cols, periods))
-    flattened_weight_cube = weight_cube.reshape((rows * cols, periods))
 
-    fn = partial(_trend_gridcell, clipping_threshold=clipping_threshold)
-    args = zip(flattened_concentration_cube, flattened_weight_cube)
-    with ThreadPool() as p:
-        results = p.starmap(fn, args)
+class TrendStatistics(object):
+    """The weighted statistics of each gridcell that its trend is computed from:
+    the sum of the weights, the weighted means of x (the index of the layer)
+    and y (the concentration), the weighted sums of squared and cross
+    deviations from those means, and the number of points with nonzero
+    weight.
 
-    trend_grid = np.array(results).reshape(rows, cols)
+    They hold the same information as the weighted sums of x, y, x^2, xy and
+    y^2, but do not lose precision to cancellation. Statistics of consecutive
+    ranges of layers are combined with merge(), so a trend can be extended by
+    a year without the concentrations of the years before it.
+
+    """
 
-    return trend_grid
+    FIELDS = ('weight_sum', 'mean_x', 'mean_y', 'sxx', 'sxy', 'syy', 'points')
+
+    def __init__(self, weight_sum, mean_x, mean_y, sxx, sxy, syy, points):
+        self.weight_sum = weight_sum
+        self.mean_x = mean_x
+        self.mean_y = mean_y
+        self.sxx = sxx
+        self.sxy = sxy
+        self.syy = syy
+        self.points = points
+
+    @classmethod
+    def from_cubes(cls, concentration_cube, weight_cube, first_x=0):
+        """Return the statistics of the layers of the given cubes, the first of
+        which has x = first_x."""
+        rows, cols, periods = weight_cube.shape
+
+        # Flatten rows and cols of the concentration/weight cubes
+        # A shape of (448, 304, 41) becomes (136192, 41)
+        w = weight_cube.reshape((rows * cols, periods)).astype(np.float64)
+        nonzero_weights = (w != 0)
+        # a NaN concentration only counts where it has nonzero weight
+        y = np.where(nonzero_weights, concentration_cube.reshape((rows * cols, periods)), 0.)
+        x = np.arange(first_x, first_x + periods, dtype=np.float64)
+
+        weight_sum = np.sum(w, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_x = np.where(weight_sum != 0, (w @ x) / weight_sum, 0.)
+            mean_y = np.where(weight_sum != 0, np.sum(w * y, axis=1) / weight_sum, 0.)
+
+        dx = x - mean_x[:, np.newaxis]
+        dy = y - mean_y[:, np.newaxis]
+
+        statistics = (weight_sum, mean_x, mean_y, np.sum(w * dx**2, axis=1),
+                      np.sum(w * dx * dy, axis=1), np.sum(w * dy**2, axis=1),
+                      np.count_nonzero(nonzero_weights, axis=1))
+
+        return cls(*(grid.reshape(rows, cols) for grid in statistics))
+
+    def merge(self, other):
+        """Return the statistics of the layers of both self and other."""
+        weight_sum = self.weight_sum + other.weight_sum
+        with np.errstate(divide='ignore', invalid='ignore'):
+            other_share = np.where(weight_sum != 0, other.weight_sum / weight_sum, 0.)
+        cross_weight = self.weight_sum * other_share
+
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+
+        return TrendStatistics(weight_sum,
+                               self.mean_x + dx * other_share,
+                               self.mean_y + dy * other_share,
+                               self.sxx + other.sxx + dx * dx * cross_weight,
+                               self.sxy + other.sxy + dx * dy * cross_weight,
+                               self.syy + other.syy + dy * dy * cross_weight,
+                               self.points + other.points)
+
+    def trend(self, *, clipping_threshold):
+        """Return the grid of decadal trends; see _trend_grid."""
+        # skip gridcells that don't have enough points to perform a linear
+        # regression
+        fitted = self.points >= 3
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # concentration change per year
+            slope = self.sxy / self.sxx
+
+            # F-test of the fit against a constant, as reported by
+            # statsmodels' f_pvalue: F = (explained sum of squares / 1) / (sum
+            # of squared residuals / (points - 2))
+            ess = slope * self.sxy
+            ssr = np.maximum(self.syy - ess, 0)
+            df_resid = np.where(fitted, self.points - 2, 1)
+            f_pvalue = scipy_special.fdtrc(1, df_resid, ess / (ssr / df_resid))
+
+        # reject the computed trend if the uncertainty is too high; a NaN
+        # p-value, e.g. from a perfect fit of constant values, is not rejected
+        rejected = ~fitted | (f_pvalue > MAXIMUM_F_TEST_P_VALUE)
+
+        # concentration change per decade, with clipping applied after
+        # calculating the final decadal trend value
+        trend = np.clip(slope * 10, -clipping_threshold, clipping_threshold)
+        trend[rejected] = 0
+
+        return trend
 
 
 def _weight_from_std(std):
@@ -0,0 +1,414 @@
+"""Monthly trends kept up to date a year at a time.
+
+A monthly trend (see seaice.data.trend.trend_gridset) is computed from the
+monthly concentration of every year since the start of the trend, weighted by
+the standard deviation of the year's daily concentrations. From one run to the
+next only the newest year changes, so when nt.TREND_STORE_PATH is set each
+hemisphere, month and start year has a store there:
+
+    trend_<hemisphere>_<month>_<start year>.npz
+
+holding, for the years it covers, the TrendStatistics of every gridcell, the
+standard deviation grid of each year, the state of the flag layer reduction,
+the largest pole hole and the metadata of each year's files. A trend that
+covers more years than its store is computed by folding the new years into the
+store, which is then saved again.
+
+Every year is recorded with a fingerprint of the path, size and mtime of each
+file its monthly concentration and standard deviation are read from, and of
+its bad days. The store is rebuilt from all of its years, reusing the standard
+deviations of the years whose fingerprints still match, when the fingerprint
+of a year it covers changes, when a new year's pole hole is larger than the
+pole hole of the years before it, or when any setting it depends on (the
+invalid ice mask, nt.LAST_DAY_WITH_VALID_FINAL_DATA, ...) changes.
+
+"""
+import hashlib
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import getter
+from . import gridset_filters as gf
+from . import locator
+from . import stores
+from . import trend
+from .planes import ConcentrationPlanes
+import seaice.datastore as sds
+import seaice.nasateam as nt
+
+log = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+
+
+def store_name(nt_hemi, month, start_year):
+    """Return the name of the store of the trends of the given hemisphere, month
+    and start year."""
+    return 'trend_{}_{:02}_{}.npz'.format(nt_hemi['short_name'], month, start_year)
+
+
+def trend_gridset(nt_hemi, year, month, search_paths,
+                  min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH,
+                  trend_start_year=None, *, clipping_threshold, workers=1):
+    """Return the gridset seaice.data.trend.trend_gridset computes for the given
+    arguments, from the store in nt.TREND_STORE_PATH. The standard deviations of
+    the years that are read are computed by `workers` processes.
+
+    metadata['data'] holds the 'weight', 'std', 'flag_layer' and 'trend_grid'
+    arrays, but not the 'concentration' and 'stacked_data' cubes, which are
+    not kept in the store.
+
+    """
+    dates = trend._datetime_index_for_trends(year, month, start_year=trend_start_year)
+    dates_by_year = sorted(dates.groupby(dates.year).items())
+    years = [year_ for year_, _ in dates_by_year]
+
+    config = _config_fingerprint(nt_hemi, month, min_days_for_valid_month)
+    fingerprints = _year_fingerprints(nt_hemi, dates_by_year, month, search_paths)
+
+    os.makedirs(nt.TREND_STORE_PATH, exist_ok=True)
+    path = os.path.join(nt.TREND_STORE_PATH, store_name(nt_hemi, month, years[0]))
+
+    store = TrendStore.load(path)
+    if store is not None and store.config != config:
+        log.info('settings changed since {} was saved; rebuilding it'.format(path))
+        store = None
+
+    builder = _StoreBuilder(nt_hemi, month, search_paths, min_days_for_valid_month, config,
+                            workers)
+
+    if store is None:
+        store = builder.rebuild(dates_by_year, fingerprints)
+        store.save(path)
+    elif store.fingerprints != fingerprints[:len(store.years)]:
+        if store.fingerprints[:len(years)] == fingerprints:
+            # the store covers later years than requested and is up to date
+            # for every requested year; leave it as it is
+            log.info('computing the trend to {} from the first {} years of {}'.format(
+                year, len(years), path))
+            store = builder.rebuild(dates_by_year, fingerprints, reuse=store)
+        else:
+            log.info('files changed since {} was saved; rebuilding it'.format(path))
+            store = builder.rebuild(dates_by_year, fingerprints, reuse=store)
+            store.save(path)
+    elif len(store.years) < len(years):
+        log.info('folding {} new years into {}'.format(len(years) - len(store.years), path))
+        store = builder.fold(store, dates_by_year, fingerprints)
+        store.save(path)
+
+    return store.gridset(nt_hemi, year, month, search_paths,
+                         clipping_threshold=clipping_threshold)
+
+
+class TrendStore(object):
+    """The state of a monthly trend over consecutive years, to which further years
+    are added by fold()."""
+
+    def __init__(self, config, shape):
+        self.config = config
+        self.years = []
+        self.fingerprints = []
+        self.std = []
+        self.year_metadata = []
+        self.gridset_metadata = None
+
+        self.statistics = None
+        self.flag_values = np.zeros(shape, dtype=np.uint8)
+        self.same = np.zeros(shape, dtype=bool)
+        self.flag_started = False
+        self.largest_pole_hole = np.zeros(shape, dtype=bool)
+        self.layers_with_data = 0
+
+    def fold(self, year, fingerprint, monthly_gridset, std_gridset):
+        """Add a year, given the gridset of its monthly concentration, as
+        ConcentrationPlanes with invalid ice dropped, and the gridset of its
+        standard deviations. Returns False, leaving the store unchanged, if the
+        year's pole hole is larger than the largest pole hole of the years
+        with data before it.
+
+        """
+        metadata = monthly_gridset['metadata']
+        planes = monthly_gridset['data'].copy()
+        pole_value = metadata['flags']['pole']
+
+        has_data = not np.all(planes.flags == metadata['missing_value'])
+        pole_hole = planes.flags == pole_value
+        if has_data and self.layers_with_data and np.any(pole_hole & ~self.largest_pole_hole):
+            return False
+
+        # like gf.apply_largest_pole_hole
+        self.largest_pole_hole |= pole_hole
+        if has_data:
+            planes.flags[self.largest_pole_hole] = pole_value
+            planes.concentration[self.largest_pole_hole] = 0
+            self.layers_with_data += 1
+
+        std = np.ma.getdata(std_gridset['data'])
+        weight = trend._weight_from_std(std)
+        statistics = trend.TrendStatistics.from_cubes(
+            planes.percent(fill_value=np.nan)[:, :, np.newaxis], weight[:, :, np.newaxis],
+            first_x=len(self.years))
+        self.statistics = statistics if self.statistics is None else self.statistics.merge(
+            statistics)
+
+        self._fold_flags(planes.flags, metadata['missing_value'])
+
+        if self.gridset_metadata is None:
+            self.gridset_metadata = {key: metadata[key]
+                                     for key in ('valid_data_range', 'flags', 'missing_value')}
+
+        self.years.append(year)
+        self.fingerprints.append(fingerprint)
+        self.std.append(std)
+        self.year_metadata.append(_year_metadata(metadata, std_gridset['metadata']))
+
+        return True
+
+    def _fold_flags(self, flags, missing_value):
+        """Fold a layer into the reduction of ConcentrationPlanes.flag_layer."""
+        flagged = flags != 0
+        skipped = np.any(flagged) and np.all((flags == missing_value) | ~flagged)
+
+        if self.flag_started:
+            if not skipped:
+                self.same &= flags == self.flag_values
+            return
+
+        if not skipped or not self.years:
+            self.flag_values = flags.copy()
+            self.same = flagged
+        self.flag_started = not skipped
+
+    def std_gridsets(self):
+        """Return a dict of the stored std gridset of each year, keyed by (year,
+        fingerprint)."""
+        return {(year, fingerprint): {'data': std, 'metadata': _std_metadata(metadata)}
+                for year, fingerprint, std, metadata in zip(
+                        self.years, self.fingerprints, self.std, self.year_metadata)}
+
+    def gridset(self, nt_hemi, year, month, search_paths, *, clipping_threshold):
+        """Return the trend gridset of the years in the store."""
+        trend_grid = self.statistics.trend(clipping_threshold=clipping_threshold)
+        flag_layer = np.ma.array(self.flag_values, mask=~self.same)
+        data = np.where(flag_layer.mask, trend_grid, flag_layer)
+
+        monthly_metadata = dict(self.gridset_metadata)
+        monthly_metadata['files'] = [metadata['files'] for metadata in self.year_metadata]
+        period_index = pd.PeriodIndex([], freq='M')
+        for metadata in self.year_metadata:
+            period_index = period_index.append(pd.PeriodIndex(metadata['periods'], freq='M'))
+        monthly_metadata['period_index'] = period_index
+
+        std_metadata = {'files': [], 'period_indexes': []}
+        for metadata in self.year_metadata:
+            if metadata['std'] is not None:
+                std_metadata['files'].append(metadata['std']['files'])
+                std_metadata['period_indexes'].append(
+                    pd.PeriodIndex(metadata['std']['periods'], freq='D'))
+
+        metadata = trend._trend_metadata(nt_hemi, search_paths, 'Monthly Trend',
+                                         monthly_metadata, std_metadata)
+        metadata['period'] = pd.Period('{}-{}'.format(year, month), freq='M')
+
+        std_cube = np.dstack(self.std)
+        metadata['data'] = {
+            'weight': trend._weight_from_std(std_cube),
+            'std': std_cube,
+            'flag_layer': flag_layer,
+            'trend_grid': trend_grid
+        }
+
+        return {'data': data, 'metadata': metadata}
+
+    def save(self, path):
+        """Write the store to the npz file at path, replacing it atomically."""
+        arrays = {name: getattr(self.statistics, name)
+                  for name in trend.TrendStatistics.FIELDS}
+        arrays.update({
+            'version': np.array(STORE_VERSION),
+            'config': np.array(self.config),
+            'years': np.array(self.years),
+            'fingerprints': np.array(self.fingerprints),
+            'std': np.dstack(self.std),
+            'flag_values': self.flag_values,
+            'same': self.same,
+            'flag_started': np.array(self.flag_started),
+            'largest_pole_hole': self.largest_pole_hole,
+            'layers_with_data': np.array(self.layers_with_data),
+            'metadata': np.array(json.dumps({'years': self.year_metadata,
+                                             'gridset': self.gridset_metadata},
+                                            default=stores.json_default))
+        })
+
+        stores.save_npz(path, arrays)
+
+        log.info('wrote the trend statistics of {} years to {}'.format(len(self.years), path))
+
+    @classmethod
+    def load(cls, path):
+        """Return the store saved at path, or None if there is none or it cannot be
+        read."""
+        def read(npz):
+            metadata = json.loads(str(npz['metadata']))
+            std = npz['std']
+
+            store = cls(str(npz['config']), std.shape[:2])
+            store.years = [int(year) for year in npz['years']]
+            store.fingerprints = [str(fingerprint) for fingerprint in npz['fingerprints']]
+            store.std = [std[:, :, layer] for layer in range(std.shape[2])]
+            store.year_metadata = metadata['years']
+            store.gridset_metadata = metadata['gridset']
+            store.gridset_metadata['valid_data_range'] = tuple(
+                store.gridset_metadata['valid_data_range'])
+
+            store.statistics = trend.TrendStatistics(
+                *(npz[name] for name in trend.TrendStatistics.FIELDS))
+            store.flag_values = npz['flag_values']
+            store.same = npz['same']
+            store.flag_started = bool(npz['flag_started'])
+            store.largest_pole_hole = npz['largest_pole_hole']
+            store.layers_with_data = int(npz['layers_with_data'])
+            return store
+
+        return stores.load_npz(path, STORE_VERSION, read, 'trend store')
+
+
+class _StoreBuilder(object):
+    """Reads the years of a trend and folds them into a TrendStore."""
+
+    def __init__(self, nt_hemi, month, search_paths, min_days_for_valid_month, config,
+                 workers=1):
+        self.nt_hemi = nt_hemi
+        self.month = month
+        self.search_paths = search_paths
+        self.min_days_for_valid_month = min_days_for_valid_month
+        self.config = config
+        self.workers = workers
+        self.invalid_ice_mask = nt.invalid_ice_mask(nt_hemi, month)
+
+    def fold(self, store, dates_by_year, fingerprints):
+        """Fold the years of dates_by_year that are not yet in store into it,
+        rebuilding it if a new year's pole hole is larger than the store's."""
+        reuse = store.std_gridsets()
+        new_years = len(store.years)
+        reuse.update(self._std_gridsets(dates_by_year[new_years:], fingerprints[new_years:],
+                                        reuse))
+
+        for (year, dates), fingerprint in zip(dates_by_year[new_years:],
+                                              fingerprints[new_years:]):
+            std_gridset = reuse[(year, fingerprint)]
+            if not store.fold(year, fingerprint, self._monthly_gridset(year), std_gridset):
+                log.info('the pole hole of {} is larger than the pole hole of the years before '
+                         'it; rebuilding the trend statistics'.format(year))
+                return self._rebuild(dates_by_year, fingerprints, reuse)
+
+        return store
+
+    def rebuild(self, dates_by_year, fingerprints, reuse=None):
+        """Return a new store of every year of dates_by_year, reusing the std grids
+        of reuse, a TrendStore, for the years whose fingerprints match."""
+        return self._rebuild(dates_by_year, fingerprints,
+                             {} if reuse is None else reuse.std_gridsets())
+
+    def _rebuild(self, dates_by_year, fingerprints, reuse):
+        reuse = dict(reuse)
+        reuse.update(self._std_gridsets(dates_by_year, fingerprints, reuse))
+
+        monthly_gridsets = [self._monthly_gridset(year) for year, _ in dates_by_year]
+
+        store = TrendStore(self.config, self.nt_hemi['shape'])
+        for gridset in monthly_gridsets:
+            store.largest_pole_hole |= (gridset['data'].flags ==
+                                        gridset['metadata']['flags']['pole'])
+
+        for (year, dates), fingerprint, gridset in zip(dates_by_year, fingerprints,
+                                                       monthly_gridsets):
+            store.fold(year, fingerprint, gridset, reuse[(year, fingerprint)])
+
+        return store
+
+    def _monthly_gridset(self, year):
+        gridset = getter.concentration_monthly(self.nt_hemi, year, self.month, self.search_paths)
+        gridset['data'] = ConcentrationPlanes.from_data(gridset['data'],
+                                                        gridset['metadata']['valid_data_range'])
+        return gf.drop_invalid_ice(self.invalid_ice_mask, gridset)
+
+    def _std_gridsets(self, dates_by_year, fingerprints, reuse):
+        """Return a dict of the std gridsets of the years of dates_by_year missing
+        from reuse, keyed by (year, fingerprint)."""
+        missing = [((year, fingerprint), dates)
+                   for (year, dates), fingerprint in zip(dates_by_year, fingerprints)
+                   if (year, fingerprint) not in reuse]
+
+        std_gridsets = trend._std_gridsets_by_year(
+            trend._daily_std_gridset_for_year,
+            [(self.nt_hemi, year, self.month, dates, self.search_paths,
+              self.min_days_for_valid_month) for (year, _), dates in missing],
+            self.workers)
+
+        return {key: std_gridset for (key, _), std_gridset in zip(missing, std_gridsets)}
+
+
+def _year_metadata(monthly_metadata, std_metadata):
+    """Return the JSON serializable metadata of a year's files."""
+    std = None
+    if std_metadata is not None:
+        std = {'files': std_metadata['files'],
+               'periods': [str(period) for period in std_metadata['period_index']]}
+
+    return {'files': monthly_metadata['files'],
+            'periods': [str(period) for period in monthly_metadata['period_index']],
+            'std': std}
+
+
+def _std_metadata(year_metadata):
+    """Return the std gridset metadata of a year's files, the inverse of
+    _year_metadata."""
+    if year_metadata['std'] is None:
+        return None
+    return {'files': year_metadata['std']['files'],
+            'period_index': pd.PeriodIndex(year_metadata['std']['periods'], freq='D')}
+
+
+def _config_fingerprint(nt_hemi, month, min_days_for_valid_month):
+    """Return a fingerprint of the settings a store's trend statistics depend on."""
+    invalid_ice_mask = np.ascontiguousarray(nt.invalid_ice_mask(nt_hemi, month), dtype=bool)
+
+    config = [STORE_VERSION, nt_hemi['short_name'], month, min_days_for_valid_month,
+              nt.MINIMUM_DAYS_FOR_VALID_MONTH, str(nt.LAST_DAY_WITH_VALID_FINAL_DATA),
+              list(nt.VALID_DATA_RANGE), nt.SCALE, sorted(nt.FLAGS.items()),
+              list(invalid_ice_mask.shape), hashlib.sha1(invalid_ice_mask.tobytes()).hexdigest()]
+
+    return hashlib.sha1(json.dumps(config).encode('utf-8')).hexdigest()
+
+
+def _year_fingerprints(nt_hemi, dates_by_year, month, search_paths):
+    """Return a fingerprint of the files and bad days each year's monthly
+    concentration and standard deviation are computed from."""
+    bad_days = {str(period) for period in sds.get_bad_days_for_hemisphere(nt_hemi['short_name'])}
+
+    # standard deviations are computed from the daily files found in the
+    # default search paths
+    path_lists = [search_paths]
+    if list(search_paths) != list(nt.DEFAULT_SEA_ICE_PATHS):
+        path_lists.append(nt.DEFAULT_SEA_ICE_PATHS)
+
+    fingerprints = []
+    for year, dates in dates_by_year:
+        files = {locator.monthly_file_path(nt_hemi, year, month, search_paths)}
+        for paths in path_lists:
+            files.update(locator.all_daily_file_paths_for_month(nt_hemi, year, month, paths))
+        files.discard(None)
+
+        sources = stores.file_stats(sorted(files))
+
+        year_bad_days = sorted(bad_days & {str(date.date()) for date in dates})
+
+        fingerprints.append(hashlib.sha1(
+            json.dumps([sources, year_bad_days]).encode('utf-8')).hexdigest())
+
+    return fingerprints
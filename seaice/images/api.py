@@ -4,18 +4,20 @@ import logging
 import os
 
 import numpy as np
-from scipy.ndimage.interpolation import zoom
 
 from . import config
 from . import geotiff
 from . import image
 from .errors import SeaIceImagesNoData
+from seaice.lazy_import import lazy_import
 from seaice.logging import log_duration
 import seaice.nasateam as nt
 import seaice.data as sid
 
 log = logging.getLogger(__name__)
 
+zoom = lazy_import('scipy.ndimage.interpolation', 'zoom')
+
 # Factor used to upsample the input concentrations, the larger this is, the
 # smoother the extent images, but also the longer it takes to make one.
 BLUE_MARBLE_SCALE_FACTOR = 2
@@ -33,6 +35,7 @@ def ice_image(hemisphere, date,
               blue_marble=False,
               overwrite=True,
               trend_clipping_threshold=100,
+              trend_workers=1,
               **kwargs):
     """Create an image for the sea ice index. Returns a dict containing metadata
     about the created image.
@@ -68,6 +71,9 @@ def ice_image(hemisphere, date,
         with the blue marble background if True. Only compatible with 'extent' and
         'concentration' image types.
 
+    trend_workers: number of processes computing the standard deviations of the
+                   years of a trend image.
+
     kwargs: Any further values to override in the loading of the config.  for
             example to make a double sized image you would pass in
             `canvas={'scale': 2}`, this is passed to load_image_config,
@@ -104,7 +110,8 @@ def ice_image(hemisphere, date,
                                      data_type=image_type, year_range=cfg['year_range'],
                                      blue_marble=blue_marble,
                                      trend_start_year=cfg.get('trend_start_year', None),
-                                     trend_clipping_threshold=trend_clipping_threshold)
+                                     trend_clipping_threshold=trend_clipping_threshold,
+                                     trend_workers=trend_workers)
     except SeaIceImagesNoData:
         gridset = _nodata_background_gridset(nt_hemi, date, blue_marble)
         cfg['image_labels'].append('no_data')
@@ -425,7 +432,7 @@ def _land_coast_gridset(nt_hemi, date):
 
 def _get_ice_data(nt_hemi, date, temporality, allow_bad_data, cfg_in, data_type='concentration',
                   year_range=None, blue_marble=False, google=False, trend_start_year=None,
-                  trend_clipping_threshold=None):
+                  trend_clipping_threshold=None, trend_workers=1):
     """Get the seaicedata.gridset for the desired hemisphere, date, data type and temporality"""
     log.debug('_get_ice_data(data_type(%s), temporality(%s), blue_marble(%s)):',
               data_type, temporality, blue_marble)
@@ -478,7 +485,8 @@ def _get_ice_data(nt_hemi, date, temporality, allow_bad_data, cfg_in, data_type=
                                                       year=date.year,
                                                       month=date.month,
                                                       trend_start_year=trend_start_year,
-                                                      clipping_threshold=trend_clipping_threshold)
+                                                      clipping_threshold=trend_clipping_threshold,
+                                                      workers=trend_workers)
 
         else:
             raise NotImplementedError('{} {} images cannot be generated.'.format(temporality,
@@ -72,6 +72,9 @@ log = seaicelogging.init('seaice.images')
 @click.option('--trend-start-year', type=int, default=None,
               help=('YYYY. The earliest year to consider when calculating a monthly trend image.'
                     ' Defaults to the first year data is available for the selected month.'))
+@click.option('--trend-workers', type=click.IntRange(min=1), default=1,
+              help=('Number of processes computing the daily standard deviations of the years'
+                    ' of a trend image. Defaults to 1.'))
 # required options
 @click.option('-h', '--hemi', type=click.Choice(['N', 'S', 'N,S', 'S,N']), default='N,S',
               help=('Hemisphere. If none is specified, create images for both hemispheres.'))
@@ -164,7 +167,8 @@ def sii_image(**kwargs):
                       values=config['values'],
                       overwrite=config['overwrite'],
                       trend_start_year=config['trend_start_year'],
-                      trend_clipping_threshold=kwargs['trend_clip'])
+                      trend_clipping_threshold=kwargs['trend_clip'],
+                      trend_workers=kwargs['trend_workers'])
 
 
 if __name__ == '__main__':
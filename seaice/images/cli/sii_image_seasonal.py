@@ -1,4 +1,5 @@
 # Command line interface to generate seasonal sea ice images.
+from collections import Counter
 import copy
 import datetime as dt
 import os
@@ -29,6 +30,9 @@ DEFAULT_SEASONAL_CONFIG_FILE = os.path.join(os.path.dirname(__file__),
 @click.option('--trend', 'image_type', flag_value='trend',
               help='(image_type) Create trend image.')
 @click.option('--trend-clip', default=100, help='Clip all trends values exceeding threshold.')
+@click.option('--trend-workers', type=click.IntRange(min=1), default=1,
+              help=('Number of processes computing the daily standard deviations of the years'
+                    ' of a trend image. Defaults to 1.'))
 @click.option('-y', '--year', type=int, default=dt.date.today().year,
               help=('YYYY. Year defining the end year for the trend range. Defaults '
                     'to {}.'.format(dt.date.today().year)))
@@ -51,11 +55,15 @@ def sii_image_seasonal(**kwargs):
         kwargs['season'] = [kwargs['season']]
 
     config_filename = kwargs.pop('config_filename')
+    workers = kwargs.pop('trend_workers')
 
     count = len(hemis) * len(kwargs['season'])
     log.info('Creating {count} image{s}...'.format(count=count,
                                                    s='' if count == 1 else 's'))
 
+    # monthly gridsets shared by the seasons of each hemisphere
+    monthly_gridsets = {}
+
     # Iterate over all hemispheres and seasons, creating an image for each pair.
     for hemi, season in product(hemis, kwargs['season']):
         nt_hemi = nt.by_name(hemi)
@@ -71,6 +79,10 @@ def sii_image_seasonal(**kwargs):
         cfg['seasons'] = cfg.get('seasons', nt.SEASONS)
         nt.validate_seasons(cfg['seasons'])
 
+        if hemi not in monthly_gridsets:
+            monthly_gridsets[hemi] = sid.MonthlyGridsets(
+                months=_shared_months(cfg['seasons'], kwargs['season']))
+
         dates = nt.datetime_index_for_seasonal_trends(cfg['year'], tuple(cfg['seasons'][season]))
         cfg['year'] = dates[-1].year
 
@@ -94,7 +106,9 @@ def sii_image_seasonal(**kwargs):
             search_paths=nt.DEFAULT_SEA_ICE_PATHS,
             seasons=cfg.get('seasons', nt.SEASONS),
             min_days_for_valid_month=nt.MINIMUM_DAYS_FOR_VALID_MONTH,
-            clipping_threshold=kwargs['trend_clip']
+            clipping_threshold=kwargs['trend_clip'],
+            workers=workers,
+            monthly_gridsets=monthly_gridsets[hemi]
         )
 
         # generating the trend gridset with seaicedata takes a few minutes; this
@@ -124,6 +138,13 @@ def sii_image_seasonal(**kwargs):
         image.make_image(gridset['data'], cfg)
 
 
+def _shared_months(seasons, season_names):
+    """Return the months in more than one of the named seasons; only their monthly
+    gridsets are worth keeping between seasons."""
+    counts = Counter(month for name in season_names for month in seasons[name])
+    return {month for month, count in counts.items() if count > 1}
+
+
 def _set_output(cfg, hemi, season, output):
     cfg = copy.deepcopy(cfg)
 
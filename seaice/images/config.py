@@ -7,16 +7,18 @@ import tempfile
 import yaml
 import zipfile
 
-import fiona
-import rasterio
 import numpy as np
-from shapely.geometry import MultiLineString
 
 from .errors import SeaIceImagesBadConfiguration
 from .errors import SeaIceImagesNotImplementedError
+from seaice.lazy_import import lazy_import
 import seaice.nasateam as nt
 import seaice.timeseries as sit
 
+fiona = lazy_import('fiona')
+rasterio = lazy_import('rasterio')
+MultiLineString = lazy_import('shapely.geometry', 'MultiLineString')
+
 
 DEFAULT_CONFIG_FILE = os.path.join(os.path.dirname(__file__), 'ancillary', 'config.yml')
 
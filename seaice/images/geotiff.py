@@ -1,10 +1,15 @@
 import logging
-from matplotlib import colors
-from osgeo import gdal, osr, gdal_array
+
+from seaice.lazy_import import lazy_import
 
 
 log = logging.getLogger(__name__)
 
+colors = lazy_import('matplotlib.colors')
+gdal = lazy_import('osgeo.gdal')
+osr = lazy_import('osgeo.osr')
+gdal_array = lazy_import('osgeo.gdal_array')
+
 
 def make_geotiff(cfg, nt_hemi, gridset):
     """Makes a geotiff representation of a given gridset."""
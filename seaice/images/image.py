@@ -5,26 +5,41 @@ import logging
 import os
 import time
 
-import cartopy
-import cartopy.crs as ccrs
-import fiona
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-plt.switch_backend('AGG')  # noqa
-import matplotlib.patheffects as path_effects
-import matplotlib.patches as patches
 import numpy as np
-from scipy.ndimage.interpolation import zoom
-from shapely.geometry import MultiLineString
 
 from . import config
 from . import util
+from seaice.lazy_import import lazy_import
 from seaice.logging import log_duration
 
 
 log = logging.getLogger(__name__)
 
 
+def _import_cartopy_feature(module):
+    import cartopy.feature  # noqa
+
+
+def _use_agg_backend(module):
+    import matplotlib.pyplot
+    if matplotlib.pyplot.get_backend().lower() != 'agg':
+        matplotlib.pyplot.switch_backend('AGG')
+
+
+# matplotlib, cartopy, fiona and shapely are imported on first use; matplotlib
+# is switched to the AGG backend, with pyplot and its submodules loaded, as
+# soon as any of its modules is
+cartopy = lazy_import('cartopy', on_import=_import_cartopy_feature)
+ccrs = lazy_import('cartopy.crs')
+fiona = lazy_import('fiona')
+mpl = lazy_import('matplotlib', on_import=_use_agg_backend)
+plt = lazy_import('matplotlib.pyplot', on_import=_use_agg_backend)
+path_effects = lazy_import('matplotlib.patheffects', on_import=_use_agg_backend)
+patches = lazy_import('matplotlib.patches', on_import=_use_agg_backend)
+MultiLineString = lazy_import('shapely.geometry', 'MultiLineString')
+zoom = lazy_import('scipy.ndimage.interpolation', 'zoom')
+
+
 def _add_locations(ax, locations, loc_kwargs, loc_path_effects):
     loc_kwargs = loc_kwargs or {}
 
@@ -133,7 +133,8 @@ class Test__get_ice_data(unittest.TestCase):
                                                             month=10,
                                                             year=2014,
                                                             trend_start_year=None,
-                                                            clipping_threshold=None)
+                                                            clipping_threshold=None,
+                                                            workers=1)
 
     @patch('seaice.data.concentration_monthly_trend')
     def test_sid_concentration_monthly_trend_start_year(self, mock_concentration_monthly_trend):
@@ -145,7 +146,8 @@ class Test__get_ice_data(unittest.TestCase):
                                                             month=10,
                                                             year=2014,
                                                             trend_start_year=2010,
-                                                            clipping_threshold=None)
+                                                            clipping_threshold=None,
+                                                            workers=1)
 
 
 class Test__land_coast_grid(unittest.TestCase):
@@ -47,7 +47,8 @@ class Test_sii_image(unittest.TestCase):
                            'values': {},
                            'overwrite': True,
                            'trend_start_year': None,
-                           'trend_clipping_threshold': 100}
+                           'trend_clipping_threshold': 100,
+                           'trend_workers': 1}
         conc_mock.assert_called_with(**expected_kwargs)
 
     @patch('seaice.images.api.ice_image')
@@ -73,7 +74,8 @@ class Test_sii_image(unittest.TestCase):
                            'values': {},
                            'overwrite': True,
                            'trend_start_year': None,
-                           'trend_clipping_threshold': 100}
+                           'trend_clipping_threshold': 100,
+                           'trend_workers': 1}
         conc_mock.assert_called_with(**expected_kwargs)
 
     @patch('seaice.images.api.ice_image')
@@ -100,7 +102,8 @@ class Test_sii_image(unittest.TestCase):
                            'values': {},
                            'overwrite': True,
                            'trend_start_year': None,
-                           'trend_clipping_threshold': 100}
+                           'trend_clipping_threshold': 100,
+                           'trend_workers': 1}
         conc_mock.assert_called_with(**expected_kwargs)
 
     @patch('seaice.images.api.ice_image')
@@ -128,7 +131,8 @@ class Test_sii_image(unittest.TestCase):
                            'values': {},
                            'overwrite': True,
                            'trend_start_year': None,
-                           'trend_clipping_threshold': 100}
+                           'trend_clipping_threshold': 100,
+                           'trend_workers': 1}
         conc_mock.assert_called_with(**expected_kwargs)
 
     @patch('seaice.images.api.ice_image')
@@ -158,7 +162,8 @@ class Test_sii_image(unittest.TestCase):
                            'values': {},
                            'overwrite': True,
                            'trend_start_year': None,
-                           'trend_clipping_threshold': 100}
+                           'trend_clipping_threshold': 100,
+                           'trend_workers': 1}
         conc_mock.assert_called_with(**expected_kwargs)
 
     @patch('seaice.images.api.ice_image')
@@ -189,7 +194,8 @@ class Test_sii_image(unittest.TestCase):
                            'values': {},
                            'overwrite': True,
                            'trend_start_year': None,
-                           'trend_clipping_threshold': 100}
+                           'trend_clipping_threshold': 100,
+                           'trend_workers': 1}
         img_mock.assert_called_with(**expected_kwargs)
 
     @patch('os.path.isdir')
@@ -218,7 +224,8 @@ class Test_sii_image(unittest.TestCase):
                            'values': {},
                            'overwrite': True,
                            'trend_start_year': None,
-                           'trend_clipping_threshold': 100}
+                           'trend_clipping_threshold': 100,
+                           'trend_workers': 1}
 
         kwargs1 = copy.deepcopy(expected_kwargs)
         kwargs1['date'] = dt.date(2011, 12, 11)
@@ -254,7 +261,8 @@ class Test_sii_image(unittest.TestCase):
                            'values': {},
                            'overwrite': True,
                            'trend_start_year': None,
-                           'trend_clipping_threshold': 100}
+                           'trend_clipping_threshold': 100,
+                           'trend_workers': 1}
 
         conc_mock.assert_called_with(**expected_kwargs)
 
@@ -283,7 +291,8 @@ class Test_sii_image(unittest.TestCase):
                            'values': {},
                            'overwrite': True,
                            'trend_start_year': None,
-                           'trend_clipping_threshold': 100}
+                           'trend_clipping_threshold': 100,
+                           'trend_workers': 1}
 
         conc_mock.assert_called_with(**expected_kwargs)
 
@@ -312,10 +321,23 @@ class Test_sii_image(unittest.TestCase):
                            'values': {},
                            'overwrite': True,
                            'trend_start_year': 2010,
-                           'trend_clipping_threshold': 100}
+                           'trend_clipping_threshold': 100,
+                           'trend_workers': 1}
 
         conc_mock.assert_called_with(**expected_kwargs)
 
+    @patch('seaice.images.api.ice_image')
+    def test_calls_api_trend_with_workers(self, conc_mock):
+        runner = CliRunner()
+        env = {'LOG_FILE': 'local_logfile.log'}
+
+        cmd_line_args = ['-h', 'N', '-y', '2018', '-m', '1', '--monthly', '--trend',
+                         '--trend-workers', 4]
+
+        runner.invoke(sii_image.sii_image, cmd_line_args, env=env)
+
+        self.assertEqual(conc_mock.call_args[1]['trend_workers'], 4)
+
 
 class Test_YearRange(unittest.TestCase):
     def test_converts_string_to_tuple(self):
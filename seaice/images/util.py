@@ -2,15 +2,19 @@ import logging
 import os
 import pickle
 
-import cartopy.crs as ccrs
 import numpy as np
-import rasterio
-from rasterio.crs import CRS as rcrs
-from rasterio import warp
 
+from seaice.lazy_import import lazy_import
 from seaice.logging import log_duration
 import seaice.nasateam as nt
 
+rasterio = lazy_import('rasterio')
+rcrs = lazy_import('rasterio.crs', 'CRS')
+warp = lazy_import('rasterio.warp')
+
+# defined in its own module, since it subclasses a cartopy projection
+BlueMarbleProj = lazy_import('seaice.images.blue_marble_proj', 'BlueMarbleProj')
+
 log = logging.getLogger(__name__)
 
 
@@ -240,87 +244,6 @@ def _reproj_grid(src_grid, src_crs, src_transform,
     return dst_data
 
 
-class BlueMarbleProj(ccrs.Projection):
-    """Custom projection for blue marble images. Parameters default to
-    northern hemisphere.
-
-    Arguments:
-    ---------
-        satellite_height: perspective height above the earth that the 'satellite'
-        is viewing from.
-
-        center_lat: The latitude that will be placed at the center of the map's geo-axes
-
-        center_lon: The longitude that will be placed at the center of the map's geo-axes
-
-        x_lims: The x limits (min, max) of the projection. The default can be used for
-        both north and south blue marble images. The default was obtained by adding
-        a pixel's worth of space in projected coordinates (1920.54) to each side of the
-        maximum projected bounds of the blue marble image.
-
-        y_lims: The y limits (min, max) of the projection. The default can be used for
-        both north and south blue marble images. The default was obtained by adding
-        a pixel's worth of space in projected coordinates (1920.54) to the top and bottom of the
-        maximum projected bounds of the blue marble image.
-
-    Note:
-    -----
-        - It appears that version >0.14 of cartopy will natively support this projection
-        as 'NearsidePerspective'
-
-        - The default max_x and max_y are values obtained from projecting the blue-marble image
-        and then looking at it's max x/y. Cartopy needs these values because it determines
-        the size and shape of the projected space.
-    """
-    def __init__(self, satellite_height=9000000.0,
-                 central_latitude=78.0, central_longitude=-45.0,
-                 x_lims=(-4098880.759621147, 4098002.0879747514),
-                 y_lims=(-4104056.811265956, 4104157.247400926)):
-
-        proj4_params = [
-             ('h', satellite_height),
-             ('lat_0', central_latitude),
-             ('lon_0', central_longitude),
-             ('proj', 'nsper'),
-             ('units', 'm'),
-             ('x_0', 0),
-             ('y_0', 0)
-        ]
-        super(BlueMarbleProj, self).__init__(proj4_params, globe=None)
-
-        # Set the semimajor and semiminor axes to be
-        # half the distance across the image
-        x_radius = (abs(x_lims[0]) + abs(x_lims[1])) / 2
-        y_radius = (abs(y_lims[0]) + abs(y_lims[1])) / 2
-        semimajor = max(x_radius, y_radius)
-        semiminor = min(x_radius, y_radius)
-
-        # Create the projection's boundary.
-        coords = ccrs._ellipse_boundary(semimajor, semiminor,
-                                        0, 0, 61)
-        self._boundary = ccrs.sgeom.LinearRing(coords.T)
-
-        self._xlim = x_lims
-        self._ylim = y_lims
-        self._threshold = np.diff(self._xlim)[0] * 0.02
-
-    @property
-    def boundary(self):
-        return self._boundary
-
-    @property
-    def threshold(self):
-        return self._threshold
-
-    @property
-    def x_limits(self):
-        return self._xlim
-
-    @property
-    def y_limits(self):
-        return self._ylim
-
-
 def reproject_bm_image(dataset, cfg, proj, pickle_path=None):
     """Reproject a blue marble image from its native coordinate system
     to the given desination projection.
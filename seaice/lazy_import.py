@@ -0,0 +1,68 @@
+"""Stand-ins for modules, and objects of modules, that are imported the first
+time they are used.
+
+cartopy, rasterio, fiona, shapely, gdal, statsmodels, xarray and matplotlib
+each take from a few hundred milliseconds to seconds to import, and most
+commands that import the seaice modules using them never reach the code that
+does. Those modules import them with lazy_import instead of at the top:
+
+    plt = lazy_import('matplotlib.pyplot')           # import matplotlib.pyplot as plt
+    rcrs = lazy_import('rasterio.crs', 'CRS')         # from rasterio.crs import CRS as rcrs
+
+and use them as before; the import happens on the first attribute access or
+call.
+
+"""
+import importlib
+import threading
+
+
+class LazyImport(object):
+    """Stand-in for a module, or an attribute of a module, imported on first use."""
+
+    def __init__(self, module_name, attribute=None, on_import=None):
+        self._module_name = module_name
+        self._attribute = attribute
+        self._on_import = on_import
+        self._target = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    module = importlib.import_module(self._module_name)
+                    if self._on_import is not None:
+                        self._on_import(module)
+                    target = module
+                    if self._attribute is not None:
+                        target = getattr(module, self._attribute)
+                    self._target = target
+        return self._target
+
+    def __getattr__(self, name):
+        # only called for names not found on the stand-in itself; the check
+        # keeps copies made without __init__ from recursing
+        if name in ('_module_name', '_attribute', '_on_import', '_target', '_lock'):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self):
+        name = self._module_name
+        if self._attribute is not None:
+            name = '{}.{}'.format(name, self._attribute)
+        if self._target is None:
+            return '<lazy import of {} (not yet imported)>'.format(name)
+        return '<lazy import of {}>'.format(name)
+
+
+def lazy_import(module_name, attribute=None, on_import=None):
+    """Return a stand-in for the module named module_name, or for its attribute
+    named attribute, that imports the module the first time the stand-in is
+    used. on_import, if given, is called with the module once it is imported.
+
+    """
+    return LazyImport(module_name, attribute, on_import)
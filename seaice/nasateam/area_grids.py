@@ -2,6 +2,7 @@ import os
 
 import numpy as np
 
+from . import lazy
 from .constants import NORTH_SHAPE, SOUTH_SHAPE
 
 GRID_AREA_SCALE = 1000
@@ -14,9 +15,12 @@ NORTH_AREA_GRID_FILENAME = os.path.join(mask_dir, 'psn25area_v3.dat')
 SOUTH_AREA_GRID_FILENAME = os.path.join(mask_dir, 'pss25area_v3.dat')
 
 
-NORTH_AREA_GRID = np.fromfile(NORTH_AREA_GRID_FILENAME,
-                              dtype=np.uint32).reshape(*NORTH_SHAPE) / GRID_AREA_SCALE
+def _read_area_grid(filename, shape):
+    return np.fromfile(filename, dtype=np.uint32).reshape(*shape) / GRID_AREA_SCALE
 
 
-SOUTH_AREA_GRID = np.fromfile(SOUTH_AREA_GRID_FILENAME,
-                              dtype=np.uint32).reshape(*SOUTH_SHAPE) / GRID_AREA_SCALE
+# NORTH_AREA_GRID and SOUTH_AREA_GRID are read the first time they are used
+lazy.module_attributes(
+    __name__,
+    NORTH_AREA_GRID=lambda: _read_area_grid(NORTH_AREA_GRID_FILENAME, NORTH_SHAPE),
+    SOUTH_AREA_GRID=lambda: _read_area_grid(SOUTH_AREA_GRID_FILENAME, SOUTH_SHAPE))
@@ -57,6 +57,53 @@ LAST_DAY_WITH_VALID_FINAL_DATA = dt.date(2018, 12, 31)
 DEFAULT_FINAL_SEA_ICE_PATHS = ['.']
 DEFAULT_NRT_SEA_ICE_PATHS = ['.']
 
+# Path to the SQLite manifest of nasateam files (see seaice.data.manifest). When
+# None, the search paths are walked from scratch in every new process.
+FILE_MANIFEST_PATH = None
+
+# How seaice.data reads the body of each nasateam file: 'fromfile' copies it into
+# memory, 'mmap' maps it read-only so that processes reading the same files share
+# the operating system's file cache.
+NASATEAM_FILE_READER = 'fromfile'
+
+# Number of threads used to read the files for a single gridset.
+FILE_READ_THREADS = 8
+
+# Bytes of decoded nasateam grids kept in memory by seaice.data so that a file
+# read by several products in one process is only decoded once; 0 disables the
+# cache. A daily northern grid takes 136,192 bytes.
+DECODED_GRID_CACHE_BYTES = 256 * 1024 * 1024
+
+# Directory of the chunked nasateam archive built by the nasateam_cube_archive CLI
+# (see seaice.data.archive). When set, grids are read from the archive instead
+# of from the files whenever the archive holds every file requested.
+CUBE_ARCHIVE_PATH = None
+
+# npz file holding the twelve monthly NSIDC-0622 valid ice masks of each
+# hemisphere, written by the nasateam_valid_ice_mask_bundle CLI. loci_mask,
+# invalid_ice_mask and shore_mask load it once per process; a hemisphere missing
+# from it is read from the netCDF files in its 'valid_ice_mask_dir' instead.
+VALID_ICE_MASK_BUNDLE_PATH = os.path.join(os.path.dirname(__file__), 'pkg_data', 'masks',
+                                          'valid_ice_masks.npz')
+
+# Directory where seaice.data.trend keeps the weighted statistics and daily
+# standard deviations behind each monthly trend (see seaice.data.trend_store),
+# so that a trend is brought up to date by reading only its new years. None
+# computes every trend from all of its years.
+TREND_STORE_PATH = None
+
+# Directory where seaice.data.api.concentration_monthly_anomaly keeps the mean
+# grid, flag layer and pole hole of each monthly climatology (see
+# seaice.data.climatology_store), so that an anomaly reads only its own month.
+# None computes the climatology from all of its years on every call.
+CLIMATOLOGY_STORE_PATH = None
+
+# Directory where seaice.data.getter keeps the sums and counts behind the
+# monthly concentrations it averages from daily files (see
+# seaice.data.product_cache), so that each month's daily files are read once
+# for all processes. None reads them on every call.
+PRODUCT_CACHE_PATH = None
+
 
 DATA_FILENAME_MATCHER = re.compile(
     '(?P<filename>.*nt_{date}_{platform}_{version}_{hemi}\.bin)'.format(
@@ -2,6 +2,7 @@ import os
 
 import numpy as np
 
+from . import lazy
 from .constants import NORTH_SHAPE, SOUTH_SHAPE
 
 GRID_COORD_SCALE = 100000.
@@ -16,12 +17,14 @@ SOUTH_LAT_GRID_FILENAME = os.path.join(mask_dir, 'pss25lats_v3.dat')
 SOUTH_LON_GRID_FILENAME = os.path.join(mask_dir, 'pss25lons_v3.dat')
 
 
-NORTH_LAT_GRID = np.fromfile(NORTH_LAT_GRID_FILENAME,
-                             dtype=np.int32).reshape(*NORTH_SHAPE) / GRID_COORD_SCALE
-NORTH_LON_GRID = np.fromfile(NORTH_LON_GRID_FILENAME,
-                              dtype=np.int32).reshape(*NORTH_SHAPE) / GRID_COORD_SCALE
+def _read_coord_grid(filename, shape):
+    return np.fromfile(filename, dtype=np.int32).reshape(*shape) / GRID_COORD_SCALE
 
-SOUTH_LAT_GRID = np.fromfile(SOUTH_LAT_GRID_FILENAME,
-                              dtype=np.int32).reshape(*SOUTH_SHAPE) / GRID_COORD_SCALE
-SOUTH_LON_GRID = np.fromfile(SOUTH_LON_GRID_FILENAME,
-                              dtype=np.int32).reshape(*SOUTH_SHAPE) / GRID_COORD_SCALE
+
+# the grids are read the first time they are used
+lazy.module_attributes(
+    __name__,
+    NORTH_LAT_GRID=lambda: _read_coord_grid(NORTH_LAT_GRID_FILENAME, NORTH_SHAPE),
+    NORTH_LON_GRID=lambda: _read_coord_grid(NORTH_LON_GRID_FILENAME, NORTH_SHAPE),
+    SOUTH_LAT_GRID=lambda: _read_coord_grid(SOUTH_LAT_GRID_FILENAME, SOUTH_SHAPE),
+    SOUTH_LON_GRID=lambda: _read_coord_grid(SOUTH_LON_GRID_FILENAME, SOUTH_SHAPE))
@@ -1,8 +1,10 @@
 from .constants import NORTH_SHAPE, SOUTH_SHAPE
 from . import valid_ice_masks as masks
 from . import area_grids
+from .lazy import LazyDict
 
-NORTH = {
+# 'grid_areas' is read the first time it is used
+NORTH = LazyDict({
     'long_name': 'north',
     'short_name': 'N',
     'cols': NORTH_SHAPE[1],
@@ -11,7 +13,6 @@ NORTH = {
     'valid_ice_mask_dir': masks.NORTH_VALID_ICE_MASK_DIR,
     'valid_ice_mask_variable_name': masks.NORTH_INVALID_ICE_MASK_VARIABLE_NAME,
     'mask': masks.NORTH_MASK,
-    'grid_areas': area_grids.NORTH_AREA_GRID,
     'crs': 'EPSG:3411',
 
     # https://nsidc.org/data/polar-stereo/ps_grids.html
@@ -25,9 +26,9 @@ NORTH = {
         'shearing_x': 0,
         'shearing_y': 0
     }
-}
+}, grid_areas=lambda: area_grids.NORTH_AREA_GRID)
 
-SOUTH = {
+SOUTH = LazyDict({
     'long_name': 'south',
     'short_name': 'S',
     'cols': SOUTH_SHAPE[1],
@@ -36,7 +37,6 @@ SOUTH = {
     'valid_ice_mask_dir': masks.SOUTH_VALID_ICE_MASK_DIR,
     'valid_ice_mask_variable_name': masks.SOUTH_INVALID_ICE_MASK_VARIABLE_NAME,
     'mask': masks.SOUTH_MASK,
-    'grid_areas': area_grids.SOUTH_AREA_GRID,
     'crs': 'EPSG:3412',
 
     # https://nsidc.org/data/polar-stereo/ps_grids.html
@@ -50,7 +50,7 @@ SOUTH = {
         'shearing_x': 0,
         'shearing_y': 0
     }
-}
+}, grid_areas=lambda: area_grids.SOUTH_AREA_GRID)
 
 
 def by_name(id):
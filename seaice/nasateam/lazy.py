@@ -0,0 +1,132 @@
+"""Values of seaice.nasateam that are read from package data the first time
+they are used rather than when seaice.nasateam is imported."""
+import sys
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Module whose lazy attributes are loaded and kept on first access."""
+
+    def __getattr__(self, name):
+        loaders = self.__dict__.get('_lazy_loaders', {})
+        if name not in loaders:
+            raise AttributeError('module {!r} has no attribute {!r}'.format(self.__name__, name))
+
+        value = loaders[name]()
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.__dict__.get('_lazy_loaders', {})))
+
+
+def module_attributes(module_name, **loaders):
+    """Make each keyword argument a lazy attribute of the module named
+    module_name: its value is returned by calling the loader the first time the
+    attribute is accessed, and kept on the module.
+
+    usage, at the end of a module:
+
+        lazy.module_attributes(__name__, NORTH_AREA_GRID=_read_north_area_grid)
+
+    """
+    module = sys.modules[module_name]
+    module.__dict__.setdefault('_lazy_loaders', {}).update(loaders)
+    module.__class__ = _LazyModule
+
+
+class LazyDict(dict):
+    """dict holding some values that are loaded the first time they are used.
+
+    Looking up a lazy key loads only its value; anything that needs the whole
+    dict (iterating, copying, comparing, len, repr...) loads every lazy value
+    first, so it behaves exactly like the dict holding every value.
+
+    """
+
+    def __init__(self, values, **loaders):
+        super().__init__(values)
+        self._loaders = loaders
+
+    def __missing__(self, key):
+        if key not in self._loaders:
+            raise KeyError(key)
+        value = self._loaders.pop(key)()
+        dict.__setitem__(self, key, value)
+        return value
+
+    def _load(self):
+        for key in list(self._loaders):
+            self[key]
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __contains__(self, key):
+        return key in self._loaders or dict.__contains__(self, key)
+
+    def __setitem__(self, key, value):
+        self._loaders.pop(key, None)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._load()
+        dict.__delitem__(self, key)
+
+    def __iter__(self):
+        self._load()
+        return dict.__iter__(self)
+
+    def __len__(self):
+        return dict.__len__(self) + len(self._loaders)
+
+    def __eq__(self, other):
+        self._load()
+        if isinstance(other, LazyDict):
+            other._load()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        self._load()
+        return dict.__repr__(self)
+
+    def keys(self):
+        self._load()
+        return dict.keys(self)
+
+    def values(self):
+        self._load()
+        return dict.values(self)
+
+    def items(self):
+        self._load()
+        return dict.items(self)
+
+    def copy(self):
+        self._load()
+        return dict(self)
+
+    def pop(self, key, *default):
+        self._load()
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self._load()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        self._load()
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        self._load()
+        dict.update(self, *args, **kwargs)
+
+    def __reduce_ex__(self, protocol):
+        self._load()
+        return dict, (dict(self),)
@@ -4,7 +4,14 @@ from enum import Enum
 import numpy as np
 import os
 
-from scipy.ndimage.morphology import binary_dilation
+from . import constants
+
+# stored in the bundle for gridcells masked in the netCDF files
+BUNDLE_MASKED_VALUE = -1
+
+_bundles = {}
+_netcdf_loci_masks = {}
+_shore_masks = {}
 
 
 class Loci(Enum):
@@ -25,7 +32,21 @@ def shore_mask(hemisphere):
     shore      = 1 gridcell from landlike (Loci.shore)
     near_shore = 2 gridcells from landlike (Loci.near_shore)
     off_shore  = 3 gridcells from landlike (Loci.off_shore)
+
+    The mask is computed once per hemisphere and process; each call returns a
+    copy.
     """
+    key = (hemisphere['short_name'].upper(), constants.VALID_ICE_MASK_BUNDLE_PATH,
+           hemisphere['valid_ice_mask_dir'])
+    if key not in _shore_masks:
+        _shore_masks[key] = _shore_mask(hemisphere)
+    return _shore_masks[key].copy()
+
+
+def _shore_mask(hemisphere):
+    # imported here; scipy.ndimage takes longer to import than the rest of
+    # seaice.nasateam except pandas
+    from scipy.ndimage.morphology import binary_dilation
 
     # Structuring elements used in binary_dilation. They are pulled from
     # IDL, but they match exactly the elements used by default in pmalgos
@@ -75,10 +96,20 @@ def loci_mask(hemisphere, month):
     """Returns the 'Land Ocean Coast Ice' mask for the desired hemisphere and month.
     the returned masked is a numpy array with values enumerated
 
+    The masks are served from the bundle at nt.VALID_ICE_MASK_BUNDLE_PATH, loaded
+    once per process, or for a hemisphere missing from the bundle, from its
+    NSIDC-0622 netCDF file, read once per process. Each call returns a copy.
+
     """
-    ice_mask_dataset = Dataset(_invalid_ice_mask_filename(hemisphere, month), 'r')
-    mask = ice_mask_dataset.variables[hemisphere['valid_ice_mask_variable_name']][:]
-    return mask
+    masks = _bundled_loci_masks(hemisphere)
+    if masks is not None:
+        return masks[month - 1].copy()
+
+    filename = _invalid_ice_mask_filename(hemisphere, month)
+    if filename not in _netcdf_loci_masks:
+        _netcdf_loci_masks[filename] = _read_loci_mask(
+            filename, hemisphere['valid_ice_mask_variable_name'])
+    return _netcdf_loci_masks[filename].copy()
 
 
 def invalid_ice_mask(hemisphere, month):
@@ -112,3 +143,56 @@ def _invalid_ice_mask_filename(hemisphere, month):
         raise ValueError('Invalid hemisphere short_name')
 
     return mask_filename
+
+
+def loci_mask_bundle_arrays(hemispheres):
+    """Return the arrays of the bundle of loci masks read by loci_mask, to be
+    saved to an npz file (see the nasateam_valid_ice_mask_bundle CLI).
+
+    The twelve monthly masks of each hemisphere are read from the NSIDC-0622
+    netCDF files in its 'valid_ice_mask_dir' and returned as one int8 array of
+    shape (12, rows, cols), keyed by the hemisphere's short_name, with
+    BUNDLE_MASKED_VALUE in masked gridcells.
+
+    """
+    arrays = {}
+    for hemisphere in hemispheres:
+        masks = [_read_loci_mask(_invalid_ice_mask_filename(hemisphere, month),
+                                 hemisphere['valid_ice_mask_variable_name'])
+                 for month in range(1, 13)]
+        arrays[hemisphere['short_name'].upper()] = np.stack(
+            [np.ma.filled(mask, BUNDLE_MASKED_VALUE) for mask in masks]).astype(np.int8)
+
+    return arrays
+
+
+def _bundled_loci_masks(hemisphere):
+    """Return the masked array of shape (12, rows, cols) holding the hemisphere's
+    monthly loci masks in the bundle, or None if the bundle does not hold them."""
+    path = constants.VALID_ICE_MASK_BUNDLE_PATH
+    if path is None:
+        return None
+
+    if path not in _bundles:
+        _bundles[path] = _load_bundle(path)
+    return _bundles[path].get(hemisphere['short_name'].upper())
+
+
+def _load_bundle(path):
+    if not os.path.exists(path):
+        return {}
+
+    bundle = {}
+    with np.load(path) as arrays:
+        for name in arrays.files:
+            values = arrays[name]
+            if np.any(values == BUNDLE_MASKED_VALUE):
+                bundle[name] = np.ma.masked_equal(values, BUNDLE_MASKED_VALUE)
+            else:
+                bundle[name] = np.ma.array(values)
+    return bundle
+
+
+def _read_loci_mask(filename, variable_name):
+    with Dataset(filename, 'r') as dataset:
+        return dataset.variables[variable_name][:]
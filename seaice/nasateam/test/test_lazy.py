@@ -0,0 +1,72 @@
+from unittest import TestCase
+from unittest.mock import Mock
+import subprocess
+import sys
+
+import numpy as np
+import numpy.testing as npt
+
+import seaice.nasateam as nt
+import seaice.nasateam.area_grids as area_grids
+import seaice.nasateam.coord_grids as coord_grids
+from seaice.nasateam.lazy import LazyDict
+
+
+class Test_LazyDict(TestCase):
+
+    def setUp(self):
+        self.loader = Mock(return_value='loaded')
+        self.lazy = LazyDict({'a': 1}, b=self.loader)
+
+    def test_lazy_value_is_loaded_once_on_lookup(self):
+        self.assertEqual(1, self.lazy['a'])
+        self.loader.assert_not_called()
+
+        self.assertEqual('loaded', self.lazy['b'])
+        self.assertEqual('loaded', self.lazy.get('b'))
+
+        self.loader.assert_called_once_with()
+
+    def test_behaves_like_the_loaded_dict(self):
+        self.assertIn('b', self.lazy)
+        self.assertEqual(2, len(self.lazy))
+        self.assertEqual({'a': 1, 'b': 'loaded'}, dict(self.lazy))
+        self.assertEqual({'a': 1, 'b': 'loaded', 'c': 3}, dict(self.lazy, c=3))
+        self.assertEqual({'a': 1, 'b': 'loaded'}, self.lazy)
+        self.assertEqual(['a', 'b'], sorted(self.lazy))
+
+    def test_missing_keys_raise(self):
+        self.assertRaises(KeyError, lambda: self.lazy['c'])
+        self.assertIsNone(self.lazy.get('c'))
+
+    def test_setting_a_lazy_key_drops_its_loader(self):
+        self.lazy['b'] = 2
+
+        self.assertEqual(2, self.lazy['b'])
+        self.loader.assert_not_called()
+
+
+class Test_lazy_grids(TestCase):
+
+    def test_import_does_not_read_grids(self):
+        code = ('import sys, seaice.nasateam; '
+                'sys.exit("NORTH_AREA_GRID" in vars(sys.modules["seaice.nasateam.area_grids"]) '
+                'or dict.__contains__(seaice.nasateam.NORTH, "grid_areas"))')
+
+        self.assertEqual(0, subprocess.call([sys.executable, '-c', code]))
+
+    def test_area_grids(self):
+        expected = np.fromfile(area_grids.SOUTH_AREA_GRID_FILENAME,
+                               dtype=np.uint32).reshape(*nt.SOUTH['shape']) / 1000
+
+        npt.assert_array_equal(expected, area_grids.SOUTH_AREA_GRID)
+        self.assertIs(area_grids.SOUTH_AREA_GRID, nt.SOUTH['grid_areas'])
+        self.assertIs(area_grids.NORTH_AREA_GRID, nt.by_name('N')['grid_areas'])
+
+    def test_coord_grids(self):
+        from seaice.nasateam.coord_grids import NORTH_LAT_GRID
+
+        self.assertEqual(nt.NORTH['shape'], NORTH_LAT_GRID.shape)
+        self.assertIs(NORTH_LAT_GRID, coord_grids.NORTH_LAT_GRID)
+        self.assertTrue(np.all(coord_grids.SOUTH_LON_GRID <= 180))
+        self.assertRaises(AttributeError, lambda: coord_grids.NOT_A_GRID)
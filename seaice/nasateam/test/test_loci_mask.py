@@ -1,8 +1,23 @@
 from unittest import TestCase
+from unittest.mock import patch
+import importlib
+import os
+import shutil
+import tempfile
+
+from netCDF4 import Dataset
+import numpy as np
+import numpy.testing as npt
 
 import seaice.nasateam as nt
 from seaice.nasateam.loci_mask import _invalid_ice_mask_filename
 
+# seaice.nasateam.loci_mask is also the name of the function nt re-exports
+loci_mask = importlib.import_module('seaice.nasateam.loci_mask')
+
+MASK_DIR = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, os.pardir,
+                        'data', 'nsidc0622_valid_seaice_masks')
+
 
 class Test_InvalidIceMaskFilename(TestCase):
     def test_northern_hemisphere(self):
@@ -23,3 +38,79 @@ class Test_InvalidIceMaskFilename(TestCase):
         actual = _invalid_ice_mask_filename(hemisphere, month)
 
         self.assertEqual(actual, expected)
+
+
+class Test_loci_mask_bundle(TestCase):
+
+    def setUp(self):
+        self.mask_dir = tempfile.mkdtemp()
+        self.bundle_path = os.path.join(tempfile.mkdtemp(), 'valid_ice_masks.npz')
+
+        # only the January northern mask is available; use it for every month
+        source = os.path.join(MASK_DIR, 'NIC_valid_ice_mask.N25km.01.1972-2007.nc')
+        for month in range(1, 13):
+            os.symlink(os.path.abspath(source), os.path.join(
+                self.mask_dir, 'NIC_valid_ice_mask.N25km.{:02}.1972-2007.nc'.format(month)))
+
+        self.hemisphere = dict(nt.NORTH, valid_ice_mask_dir=self.mask_dir)
+        self.expected = Dataset(source).variables['valid_ice_flag'][:]
+        self._clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.mask_dir)
+        shutil.rmtree(os.path.dirname(self.bundle_path))
+        self._clear()
+
+    def _clear(self):
+        loci_mask._bundles.clear()
+        loci_mask._netcdf_loci_masks.clear()
+        loci_mask._shore_masks.clear()
+
+    def _write_bundle(self):
+        np.savez(self.bundle_path, **loci_mask.loci_mask_bundle_arrays([self.hemisphere]))
+
+    def test_masks_are_served_from_the_bundle(self):
+        self._write_bundle()
+
+        with patch('seaice.nasateam.constants.VALID_ICE_MASK_BUNDLE_PATH', self.bundle_path):
+            with patch.object(loci_mask, 'Dataset') as mock_dataset:
+                actual = [nt.loci_mask(self.hemisphere, month) for month in (1, 7, 12)]
+                invalid = nt.invalid_ice_mask(self.hemisphere, 7)
+
+        mock_dataset.assert_not_called()
+        for mask in actual:
+            self.assertEqual(np.int8, mask.dtype)
+            npt.assert_array_equal(self.expected, mask)
+        npt.assert_array_equal(self.expected != nt.NORTH['mask']['valid_ice'], invalid)
+
+    def test_masked_cells_survive_the_bundle(self):
+        masked = np.ma.array(self.expected, mask=self.expected == nt.NORTH['mask']['lake'])
+
+        with patch.object(loci_mask, '_read_loci_mask', return_value=masked):
+            self._write_bundle()
+
+        with patch('seaice.nasateam.constants.VALID_ICE_MASK_BUNDLE_PATH', self.bundle_path):
+            actual = nt.loci_mask(self.hemisphere, 3)
+
+        npt.assert_array_equal(masked.mask, actual.mask)
+        npt.assert_array_equal(masked.filled(0), actual.filled(0))
+
+    def test_netcdf_files_are_read_once_without_a_bundle(self):
+        with patch('seaice.nasateam.constants.VALID_ICE_MASK_BUNDLE_PATH', self.bundle_path):
+            with patch.object(loci_mask, 'Dataset', wraps=Dataset) as mock_dataset:
+                first = nt.loci_mask(self.hemisphere, 2)
+                first[0, 0] = 99
+                second = nt.loci_mask(self.hemisphere, 2)
+
+        self.assertEqual(1, mock_dataset.call_count)
+        npt.assert_array_equal(self.expected, second)
+
+    def test_shore_mask_is_computed_once(self):
+        with patch('seaice.nasateam.constants.VALID_ICE_MASK_BUNDLE_PATH', None):
+            with patch.object(loci_mask, 'Dataset', wraps=Dataset) as mock_dataset:
+                first = nt.shore_mask(self.hemisphere)
+                first[:] = 0
+                second = nt.shore_mask(self.hemisphere)
+
+        self.assertEqual(1, mock_dataset.call_count)
+        self.assertTrue(np.any(second == nt.Loci.shore.value))
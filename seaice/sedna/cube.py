@@ -1,5 +1,6 @@
 import numpy as np
 
+from seaice.data.planes import ConcentrationPlanes
 import seaice.nasateam as nt
 
 
@@ -94,6 +95,8 @@ class ConcentrationCube(object):
                 3 dimensions. If it is just a 2D grid, it is dstacked and stored
                 as a cube with height of 1. Values should be between 0 and 100,
                 representing fractional ice cover as percent coverage.
+                May also be ConcentrationPlanes (see seaice.data.planes), whose
+                flag plane is used in place of valid_data_range.
 
         Keyword Arguments:
         ------------------
@@ -106,7 +109,13 @@ class ConcentrationCube(object):
            -- valid_data_range. Defaults to (0., 100.).
 
         """
-        self.cube = np.ma.dstack([data]) if data.ndim == 2 else data
+        if isinstance(data, ConcentrationPlanes):
+            planes = data if data.ndim == 3 else ConcentrationPlanes.stack([data])
+            self.cube = planes
+            self._flag_cube = planes.flags
+        else:
+            self.cube = np.ma.dstack([data]) if data.ndim == 2 else data
+            self._flag_cube = self.cube.data
         self.missing_value = missing_value
         self.extent_threshold = extent_threshold
         self.invalid_data_mask = self._invalid_data_mask(invalid_data_mask)
@@ -114,7 +123,10 @@ class ConcentrationCube(object):
         self.pole_hole_value = flags['pole']
         self.valid_data_range = valid_data_range
 
-        self.data_cube = np.ma.masked_outside(self.cube, *self.valid_data_range)
+        if isinstance(self.cube, ConcentrationPlanes):
+            self.data_cube = self.cube.masked()
+        else:
+            self.data_cube = np.ma.masked_outside(self.cube, *self.valid_data_range)
 
         self.mean_data_grid = np.ma.mean(self.data_cube, axis=2)
 
@@ -196,7 +208,7 @@ class ConcentrationCube(object):
 
         if include_pole_hole:
             # True in the pole hole, False everywhere else
-            pole_hole_bool_grid = np.ma.all(self.cube.data == self.pole_hole_value, axis=2)
+            pole_hole_bool_grid = np.ma.all(self._flag_cube == self.pole_hole_value, axis=2)
 
             # add pole hole to total_extent_grid.data; total_extent_grid.mask is unaffected
             total_extent_grid = np.logical_or(total_extent_grid, pole_hole_bool_grid)
@@ -240,7 +252,7 @@ class ConcentrationCube(object):
 
     def _missing_binary_grid(self):
         """ Returns boolean grid that is True when every gridcell's layer value is missing."""
-        return self._mask_invalid(np.ma.all(self.cube.data == self.missing_value, axis=2))
+        return self._mask_invalid(np.ma.all(self._flag_cube == self.missing_value, axis=2))
 
     def _missing_grid(self):
         return self.missing_binary_grid.astype(np.int) * self.grid_areas
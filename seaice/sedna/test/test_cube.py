@@ -3,7 +3,9 @@ import unittest
 from numpy.testing import assert_array_equal
 import numpy as np
 
+from seaice.data.planes import ConcentrationPlanes
 from seaice.sedna.cube import ConcentrationCube as Cube
+import seaice.nasateam as nt
 
 
 ANYTHING = 9999.
@@ -673,3 +675,23 @@ class Test_grid_shape(unittest.TestCase):
         expected = (4, 3)
 
         self.assertTupleEqual(actual, expected)
+
+
+class Test_with_planes(unittest.TestCase):
+    def test_matches_cube_of_data(self):
+        raw = np.array([[[25, 50], [251, 251]],
+                        [[0, 255], [255, 255]],
+                        [[250, 100], [30, 253]]], dtype=np.uint8)
+        planes = ConcentrationPlanes.from_raw(raw)
+        grid_areas = np.array([[1., 2.], [3., 4.], [5., 6.]])
+        invalid_data_mask = np.array([[False, False], [False, True], [False, False]])
+
+        expected = Cube(np.ma.array(planes.to_data()), missing_value=255.,
+                        invalid_data_mask=invalid_data_mask, grid_areas=grid_areas,
+                        extent_threshold=15, flags=nt.FLAGS)
+        actual = Cube(planes, missing_value=255., invalid_data_mask=invalid_data_mask,
+                      grid_areas=grid_areas, extent_threshold=15, flags=nt.FLAGS)
+
+        self.assertEqual(expected.area(), actual.area())
+        self.assertEqual(expected.extent(), actual.extent())
+        self.assertEqual(expected.missing(), actual.missing())
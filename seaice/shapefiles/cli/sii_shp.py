@@ -13,6 +13,7 @@ import seaice.nasateam as nt
 import seaice.logging as seaicelogging
 from seaice.data import SeaIceDataNoData
 from seaice import version_flag
+from .. import grids
 from ..daily_median import daily_median
 from ..monthly_median_polyline import monthly_median_polyline
 from ..monthly_polyline import monthly_polyline
@@ -207,6 +208,8 @@ def cli(**kwargs):
             config = _conf_set_shape(config, 'polyline')
             configs = _confs_per_hemi(config)
             configs = _confs_per_period(configs, ['dayofyear'])
+            if len(config['date_index']) > 1:
+                configs = _confs_with_daily_median_grids(configs)
 
             shp_func_confs.extend(product([daily_median], configs))
 
@@ -360,6 +363,27 @@ def _confs_per_period(configs, keys):
     return confs
 
 
+def _confs_with_daily_median_grids(configs):
+    """Return the given daily median configs, one per hemi and dayofyear, with
+    their 'grid' set to the median extent grid for their dayofyear. The grids
+    of each hemi are computed together, reading its daily files once, instead
+    of each daily_median call reading the files of its own dayofyear.
+
+    """
+    configs_by_hemi = {}
+    for conf in configs:
+        configs_by_hemi.setdefault(conf['hemi']['short_name'], []).append(conf)
+
+    for hemi_configs in configs_by_hemi.values():
+        dayofyears = [conf['dayofyear'] for conf in hemi_configs]
+        median_grids = dict(grids.daily_median_grids(hemi_configs[0], dayofyears))
+
+        for conf in hemi_configs:
+            conf['grid'] = median_grids[conf['dayofyear']]
+
+    return configs
+
+
 def _set_defaults_temporal(config_in):
     """Return modified config when no temporal args are provided.
 
@@ -4,13 +4,14 @@ import tempfile
 import zipfile
 import logging
 
-import fiona
-from shapely import geometry
-
+from seaice.lazy_import import lazy_import
 import seaice.nasateam as nt
 
 log = logging.getLogger(__name__)
 
+fiona = lazy_import('fiona')
+geometry = lazy_import('shapely.geometry')
+
 OCEAN = 0
 ICE = 1
 COAST = nt.FLAGS['coast']
@@ -12,10 +12,14 @@ def daily_median(config):
 
     Arguments
     ---------
-    config: dictionary of settings from command-line
+    config: dictionary of settings from command-line; its 'grid', if set, is
+        the median extent grid to draw, computed with the grids of the other
+        days of the year (see grids.daily_median_grids)
 
     """
-    grid = grids.grid(config)
+    grid = config.pop('grid', None)
+    if grid is None:
+        grid = grids.grid(config)
 
     config['smoothing'] = True
     multilinestring = geom.multilinestring_from_grid(grid, config)
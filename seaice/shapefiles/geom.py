@@ -1,9 +1,11 @@
-from rasterio import features
-from shapely import geometry
 import numpy as np
 import pandas as pd
 
 from . import common
+from seaice.lazy_import import lazy_import
+
+features = lazy_import('rasterio.features')
+geometry = lazy_import('shapely.geometry')
 
 
 PIXEL_SIZE = 25e3  # each pixel in polar stereographic north is 25,000 meters
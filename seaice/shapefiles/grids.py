@@ -63,6 +63,32 @@ def grid(config, keep_flag_values=True, treat_coast_as_land=False):
     return _massage_grid(gridset['data'], keep_flag_values, treat_coast_as_land)
 
 
+def daily_median_grids(config, dayofyears, keep_flag_values=True, treat_coast_as_land=False):
+    """Yield (dayofyear, grid) for each of dayofyears, where grid is the one
+    grid(config) returns for a daily median config with that dayofyear. The
+    daily files of the config's range are read once for all of them.
+
+    config: daily median config dict, as generated in the cli module
+
+    dayofyears: iterable of integer days of the year
+
+    """
+    start_year, end_year = config['range']
+
+    gridsets = sid.extent_daily_median_climatology(config['hemi'],
+                                                   start_year,
+                                                   end_year,
+                                                   dayofyears=dayofyears,
+                                                   search_paths=config['search_paths'],
+                                                   extent_threshold=config['extent_threshold'],
+                                                   allow_empty_gridset=True,
+                                                   drop_invalid_ice=True,
+                                                   allow_bad_dates=False)
+
+    for dayofyear, gridset in gridsets:
+        yield dayofyear, _massage_grid(gridset['data'], keep_flag_values, treat_coast_as_land)
+
+
 def _massage_grid(grid, keep_flag_values=True, treat_coast_as_land=False):
     if treat_coast_as_land:
         grid = _data_massage_land_like(grid, LAND, [COAST]).astype('int16')
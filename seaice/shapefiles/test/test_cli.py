@@ -1,7 +1,12 @@
+from unittest.mock import patch
 import copy
 import datetime as dt
 import unittest
 
+import numpy as np
+import numpy.testing as npt
+
+import seaice.nasateam as nt
 import seaice.shapefiles.cli.sii_shp as cli
 from seaice.shapefiles.errors import SeaIceShapefilesError
 
@@ -56,6 +61,27 @@ class Test__set_defaults_temporal(unittest.TestCase):
         self.assertEqual(expected, actual)
 
 
+class Test__confs_with_daily_median_grids(unittest.TestCase):
+
+    def _daily_median_grids(self, config, dayofyears):
+        for dayofyear in sorted(dayofyears):
+            yield dayofyear, np.full((2, 2), dayofyear + config['hemi']['index'])
+
+    @patch('seaice.shapefiles.grids.daily_median_grids')
+    def test_sets_grid_of_each_config(self, mock_daily_median_grids):
+        mock_daily_median_grids.side_effect = self._daily_median_grids
+        configs = [{'hemi': dict(nt.NORTH, index=0), 'dayofyear': 1},
+                   {'hemi': dict(nt.NORTH, index=0), 'dayofyear': 366},
+                   {'hemi': dict(nt.SOUTH, index=1000), 'dayofyear': 1},
+                   {'hemi': dict(nt.SOUTH, index=1000), 'dayofyear': 366}]
+
+        actual = cli._confs_with_daily_median_grids(configs)
+
+        self.assertEqual(2, mock_daily_median_grids.call_count)
+        for conf, value in zip(actual, [1, 366, 1001, 1366]):
+            npt.assert_array_equal(np.full((2, 2), value), conf['grid'])
+
+
 class Test__process_cli_config(unittest.TestCase):
     def test_adds_hemisphere_nt_north(self):
         cli_config = {'hemi': 'N'}
@@ -0,0 +1,138 @@
+"""Check that the modules of the console entry points import none of
+HEAVY_PACKAGES, which seaice modules import on first use (see
+seaice.lazy_import) so that --help and commands that do not make images,
+shapefiles or trends start quickly.
+
+The modules are imported one after another in a single fresh interpreter, and
+the packages each one adds to sys.modules are recorded. A module that cannot be
+imported because an optional dependency is not installed is skipped. How long
+the imports take is reported by benchmarks/bench_import_time.py.
+
+"""
+import json
+import subprocess
+import sys
+import unittest
+
+HEAVY_PACKAGES = ('cartopy', 'fiona', 'matplotlib', 'osgeo', 'rasterio', 'shapely', 'statsmodels',
+                  'xarray')
+
+DATA_MODULES = (
+    'seaice.data.cli.monthly_files_from_dailies',
+    'seaice.data.cli.nasateam_file_manifest',
+    'seaice.data.cli.nasateam_cube_archive',
+    'seaice.data.cli.nasateam_valid_ice_mask_bundle',
+    'seaice.filemapper.remap',
+)
+
+IMAGES_MODULES = (
+    'seaice.images.cli.sii_image',
+    'seaice.images.cli.sii_image_latest',
+    'seaice.images.cli.sii_image_sos',
+    'seaice.images.cli.sii_image_google_earth',
+    'seaice.images.cli.sii_image_geotiff',
+)
+
+SHAPEFILES_MODULES = (
+    'seaice.shapefiles.cli.sii_shp',
+)
+
+SEDNA_MODULES = (
+    'seaice.sedna.cli.update_sea_ice_statistics_daily',
+    'seaice.sedna.cli.initialize_sea_ice_statistics_daily',
+    'seaice.sedna.cli.sea_ice_statistics_monthly',
+    'seaice.sedna.cli.validate_daily_data',
+)
+
+TOOLS_MODULES = (
+    'seaice.tools.xlsify.monthly_with_statistics',
+    'seaice.tools.xlsify.rates_of_change',
+    'seaice.tools.xlsify.min_max_rankings',
+    'seaice.tools.xlsify.daily_extent',
+    'seaice.tools.xlsify.daily_extent_global',
+    'seaice.tools.xlsify.regional_daily',
+    'seaice.tools.xlsify.regional_monthly',
+    'seaice.tools.xlsify.monthly_by_year',
+    'seaice.tools.xlsify.monthly_by_year_global',
+    'seaice.tools.csvify.sea_ice_climatology',
+    'seaice.tools.csvify.sea_ice_extent_daily',
+    'seaice.tools.csvify.sea_ice_extent_monthly',
+    'seaice.tools.process_latest_daily',
+    'seaice.tools.process_latest_monthly',
+)
+
+PLOTTER_MODULES = (
+    'seaice.tools.plotter.monthly_extent',
+    'seaice.tools.plotter.monthly_anomaly',
+    'seaice.tools.plotter.daily_extent',
+)
+
+# Imports each module named on the command line and prints, as JSON on the
+# last line of its output, either the top level packages it added to
+# sys.modules or the name of the missing dependency it could not be imported
+# without.
+IMPORT_SCRIPT = """
+import importlib
+import json
+import sys
+
+results = {}
+for module in sys.argv[1:]:
+    before = set(sys.modules)
+    try:
+        importlib.import_module(module)
+    except ModuleNotFoundError as err:
+        if err.name is None or err.name.split('.')[0] == 'seaice':
+            raise
+        results[module] = {'missing': err.name}
+    else:
+        results[module] = {'imported': sorted({name.split('.')[0]
+                                               for name in set(sys.modules) - before})}
+print(json.dumps(results))
+"""
+
+
+def _imported_packages(modules):
+    """Return a dict mapping each of modules to the result of importing it in
+    IMPORT_SCRIPT."""
+    stdout = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT] + list(modules),
+                            stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout
+    # some modules print when they are imported
+    return json.loads(stdout.splitlines()[-1])
+
+
+class Test_entry_point_imports(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.results = _imported_packages(DATA_MODULES + IMAGES_MODULES + SHAPEFILES_MODULES +
+                                         SEDNA_MODULES + TOOLS_MODULES + PLOTTER_MODULES)
+
+    def _assert_no_heavy_packages(self, modules):
+        for module in modules:
+            with self.subTest(module=module):
+                result = self.results[module]
+                if 'missing' in result:
+                    self.skipTest('{} needs {}, which is not installed'.format(
+                        module, result['missing']))
+
+                heavy = sorted(set(result['imported']) & set(HEAVY_PACKAGES))
+                self.assertEqual([], heavy, '{} imports {}'.format(module, heavy))
+
+    def test_data(self):
+        self._assert_no_heavy_packages(DATA_MODULES)
+
+    def test_images(self):
+        self._assert_no_heavy_packages(IMAGES_MODULES)
+
+    def test_shapefiles(self):
+        self._assert_no_heavy_packages(SHAPEFILES_MODULES)
+
+    def test_sedna(self):
+        self._assert_no_heavy_packages(SEDNA_MODULES)
+
+    def test_tools(self):
+        self._assert_no_heavy_packages(TOOLS_MODULES)
+
+    def test_plotter(self):
+        self._assert_no_heavy_packages(PLOTTER_MODULES)
@@ -0,0 +1,31 @@
+from unittest.mock import Mock, patch
+import json
+import unittest
+
+from seaice.lazy_import import lazy_import
+
+
+class Test_lazy_import(unittest.TestCase):
+
+    @patch('seaice.lazy_import.importlib.import_module', return_value=json)
+    def test_module_is_imported_on_first_use(self, mock_import):
+        on_import = Mock()
+        lazy_json = lazy_import('json', on_import=on_import)
+
+        mock_import.assert_not_called()
+
+        self.assertEqual('[1]', lazy_json.dumps([1]))
+        self.assertIs(json.loads, lazy_json.loads)
+
+        mock_import.assert_called_once_with('json')
+        on_import.assert_called_once_with(json)
+
+    def test_attribute_stand_in_can_be_called(self):
+        dumps = lazy_import('json', 'dumps')
+
+        self.assertEqual('{"a": 1}', dumps({'a': 1}))
+
+    def test_missing_attribute_raises(self):
+        lazy_json = lazy_import('json')
+
+        self.assertRaises(AttributeError, lambda: lazy_json.not_a_function)